@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Cascade benchmark: time, stage exits and decision agreement of cascade
+scoring against the full pipeline, for several exit margins and
+uncertainty bands
+
+    python benchmarks/bench_cascade.py --videos 3000 --margins 0.1,0.3 --bands 0.05,0.1,0.15,0.2
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_ensemble_batch import make_videos
+from bench_thumbnail_processes import MemoryFetcher, make_jpegs
+from config import Config
+from content_analyzer import ContentAnalyzer
+from enhanced_main import EnhancedAIDetector, iter_chunks
+from video_frame import videos_to_frame
+
+def use_model_dir(directory):
+    """Point the model file and its array export at ``directory``"""
+    Config.ML_MODEL_PATH = os.path.join(directory, 'ai_detector_model.joblib')
+    Config.ML_FOREST_PATH = os.path.join(directory, 'ai_detector_model.forest')
+
+def labeled(videos, seed=1):
+    """Training items for videos labeled by a noisy keyword rule"""
+    rng = np.random.default_rng(seed)
+    training_data = []
+    for video in videos:
+        if not video['stats']['viewCount']:
+            continue  # extract_advanced_features divides by the view count
+        text = video['text_context'].text
+        label = ('ai' in text.split() or 'generated' in text) != (rng.random() < 0.1)
+        training_data.append({'video_data': video, 'is_ai_content': int(label)})
+    return training_data
+
+def train(detector, count):
+    """Fit the RandomForest on synthetic videos labeled by a noisy keyword rule"""
+    videos, _ = make_videos(count, seed=1)
+    detector.advanced_analyzer.train_model(labeled(videos))
+
+def run(detector, videos, contexts, cascade):
+    """The main loop of enhanced_main over in-memory videos"""
+    results = []
+    for chunk in iter_chunks(list(zip(videos, contexts)), Config.ANALYSIS_BATCH_SIZE):
+        chunk_videos = [video for video, _ in chunk]
+        chunk_contexts = [context for _, context in chunk]
+        rows = detector.ensemble_analyzer.analyze_batch(videos_to_frame(chunk_videos, chunk_contexts)).to_dict('records')
+        ensembles = [(row.pop('ensemble_score'), row) for row in rows]
+
+        urls = [video['thumbnail_url'] for video in chunk_videos]
+        staged = [None] * len(chunk)
+        advanced_scores = [None] * len(chunk)
+        if cascade:
+            staged = detector.cascade_scores_many(chunk_videos, chunk_contexts, ensembles)
+            urls = [None if detector.cascade_decided(scores) else url for url, (scores, _) in zip(urls, staged)]
+        else:
+            advanced_scores = detector.advanced_analyzer.predict_many(chunk_videos, chunk_contexts)
+        content_scores = detector.content_analyzer.analyze_thumbnails_batch(urls)
+
+        for video, context, content_score, ensemble, stages, advanced_score in zip(
+                chunk_videos, chunk_contexts, content_scores, ensembles, staged, advanced_scores):
+            if cascade:
+                results.append(detector.analyze_video_cascade(video, context, content_score, ensemble, stages))
+            else:
+                results.append(detector.analyze_video_comprehensive(video, context, content_score, ensemble, advanced_score))
+    return results
+
+def compare(detector, videos, contexts, args):
+    start = time.perf_counter()
+    full = run(detector, videos, contexts, cascade=False)
+    full_time = time.perf_counter() - start
+    full_scores = np.array([result['final_ai_score'] for result in full])
+    full_flags = full_scores >= Config.CONFIDENCE_THRESHOLD
+
+    print(f"🪜 {args.videos} videos, threshold {Config.CONFIDENCE_THRESHOLD}, "
+          f"{full_flags.sum()} flagged by the full pipeline")
+    print(f"   full pipeline: {full_time:6.2f} s")
+    print(f"   {'margin':>6}  {'band':>5}  {'time':>7}  {'speedup':>7}  {'exit ensemble/advanced/content':>31}  "
+          f"{'agree':>7}  {'missed':>6}  {'extra':>5}  {'mean |d|':>8}")
+    for margin, band in [(float(m), float(b)) for m in args.margins.split(',') for b in args.bands.split(',')]:
+        Config.CASCADE_EXIT_MARGIN = margin
+        Config.CASCADE_BAND = band
+        detector.cascade_exits.clear()
+        start = time.perf_counter()
+        cascade = run(detector, videos, contexts, cascade=True)
+        elapsed = time.perf_counter() - start
+
+        scores = np.array([result['final_ai_score'] for result in cascade])
+        flags = scores >= Config.CONFIDENCE_THRESHOLD
+        exits = '/'.join(str(detector.cascade_exits[stage]) for stage in detector.CASCADE_STAGES)
+        print(f"   {margin:6.2f}  {band:5.2f}  {elapsed:6.2f}s  {full_time / elapsed:6.1f}x  {exits:>31}  "
+              f"{np.mean(flags == full_flags):7.2%}  {np.sum(full_flags & ~flags):6d}  {np.sum(flags & ~full_flags):5d}  "
+              f"{np.mean(np.abs(scores - full_scores)):8.4f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Cascade scoring benchmark")
+    parser.add_argument('--videos', type=int, default=3000)
+    parser.add_argument('--margins', default='0.1,0.3')
+    parser.add_argument('--bands', default='0.05,0.1,0.15,0.2')
+    parser.add_argument('--size', default='320x180', help="WIDTHxHEIGHT of the encoded thumbnails")
+    args = parser.parse_args()
+    Config.FEATURE_STORE_ENABLED = False  # time the computation, not the feature store
+
+    videos, contexts = make_videos(args.videos)
+    thumbnails = make_jpegs(args.videos, tuple(int(v) for v in args.size.lower().split('x')))
+    for video, url in zip(videos, thumbnails):
+        video['thumbnail_url'] = url
+
+    detector = EnhancedAIDetector()
+    detector.content_analyzer = ContentAnalyzer(fetcher=MemoryFetcher(thumbnails), processes=0, index=False, store=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        use_model_dir(tmp)
+        train(detector, 2000)
+        compare(detector, videos, contexts, args)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark: EnsembleAIAnalyzer.analyze_video per video vs
+analyze_batch over a video frame, with an exact-match check
+
+    python benchmarks/bench_ensemble_batch.py --videos 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config import Config
+from ensemble_analyzer import EnsembleAIAnalyzer
+from text_context import TextContext
+from video_frame import videos_to_frame
+
+VOCABULARY = (
+    "the a to of and in is it you new video music official tutorial review best amazing "
+    "beautiful stunning creative neural model training diffusion latent ai generated created "
+    "by midjourney dall-e stable chatgpt prompt machine learning tech future digital art"
+).split()
+
+def words(rng, count):
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(count))
+
+def make_channels(rng, count):
+    """Upload histories, some too short to score, some missing"""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    channels = []
+    for _ in range(count):
+        size = rng.choice([0, 2, 5, 12, 30, 50])
+        step = rng.choice([6, 24, 24 * 7])
+        history = [{'video_id': f"v{i}",
+                    'published_at': (start - timedelta(hours=i * step + rng.randint(0, 3))).strftime('%Y-%m-%dT%H:%M:%SZ')}
+                   for i in range(size)]
+        channels.append(history if size else None)
+    return channels
+
+def make_videos(count, seed=0):
+    rng = random.Random(seed)
+    channels = make_channels(rng, max(1, count // 50))
+    publish_times = ['', 'not a date', '2024-03-05T10:00:00+05:30', '2024-02-30T00:00:00Z']
+    videos, contexts = [], []
+    for i in range(count):
+        views = rng.choice([0, rng.randint(1, 1000), rng.randint(1000, 10 ** 7)])
+        video = {
+            'video_id': f"video{i}",
+            'title': words(rng, rng.randint(0, 12)),
+            'description': words(rng, rng.choice([0, 10, 60])),
+            'channel_title': words(rng, rng.randint(0, 3)),
+            'tags': [words(rng, rng.randint(1, 2)) for _ in range(rng.randint(0, 6))],
+            'category_id': rng.choice(['22', '27', '28', '10', '']),
+            'published_at': rng.choice(publish_times) if rng.random() < 0.05 else
+                (datetime(2024, 1, 1) + timedelta(minutes=rng.randint(0, 10 ** 6))).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'stats': {'viewCount': views, 'likeCount': rng.randint(0, max(1, views // 10)),
+                      'commentCount': rng.choice([0, rng.randint(0, max(1, views // 50))])}
+        }
+        video['text_context'] = TextContext.from_video(video)
+        videos.append(video)
+        contexts.append(rng.choice(channels))
+    return videos, contexts
+
+def main():
+    parser = argparse.ArgumentParser(description="Ensemble batch-mode benchmark")
+    parser.add_argument('--videos', type=int, default=100000)
+    args = parser.parse_args()
+    Config.FEATURE_STORE_ENABLED = False  # time the computation, not the feature store
+    
+    videos, contexts = make_videos(args.videos)
+    analyzer = EnsembleAIAnalyzer()
+    
+    start = time.perf_counter()
+    per_video = [analyzer.analyze_video(video, context) for video, context in zip(videos, contexts)]
+    per_video_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    frame = videos_to_frame(videos, contexts)
+    frame_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    batch = analyzer.analyze_batch(frame)
+    batch_time = time.perf_counter() - start
+    
+    expected = np.array([[score] + list(components.values()) for score, components in per_video])
+    mismatches = int(np.sum(np.any(batch.to_numpy() != expected, axis=1)))
+    
+    print(f"🧮 {args.videos} videos")
+    print(f"   analyze_video loop: {per_video_time:7.2f} s  ({args.videos / per_video_time:9.0f} videos/s)")
+    print(f"   videos_to_frame:    {frame_time:7.2f} s")
+    print(f"   analyze_batch:      {batch_time:7.2f} s  ({args.videos / batch_time:9.0f} videos/s, "
+          f"{per_video_time / batch_time:.1f}x)")
+    print(f"   Rows differing from analyze_video: {mismatches}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
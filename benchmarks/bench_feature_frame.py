@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Feature extraction benchmark: AdvancedAIAnalyzer.extract_advanced_features
+per video vs extract_features_frame over a video frame and feature_matrix
+over the video dicts (as train_model and predict_many use it), with an
+exact-match check
+
+    python benchmarks/bench_feature_frame.py --videos 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_ensemble_batch import make_videos
+from advanced_analyzer import AdvancedAIAnalyzer
+from text_context import TextContext
+from video_frame import videos_to_frame
+
+def per_video(analyzer, videos, contexts, now):
+    rows = []
+    for video, context in zip(videos, contexts):
+        try:
+            rows.append(analyzer.extract_advanced_features(video, context, now))
+        except ZeroDivisionError:
+            rows.append(np.full(len(rows[0]) if rows else 11, np.nan))
+    return np.array(rows)
+
+def frame(analyzer, videos, contexts, now):
+    return analyzer.extract_features_frame(videos_to_frame(videos, contexts), now).to_numpy()
+
+def matrix(analyzer, videos, contexts, now):
+    X, errors = analyzer.feature_matrix(videos, contexts, store=False, now=now)
+    X[sorted(errors)] = np.nan
+    return X
+
+def reset_text(videos):
+    """New TextContexts, so no normalized text is cached yet"""
+    for video in videos:
+        video['text_context'] = TextContext.from_video(video)
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch feature extraction benchmark")
+    parser.add_argument('--videos', type=int, default=100000)
+    args = parser.parse_args()
+    
+    videos, contexts = make_videos(args.videos)
+    analyzer = AdvancedAIAnalyzer()
+    now = datetime.now().astimezone()
+    
+    print(f"🧮 {args.videos} videos")
+    for warm in (False, True):
+        label = "normalized text already cached" if warm else "fresh TextContexts"
+        print(f"   {label}:")
+        reference = None
+        baseline = None
+        for name, extract in (('per video', per_video), ('extract_features_frame', frame),
+                              ('feature_matrix', matrix)):
+            if not warm:
+                reset_text(videos)
+            start = time.perf_counter()
+            X = extract(analyzer, videos, contexts, now)
+            elapsed = time.perf_counter() - start
+            if reference is None:
+                reference, baseline = X, elapsed
+            exact = np.array_equal(X, reference, equal_nan=True)
+            print(f"      {name:<23} {elapsed:6.2f} s  {baseline / elapsed:5.1f}x  exact: {exact}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
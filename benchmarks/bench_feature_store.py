@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Feature store benchmark: ensemble, advanced and thumbnail feature passes
+over the main loop's chunks without a store, on a cold store, on a warm
+store reopened from disk and after a share of the videos changed, with an
+exact-match check against computing everything
+
+    python benchmarks/bench_feature_store.py --videos 3000 --changed 0.1
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_ensemble_batch import make_videos, words
+from bench_thumbnail_processes import MemoryFetcher, make_jpegs
+from advanced_analyzer import AdvancedAIAnalyzer
+from config import Config
+from content_analyzer import ContentAnalyzer
+from enhanced_main import iter_chunks
+from ensemble_analyzer import EnsembleAIAnalyzer
+from feature_store import FeatureStore
+from text_context import TextContext
+from video_frame import videos_to_frame
+
+VELOCITY = 6  # clock-dependent view velocity, recomputed on every pass
+
+def run(videos, contexts, thumbnails, store):
+    """Feature passes of one main-loop run; store=False computes everything"""
+    ensemble = EnsembleAIAnalyzer()
+    advanced = AdvancedAIAnalyzer()
+    content = ContentAnalyzer(fetcher=MemoryFetcher(thumbnails), processes=0, index=False, store=store)
+    ensemble_rows, matrices, errors, scores = [], [], [], []
+    for chunk in iter_chunks(list(zip(videos, contexts)), Config.ANALYSIS_BATCH_SIZE):
+        chunk_videos = [video for video, _ in chunk]
+        chunk_contexts = [context for _, context in chunk]
+        ensemble_rows.append(ensemble.analyze_batch(videos_to_frame(chunk_videos, chunk_contexts), store=store))
+        X, failed = advanced.feature_matrix(chunk_videos, chunk_contexts, store=store)
+        matrices.append(X)
+        errors.append(sorted(failed))
+        scores.extend(content.analyze_thumbnails_batch([video['thumbnail_url'] for video in chunk_videos]))
+    if store:
+        store.flush()
+    return pd.concat(ensemble_rows, ignore_index=True), np.vstack(matrices), errors, scores
+
+def timed(label, reference, videos, contexts, thumbnails, store):
+    start = time.perf_counter()
+    result = run(videos, contexts, thumbnails, store)
+    elapsed = time.perf_counter() - start
+    
+    ensemble, X, errors, scores = result
+    exact = (ensemble.equals(reference[0])
+             and np.array_equal(np.delete(X, VELOCITY, axis=1), np.delete(reference[1], VELOCITY, axis=1))
+             and errors == reference[2] and scores == reference[3])
+    reused = f"{store.hits:7d} reused, {store.misses:6d} computed" if store else ' ' * 31
+    print(f"   {label:<22} {elapsed:6.2f} s  {reference[4] / elapsed:5.1f}x  {reused}  exact: {exact}")
+    return elapsed
+
+def change(videos, contexts, thumbnails, share, seed):
+    """Copies of the inputs with new text for some videos and new bytes for some thumbnails"""
+    rng = random.Random(seed)
+    videos = [dict(video) for video in videos]
+    thumbnails = dict(thumbnails)
+    replacements = make_jpegs(len(videos), (320, 180), seed=seed)
+    for i in rng.sample(range(len(videos)), int(len(videos) * share)):
+        videos[i]['title'] = words(rng, rng.randint(1, 12))
+        videos[i]['text_context'] = TextContext.from_video(videos[i])
+    for i in rng.sample(range(len(videos)), int(len(videos) * share)):
+        url = videos[i]['thumbnail_url']
+        thumbnails[url] = replacements[url]
+    return videos, contexts, thumbnails
+
+def main():
+    parser = argparse.ArgumentParser(description="Feature store benchmark")
+    parser.add_argument('--videos', type=int, default=3000)
+    parser.add_argument('--changed', type=float, default=0.1, help="share of videos with new text or thumbnail")
+    parser.add_argument('--size', default='320x180', help="WIDTHxHEIGHT of the encoded thumbnails")
+    args = parser.parse_args()
+    
+    videos, contexts = make_videos(args.videos)
+    thumbnails = make_jpegs(args.videos, tuple(int(v) for v in args.size.lower().split('x')))
+    for video, url in zip(videos, thumbnails):
+        video['thumbnail_url'] = url
+    changed = change(videos, contexts, thumbnails, args.changed, seed=1)
+    
+    print(f"🗃️  {args.videos} videos in chunks of {Config.ANALYSIS_BATCH_SIZE}, {args.changed:.0%} changed")
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        reference = run(videos, contexts, thumbnails, False)
+        reference += (time.perf_counter() - start,)
+        print(f"   {'no store':<22} {reference[4]:6.2f} s")
+        changed_reference = run(*changed, False) + (reference[4],)
+        
+        timed('cold store', reference, videos, contexts, thumbnails, FeatureStore(tmp))
+        timed('warm store (reopened)', reference, videos, contexts, thumbnails, FeatureStore(tmp))
+        timed('after changes', changed_reference, *changed, FeatureStore(tmp))
+        
+        size = sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(tmp) for name in names)
+        print(f"   store on disk: {size / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Array forest scorer vs the sklearn model: agreement of predict_proba,
+batch throughput, and cold start (import + load + first prediction) in a
+fresh interpreter
+
+    python benchmarks/bench_forest_scorer.py --videos 5000
+"""
+
+import argparse
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import joblib
+import numpy as np
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+
+from bench_cascade import train, use_model_dir
+from bench_ensemble_batch import make_videos
+from config import Config
+from enhanced_main import EnhancedAIDetector, iter_chunks
+from forest_scorer import load_forest
+from model_registry import get_model_registry
+
+COLD_START = f"""
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {SRC!r})
+from advanced_analyzer import AdvancedAIAnalyzer
+analyzer = AdvancedAIAnalyzer()
+analyzer.predict({{'title': 'ai art', 'stats': {{'viewCount': 100, 'likeCount': 5}}}})
+seconds = time.perf_counter() - start
+peak_kb = [line.split()[1] for line in open('/proc/self/status') if line.startswith('VmHWM')][0]
+print(seconds, int(peak_kb) / 1024, 'sklearn' in sys.modules, type(analyzer.model).__name__)
+"""
+
+def cold_start(directory, runs=5):
+    """Best wall time, peak RSS, whether sklearn was imported and the model class"""
+    best = None
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', COLD_START], cwd=directory,
+                                capture_output=True, text=True, check=True).stdout.split('\n')[-2].split()
+        if best is None or float(output[0]) < float(best[0]):
+            best = output
+    return float(best[0]), float(best[1]), best[2] == 'True', best[3]
+
+def batch_time(analyzer, videos, contexts, size=16):
+    start = time.perf_counter()
+    scores = []
+    for chunk in iter_chunks(list(zip(videos, contexts)), size):
+        scores.extend(analyzer.predict_many([video for video, _ in chunk], [context for _, context in chunk]))
+    return time.perf_counter() - start, np.array(scores)
+
+def main():
+    parser = argparse.ArgumentParser(description="Array forest scorer benchmark")
+    parser.add_argument('--videos', type=int, default=5000)
+    args = parser.parse_args()
+    Config.FEATURE_STORE_ENABLED = False  # time the computation, not the feature store
+    
+    videos, contexts = make_videos(args.videos)
+    keep = [i for i, video in enumerate(videos) if video['stats']['viewCount']]
+    videos, contexts = [videos[i] for i in keep], [contexts[i] for i in keep]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        use_model_dir(tmp)
+        detector = EnhancedAIDetector()
+        analyzer = detector.advanced_analyzer
+        with redirect_stdout(io.StringIO()):
+            train(detector, 2000)
+        
+        sklearn_model = joblib.load(Config.ML_MODEL_PATH)
+        forest = load_forest(Config.ML_FOREST_PATH)
+        X = np.array([analyzer.extract_advanced_features(video, context) for video, context in zip(videos, contexts)])
+        expected = sklearn_model['model'].predict_proba(sklearn_model['scaler'].transform(X))
+        actual = forest['model'].predict_proba(forest['scaler'].transform(X))
+        print(f"🌳 {len(videos)} videos, {len(sklearn_model['model'].estimators_)} trees")
+        print(f"   predict_proba max |difference|: {np.max(np.abs(actual - expected)):.3g} "
+              f"({np.sum(actual != expected)} of {actual.size} values not bit-identical)")
+        
+        scaled = forest['scaler'].transform(X)
+        for rows in (1, 16, 256, len(X)):
+            timings = []
+            for model in (sklearn_model['model'], forest['model']):
+                repeats = max(1, 2000 // rows)
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    model.predict_proba(scaled[:rows])
+                timings.append((time.perf_counter() - start) / repeats * 1000)
+            print(f"   predict_proba on {rows:5d} rows: sklearn {timings[0]:7.2f} ms, arrays {timings[1]:7.2f} ms")
+        
+        with redirect_stdout(io.StringIO()):
+            forest_time, forest_scores = batch_time(analyzer, videos, contexts)
+            shutil.rmtree(Config.ML_FOREST_PATH)
+            get_model_registry().invalidate(Config.ML_FOREST_PATH)
+            sklearn_time, sklearn_scores = batch_time(analyzer, videos, contexts)
+        print(f"   predict_many in chunks of 16: sklearn {sklearn_time:.2f} s, arrays {forest_time:.2f} s "
+              f"({sklearn_time / forest_time:.1f}x), max |difference| {np.max(np.abs(forest_scores - sklearn_scores)):.3g}")
+        
+        # Cold start in fresh interpreters: one directory with only the joblib file, one with the export
+        with redirect_stdout(io.StringIO()):
+            train(detector, 2000)
+        joblib_only = os.path.join(tmp, 'joblib_only')
+        os.mkdir(joblib_only)
+        shutil.copy(Config.ML_MODEL_PATH, joblib_only)
+        for label, directory in (('joblib + sklearn', joblib_only), ('array export', tmp)):
+            seconds, rss, imported, model_class = cold_start(directory)
+            print(f"   cold start, {label:16s}: {seconds:5.2f} s, peak RSS {rss:6.1f} MB, "
+                  f"sklearn imported: {imported}, model: {model_class}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Model registry benchmark: predict throughput with a missing model file,
+once reloading the model per video as before the registry and once
+through the registry, then a hot-swap of the model file
+
+    python benchmarks/bench_model_registry.py --videos 2000
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_cascade import train, use_model_dir
+from bench_ensemble_batch import make_videos
+from config import Config
+from enhanced_main import EnhancedAIDetector
+from model_registry import get_model_registry
+
+def timed_predict(analyzer, videos, contexts, reload_each=False):
+    """Seconds for predict over every video and the load messages printed"""
+    registry = get_model_registry()
+    output = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(output):
+        for video, context in zip(videos, contexts):
+            if reload_each:
+                registry.invalidate(Config.ML_FOREST_PATH)
+                registry.invalidate(Config.ML_MODEL_PATH)
+            analyzer.predict(video, context)
+    elapsed = time.perf_counter() - start
+    return elapsed, output.getvalue().count('Could not load model')
+
+def main():
+    parser = argparse.ArgumentParser(description="Model registry benchmark")
+    parser.add_argument('--videos', type=int, default=2000)
+    args = parser.parse_args()
+    Config.FEATURE_STORE_ENABLED = False  # time the computation, not the feature store
+    
+    videos, contexts = make_videos(args.videos)
+    videos = [video for video in videos if video['stats']['viewCount']]  # keep the model path error-free
+    contexts = contexts[:len(videos)]
+    detector = EnhancedAIDetector()
+    analyzer = detector.advanced_analyzer
+    registry = get_model_registry()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        use_model_dir(tmp)
+        
+        reload_time, reload_messages = timed_predict(analyzer, videos, contexts, reload_each=True)
+        registry.invalidate(Config.ML_FOREST_PATH)
+        registry.invalidate(Config.ML_MODEL_PATH)
+        cached_time, cached_messages = timed_predict(analyzer, videos, contexts)
+        print(f"📦 {len(videos)} videos, model file missing")
+        print(f"   load attempt per video: {reload_time:6.3f} s  ({reload_messages} load errors printed)")
+        print(f"   registry:               {cached_time:6.3f} s  ({cached_messages} load errors printed, "
+              f"{reload_time / cached_time:.1f}x)")
+        
+        # Hot swap: the registry picks up a retrained file after the recheck interval
+        registry.recheck_interval = 0.5
+        train(detector, 1000)
+        first = analyzer.predict_many(videos[:200], contexts[:200])
+        loads = registry.loads
+        
+        # Replace the files the way another process would, without telling the registry
+        retrained = os.path.join(tmp, 'retrained')
+        os.mkdir(retrained)
+        use_model_dir(retrained)
+        with redirect_stdout(io.StringIO()):
+            train(EnhancedAIDetector(), 3000)
+        use_model_dir(tmp)
+        os.replace(os.path.join(retrained, 'ai_detector_model.joblib'), Config.ML_MODEL_PATH)
+        os.rename(Config.ML_FOREST_PATH, Config.ML_FOREST_PATH + '.old')
+        os.rename(os.path.join(retrained, 'ai_detector_model.forest'), Config.ML_FOREST_PATH)
+        time.sleep(registry.recheck_interval)
+        swapped = analyzer.predict_many(videos[:200], contexts[:200])
+        changed = sum(a != b for a, b in zip(first, swapped))
+        print(f"   hot swap: {registry.loads - loads} reload after the file changed, "
+              f"{changed}/200 predictions changed")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
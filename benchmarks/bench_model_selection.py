@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Model selection benchmark: forests of several sizes, depths and feature
+subsets fitted on one labeled dataset, with validation accuracy,
+single-video latency and batch throughput of the array export predict
+uses, file sizes and load time. The most accurate Pareto-optimal model
+within the latency budget (MODEL_LATENCY_BUDGET_MS) is chosen on the
+validation split and reported on a separate test split; its
+configuration is then refitted on all the data and saved as the model.
+
+    python benchmarks/bench_model_selection.py --videos 10000 --trees 10,25,50,100 --depths 4,6,10,14
+    python benchmarks/bench_model_selection.py --data labeled.json --budget-ms 0.5
+
+``--data`` is a JSON list of training items as train_model takes them
+({"video_data": ..., "is_ai_content": 0 or 1}). Without it, synthetic
+videos are used and the chosen model is only saved with ``--model-dir``.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import roc_auc_score
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_cascade import labeled, use_model_dir
+from bench_ensemble_batch import make_videos
+from advanced_analyzer import BEHAVIORAL_POSITIONS, CHANNEL_POSITIONS, FEATURE_COLUMNS, TEXT_POSITIONS, AdvancedAIAnalyzer
+from config import Config
+from forest_scorer import export_forest, load_forest
+
+# Named feature subsets; topN are the N most important features of a full forest
+SUBSETS = {
+    'all': list(range(len(FEATURE_COLUMNS))),
+    'text': sorted(TEXT_POSITIONS),
+    'text+behavioral': sorted(TEXT_POSITIONS + BEHAVIORAL_POSITIONS),
+    'no-channel': [i for i in range(len(FEATURE_COLUMNS)) if i not in CHANNEL_POSITIONS],
+}
+
+def load_dataset(args):
+    if args.data:
+        with open(args.data, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    videos, _ = make_videos(args.videos, seed=1)
+    return labeled(videos)
+
+def subset_columns(name, X, y):
+    if name in SUBSETS:
+        return SUBSETS[name]
+    if name.startswith('top'):
+        reference = RandomForestClassifier(n_estimators=50, max_depth=10, random_state=42).fit(X, y)
+        return sorted(np.argsort(reference.feature_importances_)[::-1][:int(name[3:])].tolist())
+    raise ValueError(f"Unknown feature subset {name!r}: use {', '.join(SUBSETS)} or topN")
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+def measure(model, scaler, columns, X_validation, y_validation, directory, repeats):
+    """Accuracy, AUC, latency, throughput, sizes and load time of one fitted forest"""
+    forest_path = os.path.join(directory, 'model.forest')
+    joblib_path = os.path.join(directory, 'model.joblib')
+    export_forest(model, scaler, FEATURE_COLUMNS, forest_path, columns)
+    joblib.dump({'model': model, 'scaler': scaler, 'feature_indices': columns}, joblib_path)
+    
+    load_times = []
+    for _ in range(5):
+        start = time.perf_counter()
+        loaded = load_forest(forest_path)
+        loaded['model'].predict_proba(loaded['scaler'].transform(X_validation[:1]))
+        load_times.append(time.perf_counter() - start)
+    forest, array_scaler = loaded['model'], loaded['scaler']
+    
+    # Scored the way predict scores one video: full feature row in, probability out
+    single = []
+    for row in X_validation[np.arange(repeats) % len(X_validation)]:
+        start = time.perf_counter()
+        forest.predict_proba(array_scaler.transform(row.reshape(1, -1)))
+        single.append(time.perf_counter() - start)
+    
+    batch = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        probability = forest.predict_proba(array_scaler.transform(X_validation))[:, 1]
+        batch = min(batch, time.perf_counter() - start)
+    
+    return {
+        'accuracy': float(np.mean((probability >= 0.5) == y_validation)),
+        'auc': float(roc_auc_score(y_validation, probability)),
+        'latency_ms': float(np.median(single) * 1000),
+        'p95_ms': float(np.percentile(single, 95) * 1000),
+        'rows_per_s': len(X_validation) / batch,
+        'forest_kb': directory_size(forest_path) / 1024,
+        'joblib_kb': os.path.getsize(joblib_path) / 1024,
+        'load_ms': float(np.median(load_times) * 1000)
+    }
+
+def pareto(results):
+    """Results no other result matches on accuracy, latency and size while beating on one"""
+    keys = (('accuracy', 1), ('latency_ms', -1), ('forest_kb', -1))
+    def dominates(a, b):
+        return (all(a[k] * sign >= b[k] * sign for k, sign in keys)
+                and any(a[k] * sign > b[k] * sign for k, sign in keys))
+    return [r for r in results if not any(dominates(other, r) for other in results if other is not r)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Model size vs latency benchmark and model selection")
+    parser.add_argument('--data', help="JSON list of labeled training items; synthetic videos otherwise")
+    parser.add_argument('--videos', type=int, default=10000, help="synthetic videos without --data")
+    parser.add_argument('--validation', type=float, default=0.2, help="share used to choose the model")
+    parser.add_argument('--test', type=float, default=0.2, help="share used to report the chosen model")
+    parser.add_argument('--trees', default='10,25,50,100')
+    parser.add_argument('--depths', default='4,6,10,14')
+    parser.add_argument('--subsets', default='all,text+behavioral,top6', help=f"{','.join(SUBSETS)} or topN")
+    parser.add_argument('--repeats', type=int, default=300, help="single-video predictions timed per model")
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help="median single-video latency allowed (default MODEL_LATENCY_BUDGET_MS)")
+    parser.add_argument('--model-dir', help="where to save the chosen model (default: the configured paths with --data)")
+    args = parser.parse_args()
+    budget = Config.MODEL_LATENCY_BUDGET_MS if args.budget_ms is None else args.budget_ms
+    
+    training_data = load_dataset(args)
+    analyzer = AdvancedAIAnalyzer()
+    X, errors = analyzer.feature_matrix([item['video_data'] for item in training_data], store=False)
+    y = np.array([item['is_ai_content'] for item in training_data])
+    keep = np.array([i not in errors for i in range(len(y))], dtype=bool)
+    X, y = X[keep], y[keep]
+    order = np.random.default_rng(42).permutation(len(y))
+    train_end = int(len(y) * (1 - args.validation - args.test))
+    validation_end = int(len(y) * (1 - args.test))
+    train, validation, test = order[:train_end], order[train_end:validation_end], order[validation_end:]
+    X_train, y_train = X[train], y[train]
+    scaler = StandardScaler().fit(X_train)
+    X_train_scaled = scaler.transform(X_train)
+    
+    print(f"🌲 {len(train)} training, {len(validation)} validation and {len(test)} test videos "
+          f"({len(errors)} without features), budget {budget:g} ms per video")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for subset in args.subsets.split(','):
+            columns = subset_columns(subset, X_train_scaled, y_train)
+            for trees in [int(value) for value in args.trees.split(',')]:
+                for depth in [int(value) for value in args.depths.split(',')]:
+                    model = RandomForestClassifier(n_estimators=trees, max_depth=depth, random_state=42,
+                                                   n_jobs=Config.TRAIN_N_JOBS)
+                    start = time.perf_counter()
+                    model.fit(X_train_scaled[:, columns], y_train)
+                    model.set_params(n_jobs=1)
+                    result = {'subset': subset, 'columns': columns, 'trees': trees, 'depth': depth,
+                              'model': model, 'fit_s': time.perf_counter() - start}
+                    result.update(measure(model, scaler, columns, X[validation], y[validation], tmp, args.repeats))
+                    results.append(result)
+    
+    front = pareto(results)
+    within = [r for r in front if r['latency_ms'] <= budget]
+    chosen = max(within, key=lambda r: (r['accuracy'], r['auc'], -r['latency_ms'])) if within else None
+    
+    print(f"   {'subset':<16} {'trees':>5} {'depth':>5}  {'accuracy':>8} {'AUC':>6}  {'median':>8} {'p95':>8}  "
+          f"{'rows/s':>9}  {'export':>8} {'joblib':>8}  {'load':>7}  {'fit':>6}")
+    for r in sorted(results, key=lambda r: r['latency_ms']):
+        mark = '→' if r is chosen else ('*' if any(r is p for p in front) else ' ')
+        print(f" {mark} {r['subset']:<16} {r['trees']:5d} {r['depth']:5d}  {r['accuracy']:8.3f} {r['auc']:6.3f}  "
+              f"{r['latency_ms']:6.3f}ms {r['p95_ms']:6.3f}ms  {r['rows_per_s']:9.0f}  "
+              f"{r['forest_kb']:6.0f}KB {r['joblib_kb']:6.0f}KB  {r['load_ms']:5.2f}ms  {r['fit_s']:5.2f}s")
+    print("   Accuracy and AUC on the validation split; * Pareto-optimal in accuracy, median latency "
+          "and export size; → chosen")
+    
+    if chosen is None:
+        print(f"❌ No Pareto-optimal model scores a video within {budget:g} ms; nothing saved")
+        return
+    columns = chosen['columns']
+    probability = chosen['model'].predict_proba(scaler.transform(X[test])[:, columns])[:, 1]
+    feature_indices = None if columns == SUBSETS['all'] else columns
+    print(f"✅ {chosen['subset']}, {chosen['trees']} trees, depth {chosen['depth']}: test accuracy "
+          f"{np.mean((probability >= 0.5) == y[test]):.3f}, AUC {roc_auc_score(y[test], probability):.3f}, "
+          f"{chosen['latency_ms']:.3f} ms per video; to retrain it use "
+          f"train_model(data, n_estimators={chosen['trees']}, max_depth={chosen['depth']}, "
+          f"feature_indices={feature_indices})")
+    if args.model_dir:
+        os.makedirs(args.model_dir, exist_ok=True)
+        use_model_dir(args.model_dir)
+    elif not args.data:
+        print("   Synthetic data: pass --model-dir to save the chosen model")
+        return
+    
+    # The saved model is the chosen configuration refitted on every labeled video
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=chosen['trees'], max_depth=chosen['depth'], random_state=42,
+                                   n_jobs=Config.TRAIN_N_JOBS)
+    model.fit(scaler.transform(X)[:, columns], y)
+    model.set_params(n_jobs=1)
+    analyzer.save_model(model, scaler, feature_indices)
+    print(f"💾 Saved to {Config.ML_MODEL_PATH} (arrays in {Config.ML_FOREST_PATH})")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
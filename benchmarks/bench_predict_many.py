@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark: AdvancedAIAnalyzer.predict per video vs
+predict_many over chunks of several sizes, with an exact-match check
+
+    python benchmarks/bench_predict_many.py --videos 5000 --chunks 16,64,256
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_cascade import train, use_model_dir
+from bench_ensemble_batch import make_videos
+from config import Config
+from enhanced_main import EnhancedAIDetector, iter_chunks
+
+def compare(analyzer, videos, contexts, failing, args):
+    start = time.perf_counter()
+    reference = [analyzer.predict(video, context) for video, context in zip(videos, contexts)]
+    per_video = time.perf_counter() - start
+    
+    print(f"🌲 {args.videos} videos ({failing} with failing feature extraction)")
+    print(f"   predict loop:        {per_video:6.2f} s  ({args.videos / per_video:8.0f} videos/s)")
+    for size in [int(c) for c in args.chunks.split(',')]:
+        start = time.perf_counter()
+        scores = []
+        for chunk in iter_chunks(list(zip(videos, contexts)), size):
+            scores.extend(analyzer.predict_many([video for video, _ in chunk], [context for _, context in chunk]))
+        elapsed = time.perf_counter() - start
+        mismatches = sum(a != b for a, b in zip(scores, reference))
+        print(f"   predict_many x{size:<5d} {elapsed:6.2f} s  ({args.videos / elapsed:8.0f} videos/s, "
+              f"{per_video / elapsed:5.1f}x), mismatches: {mismatches}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched ML inference benchmark")
+    parser.add_argument('--videos', type=int, default=5000)
+    parser.add_argument('--chunks', default='16,64,256')
+    args = parser.parse_args()
+    Config.FEATURE_STORE_ENABLED = False  # time the computation, not the feature store
+    
+    videos, contexts = make_videos(args.videos)
+    # Zero-view videos fail feature extraction and take the per-row fallback
+    failing = sum(1 for video in videos if not video['stats']['viewCount'])
+    
+    detector = EnhancedAIDetector()
+    analyzer = detector.advanced_analyzer
+    with tempfile.TemporaryDirectory() as tmp:
+        use_model_dir(tmp)
+        train(detector, 2000)
+        compare(analyzer, videos, contexts, failing, args)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-video text matching cost of the analyzers with the
+shared TermMatcher vs the previous per-list loops and re.search calls,
+and of the text analyzers with and without a shared TextContext
+
+    python benchmarks/bench_text_matching.py --videos 300 --words 700
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from advanced_analyzer import AdvancedAIAnalyzer
+from ensemble_analyzer import TextAnalyzer, MetadataAnalyzer
+from text_context import TextContext
+from text_matcher import TEXT_MATCHER
+
+VOCABULARY = (
+    "the a to of and in is it you that for on with this my video channel subscribe like "
+    "comment share music official new today tutorial review how best free download link "
+    "follow instagram patreon beautiful amazing stunning creative neural algorithm model "
+    "training transformer diffusion latent ai generated created by using midjourney "
+    "dall-e stable chatgpt prompt engineering machine learning network organic said again "
+    "tech future digital art synthetic media deepfake gan artificial intelligence"
+).split()
+
+def make_text(rng, n_words, lines=0):
+    words = []
+    for _ in range(n_words):
+        if rng.random() < 0.5:
+            words.append(rng.choice(VOCABULARY))
+        else:
+            words.append(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(2, 9))))
+        if lines and rng.random() < lines / n_words:
+            words.append('\n')
+    return ' '.join(words).replace(' \n ', '\n')
+
+def make_videos(count, words, seed=0):
+    rng = random.Random(seed)
+    return [{
+        'title': make_text(rng, rng.randint(4, 14)),
+        'description': make_text(rng, words, lines=20),
+        'tags': [make_text(rng, rng.randint(1, 3)) for _ in range(rng.randint(0, 15))],
+        'channel_title': make_text(rng, rng.randint(1, 3)),
+        'stats': {'viewCount': rng.randint(1, 10 ** 6), 'likeCount': rng.randint(0, 10 ** 4),
+                  'commentCount': rng.randint(0, 10 ** 3)}
+    } for _ in range(count)]
+
+def legacy_text_work(video):
+    """The matching the analyzers did before: one loop and re.search per list"""
+    lists = TEXT_MATCHER.term_lists
+    title, description = video['title'], video['description']
+    tags, channel_title = video['tags'], video['channel_title'].lower()
+    text = f"{title} {description}".lower()
+    
+    results = [sum(1 for term in lists[name] if term in text)
+               for name in ('technical_terms', 'creative_words', 'ai_tools')]
+    for name, combined in (('text_patterns', text), ('fallback_patterns', f"{title.lower()} {description.lower()}")):
+        results.append(sum(weight for _, weight, regex in TEXT_MATCHER.pattern_lists[name]
+                           if re.search(regex.pattern, combined, re.IGNORECASE)))
+    results.append(sum(1 for tag in tags if any(term in tag.lower() for term in lists['ai_tags'])))
+    results.append(sum(1 for phrase in lists['ai_phrases'] if phrase in title.lower()))
+    results.append(sum(1 for phrase in lists['ai_phrases'] if phrase in description.lower()))
+    results.append([(term in title.lower(), term in description.lower(), any(term in tag.lower() for tag in tags))
+                    for term in lists['ai_terms']])
+    results.append(sum(1 for term in lists['ai_channel_indicators'] if term in channel_title))
+    return results
+
+def matcher_text_work(video):
+    title, description = video['title'], video['description']
+    text = f"{title} {description}".lower()
+    title_lower, description_lower = title.lower(), description.lower()
+    tags_text = '\n'.join(tag.lower() for tag in video['tags'])
+    
+    hits = TEXT_MATCHER.counts(text, ('technical_terms', 'creative_words', 'ai_tools'))
+    results = [hits['technical_terms'], hits['creative_words'], hits['ai_tools']]
+    results.append(TEXT_MATCHER.pattern_score('text_patterns', text))
+    results.append(TEXT_MATCHER.pattern_score('fallback_patterns', f"{title_lower} {description_lower}"))
+    results.append(sum(1 for tag in video['tags'] if TEXT_MATCHER.matches_any('ai_tags', tag.lower())))
+    results.append(TEXT_MATCHER.count('ai_phrases', title_lower))
+    results.append(TEXT_MATCHER.count('ai_phrases', description_lower))
+    results.append(list(zip(TEXT_MATCHER.found('ai_terms', title_lower),
+                            TEXT_MATCHER.found('ai_terms', description_lower),
+                            TEXT_MATCHER.found('ai_terms', tags_text))))
+    results.append(TEXT_MATCHER.count('ai_channel_indicators', video['channel_title'].lower()))
+    return results
+
+def time_per_video(func, videos, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for video in videos:
+            func(video)
+        best = min(best, time.perf_counter() - start)
+    return best / len(videos)
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyzer text matching benchmark")
+    parser.add_argument('--videos', type=int, default=300)
+    parser.add_argument('--words', type=int, default=700, help="words per description")
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    
+    videos = make_videos(args.videos, args.words)
+    mismatches = sum(legacy_text_work(video) != matcher_text_work(video) for video in videos)
+    
+    legacy = time_per_video(legacy_text_work, videos, args.repeats)
+    matcher = time_per_video(matcher_text_work, videos, args.repeats)
+    
+    text_analyzer, metadata_analyzer, advanced = TextAnalyzer(), MetadataAnalyzer(), AdvancedAIAnalyzer()
+    
+    def run_analyzers(video):
+        return (text_analyzer.analyze(video), metadata_analyzer.analyze(video),
+                advanced._analyze_text_patterns(video), advanced._check_metadata_consistency(video),
+                advanced._analyze_network_patterns(video), advanced._fallback_prediction(video))
+    
+    def run_with_context(video):
+        # As in extract_video_features: one context per video, shared by all
+        video['text_context'] = TextContext.from_video(video)
+        return run_analyzers(video)
+    
+    analyzers = time_per_video(run_analyzers, videos, args.repeats)
+    with_context = [dict(video) for video in videos]
+    shared = time_per_video(run_with_context, with_context, args.repeats)
+    mismatches += sum(run_analyzers(video) != run_with_context(copy)
+                      for video, copy in zip(videos, with_context))
+    
+    avg_chars = sum(len(video['description']) for video in videos) / len(videos)
+    print(f"📝 {args.videos} videos, descriptions of ~{avg_chars:.0f} characters")
+    print(f"   Per-list loops + re.search: {legacy * 1e6:8.1f} us/video")
+    print(f"   Shared TermMatcher:         {matcher * 1e6:8.1f} us/video ({legacy / matcher:.1f}x faster)")
+    print(f"   Text analyzers, own text:   {analyzers * 1e6:8.1f} us/video")
+    print(f"   Text analyzers, shared ctx: {shared * 1e6:8.1f} us/video ({analyzers / shared:.1f}x faster)")
+    print(f"   Result mismatches: {mismatches}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
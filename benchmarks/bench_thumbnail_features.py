@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: fused and batched thumbnail feature kernels vs the
+per-feature helpers
+
+    python benchmarks/bench_thumbnail_features.py --images 200 --size 320x180
+"""
+
+import argparse
+import os
+import sys
+import time
+from io import BytesIO
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from content_analyzer import ContentAnalyzer
+
+def make_thumbnails(count, size, seed=0):
+    """Synthetic JPEG-decoded thumbnails: smooth color fields plus texture"""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    images = []
+    for i in range(count):
+        coarse = rng.integers(0, 256, (9, 16, 3), dtype=np.uint8)
+        base = np.asarray(Image.fromarray(coarse).resize((width, height), Image.BICUBIC), dtype=np.float32)
+        noise = Image.fromarray(rng.integers(0, 256, (height, width), dtype=np.uint8))
+        texture = np.asarray(noise.filter(ImageFilter.GaussianBlur(i % 4)), dtype=np.float32)[..., None]
+        pixels = np.clip(base * rng.uniform(0.3, 1.0) + (texture - 128) * rng.uniform(0, 1), 0, 255)
+        
+        buffer = BytesIO()
+        Image.fromarray(pixels.astype(np.uint8)).save(buffer, 'JPEG', quality=85)
+        images.append(np.array(Image.open(BytesIO(buffer.getvalue()))))
+    return images
+
+def legacy_features(analyzer, img_array):
+    return {
+        'color_variance': analyzer._calculate_color_variance(img_array),
+        'edge_density': analyzer._estimate_edge_density(img_array),
+        'brightness_consistency': analyzer._check_brightness_consistency(img_array),
+        'saturation_level': analyzer._calculate_saturation(img_array),
+        'contrast_level': analyzer._calculate_contrast(img_array)
+    }
+
+def time_per_image(func, images, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for img in images:
+            func(img)
+        best = min(best, time.perf_counter() - start)
+    return best / len(images)
+
+def main():
+    parser = argparse.ArgumentParser(description="Thumbnail feature kernel benchmark")
+    parser.add_argument('--images', type=int, default=200)
+    parser.add_argument('--size', default='320x180', help="WIDTHxHEIGHT of the decoded thumbnails")
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    
+    size = tuple(int(v) for v in args.size.lower().split('x'))
+    analyzer = ContentAnalyzer.__new__(ContentAnalyzer)  # no fetcher needed
+    images = make_thumbnails(args.images, size)
+    
+    # Correctness: same scores, features equal to float rounding
+    max_diff = 0.0
+    score_mismatches = 0
+    for img in images:
+        legacy = legacy_features(analyzer, img)
+        fused = analyzer.extract_features(img)
+        max_diff = max(max_diff, max(abs(legacy[k] - fused[k]) for k in legacy))
+        if analyzer._calculate_thumbnail_score(legacy) != analyzer._calculate_thumbnail_score(fused):
+            score_mismatches += 1
+    
+    # The batched kernel must reproduce the per-image scores exactly
+    stack = np.stack(images)
+    batch_scores = analyzer._calculate_thumbnail_scores(analyzer.extract_features_batch(stack))
+    single_scores = [analyzer._calculate_thumbnail_score(analyzer.extract_features(img)) for img in images]
+    batch_mismatches = int(np.sum(batch_scores != np.array(single_scores)))
+    
+    legacy_time = time_per_image(lambda img: legacy_features(analyzer, img), images, args.repeats)
+    fused_time = time_per_image(analyzer.extract_features, images, args.repeats)
+    batch_time = time_per_image(lambda batch: analyzer.extract_features_batch(batch), [stack], args.repeats) / len(images)
+    
+    print(f"🖼️  {args.images} thumbnails at {size[0]}x{size[1]}")
+    print(f"   Per-feature helpers: {legacy_time * 1e3:.3f} ms/image")
+    print(f"   Fused kernel:        {fused_time * 1e3:.3f} ms/image ({legacy_time / fused_time:.1f}x faster)")
+    print(f"   Batched kernel:      {batch_time * 1e3:.3f} ms/image ({legacy_time / batch_time:.1f}x faster)")
+    print(f"   Max feature difference: {max_diff:.2e}, score mismatches: {score_mismatches}, "
+          f"batch vs single mismatches: {batch_mismatches}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark: thumbnail decoding and scoring in-process vs the
+process pool at increasing worker counts
+
+    python benchmarks/bench_thumbnail_processes.py --images 400 --size 1280x720
+"""
+
+import argparse
+import os
+import sys
+import time
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from content_analyzer import ContentAnalyzer
+
+class MemoryFetcher:
+    """Serves pre-encoded thumbnails so only decoding and scoring are timed"""
+    
+    def __init__(self, thumbnails):
+        self.thumbnails = thumbnails
+    
+    def prefetch(self, url):
+        pass
+    
+    def get(self, url):
+        return self.thumbnails[url]
+
+def make_jpegs(count, size, seed=0):
+    rng = np.random.default_rng(seed)
+    width, height = size
+    thumbnails = {}
+    for i in range(count):
+        coarse = rng.integers(0, 256, (9, 16, 3), dtype=np.uint8)
+        img = Image.fromarray(coarse).resize((width, height), Image.BICUBIC)
+        buffer = BytesIO()
+        img.save(buffer, 'JPEG', quality=85)
+        thumbnails[f"https://i.ytimg.com/vi/{i}/maxresdefault.jpg"] = buffer.getvalue()
+    return thumbnails
+
+def throughput(analyzer, urls):
+    start = time.perf_counter()
+    scores = [analyzer.analyze_thumbnail(url) for url in urls] if not analyzer.processes \
+        else analyzer.analyze_thumbnails_batch(urls)
+    return len(urls) / (time.perf_counter() - start), scores
+
+def main():
+    parser = argparse.ArgumentParser(description="Thumbnail process-pool scaling benchmark")
+    parser.add_argument('--images', type=int, default=400)
+    parser.add_argument('--size', default='1280x720', help="WIDTHxHEIGHT of the encoded thumbnails")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    
+    size = tuple(int(v) for v in args.size.lower().split('x'))
+    thumbnails = make_jpegs(args.images, size)
+    urls = list(thumbnails)
+    fetcher = MemoryFetcher(thumbnails)
+    
+    baseline, reference = throughput(ContentAnalyzer(fetcher=fetcher, processes=0, index=False, store=False), urls)
+    print(f"🖼️  {args.images} thumbnails at {size[0]}x{size[1]}, {os.cpu_count()} CPUs")
+    print(f"   In-process:  {baseline:8.1f} images/s")
+    
+    counts = [1]
+    while counts[-1] < args.max_workers:
+        counts.append(min(counts[-1] * 2, args.max_workers))
+    
+    for workers in counts:
+        analyzer = ContentAnalyzer(fetcher=fetcher, processes=workers, index=False, store=False)
+        throughput(analyzer, urls[:workers * 4])  # start the workers outside the timing
+        rate, scores = throughput(analyzer, urls)
+        analyzer.close()
+        
+        speedup = rate / baseline
+        mismatches = sum(a != b for a, b in zip(scores, reference))
+        print(f"   {workers:2d} workers: {rate:8.1f} images/s  {speedup:5.2f}x  "
+              f"({speedup / workers:.0%} per worker), score mismatches: {mismatches}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
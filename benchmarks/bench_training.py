@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Training benchmark: train_model serially and with parallel feature
+extraction and forest jobs (per-stage time and peak memory), and
+incremental training on newly labeled videos vs retraining on the whole
+history, with held-out accuracy
+
+    python benchmarks/bench_training.py --videos 20000 --new 2000 --jobs 1,2,-1
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import joblib
+import numpy as np
+from sklearn.metrics import roc_auc_score
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_cascade import labeled, use_model_dir
+from bench_ensemble_batch import make_videos
+from advanced_analyzer import AdvancedAIAnalyzer
+from config import Config
+
+def dataset(count, seed):
+    videos, _ = make_videos(count, seed=seed)
+    return labeled(videos, seed)
+
+def evaluate(analyzer, X_test, y_test):
+    """Accuracy at 0.5 and ROC AUC of the trained sklearn model"""
+    probability = analyzer.model.predict_proba(analyzer.scaler.transform(X_test))[:, 1]
+    return np.mean((probability >= 0.5) == y_test), roc_auc_score(y_test, probability)
+
+def train(analyzer, training_data, **options):
+    """train_model with its report captured; returns (seconds, report lines)"""
+    output = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(output):
+        analyzer.train_model(training_data, **options)
+    return time.perf_counter() - start, output.getvalue().splitlines()
+
+def main():
+    parser = argparse.ArgumentParser(description="Training pipeline benchmark")
+    parser.add_argument('--videos', type=int, default=20000, help="labeled history")
+    parser.add_argument('--new', type=int, default=2000, help="newly labeled videos for the incremental run")
+    parser.add_argument('--test', type=int, default=5000)
+    parser.add_argument('--jobs', default='1,2,-1', help="n_jobs values to compare")
+    args = parser.parse_args()
+    Config.FEATURE_STORE_ENABLED = False  # time the computation, not the feature store
+    
+    history = dataset(args.videos, seed=1)
+    new = dataset(args.new, seed=2)
+    test = dataset(args.test, seed=3)
+    analyzer = AdvancedAIAnalyzer()
+    X_test, _ = analyzer.feature_matrix([item['video_data'] for item in test])
+    y_test = np.array([item['is_ai_content'] for item in test])
+    
+    print(f"🏋️  {len(history)} labeled videos, {len(new)} new, {len(test)} held out, {os.cpu_count()} CPUs")
+    with tempfile.TemporaryDirectory() as tmp:
+        use_model_dir(tmp)
+        
+        videos = [item['video_data'] for item in history]
+        now = datetime.now().astimezone()
+        serial, _ = analyzer.feature_matrix(videos, now=now)
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            parallel, _ = analyzer.feature_matrix(videos, now=now, pool=pool)
+        print(f"   parallel features equal serial ones: {np.array_equal(parallel, serial)}")
+        
+        for n_jobs in [int(value) for value in args.jobs.split(',')]:
+            seconds, report = train(analyzer, history, n_jobs=n_jobs)
+            accuracy, auc = evaluate(analyzer, X_test, y_test)
+            print(f"   n_jobs={n_jobs} ({joblib.effective_n_jobs(n_jobs)}): {seconds:6.2f} s, "
+                  f"accuracy {accuracy:.3f}, AUC {auc:.3f}")
+            for line in report[1:]:
+                print(f"   {line}")
+        
+        # Starting from the model trained on the history, add the new videos
+        seconds, _ = train(analyzer, history + new)
+        accuracy, auc = evaluate(analyzer, X_test, y_test)
+        print(f"   retrain on history + new: {seconds:6.2f} s, {len(analyzer.model.estimators_)} trees, "
+              f"accuracy {accuracy:.3f}, AUC {auc:.3f}")
+        
+        train(analyzer, history)
+        seconds, report = train(analyzer, new, incremental=True)
+        accuracy, auc = evaluate(analyzer, X_test, y_test)
+        print(f"   incremental on new only:  {seconds:6.2f} s, {len(analyzer.model.estimators_)} trees, "
+              f"accuracy {accuracy:.3f}, AUC {auc:.3f}")
+        for line in report[1:]:
+            print(f"   {line}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
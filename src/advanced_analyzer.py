@@ -1,35 +1,105 @@
-import re
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
 import joblib
 import pandas as pd
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 import requests
 import json
 from config import Config
+from model_registry import get_model_registry
+from forest_scorer import export_forest, load_forest
+from feature_store import cached_rows, get_feature_store, input_hash
+from channel_history import upload_consistency, publish_hour_regularity
+from text_matcher import TEXT_MATCHER
+from text_context import TextContext, text_context
+
+# Every value of extract_advanced_features, in order
+FEATURE_COLUMNS = [
+    'title_ai_keyword_density', 'description_ai_keyword_density', 'title_sensationalism',
+    'description_complexity', 'engagement_anomaly_score', 'like_comment_ratio_anomaly', 'view_velocity',
+    'upload_frequency_score', 'content_pattern_regularity', 'channel_ai_specialization',
+    'metadata_consistency_score'
+]
+FEATURE_COUNT = len(FEATURE_COLUMNS)
+
+# Feature-store groups of extract_advanced_features: the columns each holds
+# and the positions of those columns in the feature vector. Bump a version
+# when the features of its group change. Behavioral features depend on
+# live statistics and the clock, so they are recomputed every time.
+TEXT_GROUP = ('advanced_text', 1)
+TEXT_COLUMNS = ('title_ai_keyword_density', 'description_ai_keyword_density', 'title_sensationalism',
+                'description_complexity', 'channel_ai_specialization', 'metadata_consistency_score')
+TEXT_POSITIONS = [FEATURE_COLUMNS.index(column) for column in TEXT_COLUMNS]
+CHANNEL_GROUP = ('advanced_channel', 1)
+CHANNEL_COLUMNS = ('upload_frequency_score', 'content_pattern_regularity')
+CHANNEL_POSITIONS = [FEATURE_COLUMNS.index(column) for column in CHANNEL_COLUMNS]
+BEHAVIORAL_POSITIONS = [4, 5, 6]
+
+# Rows per task when feature groups are computed in worker processes
+PARALLEL_CHUNK_SIZE = 2000
+
+def hours_since(publish_time, now=None):
+    """Hours from an ISO publish time to ``now``, or None if it cannot be parsed"""
+    if not publish_time:
+        return None
+    try:
+        # Very basic time-based estimation
+        publish_date = datetime.fromisoformat(publish_time.replace('Z', '+00:00'))
+        return ((now or datetime.now().astimezone()) - publish_date).total_seconds() / 3600
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+def peak_rss_mb(children=False):
+    """Peak resident memory of this process (or its reaped children) in MB; None where unsupported"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024  # bytes on macOS, KB elsewhere
+
+@contextmanager
+def training_stage(stages, name):
+    """Append the wall time and peak memory of the enclosed stage to ``stages``
+    
+    Memory is the process's peak RSS, which only grows, so the growth
+    during a stage is what that stage added to the peak.
+    """
+    peak_before = peak_rss_mb()
+    start = time.perf_counter()
+    yield
+    peak = peak_rss_mb()
+    stages.append({
+        'stage': name,
+        'seconds': time.perf_counter() - start,
+        'peak_rss_mb': peak,
+        'peak_growth_mb': None if peak is None else peak - peak_before
+    })
 
 class AdvancedAIAnalyzer:
     def __init__(self):
-        self.feature_names = [
-            'title_ai_keyword_density', 'description_ai_keyword_density',
-            'engagement_anomaly_score', 'upload_frequency_score',
-            'title_sensationalism', 'description_complexity',
-            'comment_sentiment_variance', 'metadata_consistency_score',
-            'channel_ai_specialization', 'content_pattern_regularity'
-        ]
+        self.feature_names = list(FEATURE_COLUMNS)
         self.model = None
-        self.scaler = StandardScaler()
+        self.scaler = None
+        self.feature_indices = None  # feature columns the model was fitted on; None for all
+        self._loaded = None  # registry entry the model and scaler came from
+        self.training_stages = []  # time and memory per stage of the last train_model
+        
+    def extract_advanced_features(self, video_data, channel_history=None, now=None):
+        """Extract sophisticated features for AI content detection
         
-    def extract_advanced_features(self, video_data, channel_history=None):
-        """Extract sophisticated features for AI content detection"""
+        View velocity is measured up to ``now`` (default: the current time).
+        """
         features = []
         
         # 1. Textual Analysis Features
         features.extend(self._analyze_text_patterns(video_data))
         
         # 2. Behavioral Features
-        features.extend(self._analyze_behavioral_patterns(video_data, channel_history))
+        features.extend(self._analyze_behavioral_patterns(video_data, channel_history, now))
         
         # 3. Temporal Features
         features.extend(self._analyze_temporal_patterns(video_data, channel_history))
@@ -39,34 +109,216 @@ class AdvancedAIAnalyzer:
         
         return np.array(features)
     
+    def extract_features_frame(self, frame, now=None):
+        """extract_advanced_features over a video frame (see video_frame.videos_to_frame)
+        
+        Returns a DataFrame indexed like ``frame`` with one column per
+        feature (FEATURE_COLUMNS), equal to the per-row path given the same
+        ``now`` (default: the current time, taken once). Rows the per-row
+        path cannot extract, those with a view count of 0, are NaN. String
+        matching stays per row; everything after it is array arithmetic, and
+        channel features are computed once per distinct upload history.
+        """
+        now = now or datetime.now().astimezone()
+        texts = frame['text_context'].tolist()
+        views = frame['view_count'].to_numpy()
+        
+        X = np.empty((len(frame), FEATURE_COUNT))
+        X[:, TEXT_POSITIONS] = self._text_features_batch(texts)
+        X[:, CHANNEL_POSITIONS] = self._temporal_features_batch(frame['channel_context'].tolist())
+        X[:, BEHAVIORAL_POSITIONS], failed = self._behavioral_features_batch(
+            views, frame['like_count'].to_numpy(), frame['comment_count'].to_numpy(), views,
+            frame['published_at'].tolist(), now
+        )
+        X[failed] = np.nan
+        return pd.DataFrame(X, index=frame.index, columns=FEATURE_COLUMNS)
+    
+    def feature_matrix(self, videos, channel_histories=None, store=None, now=None, pool=None):
+        """extract_advanced_features for many videos, reusing stored feature groups
+        
+        Text and channel features come from the feature store while the
+        inputs they were computed from are unchanged; only the others are
+        computed (and stored), in vectorized form. ``store`` defaults to the
+        shared store; pass False to compute everything. Returns the feature
+        rows and a dict of the exception raised for each row that could not
+        be extracted (its row is left at zero). With a process ``pool``,
+        text and channel groups are computed in chunks across its workers.
+        """
+        if store is None:
+            store = get_feature_store()
+        if channel_histories is None:
+            channel_histories = [None] * len(videos)
+        store = store or None
+        now = now or datetime.now().astimezone()
+        keys = [video_data.get('video_id') for video_data in videos]
+        X = np.zeros((len(videos), FEATURE_COUNT))
+        errors = {}
+        
+        def payload(group, i):
+            """What a worker needs for row i: raw text fields or the upload history"""
+            if group != TEXT_GROUP[0]:
+                return channel_histories[i]
+            text = text_context(videos[i])
+            return text.title, text.description, text.tags, text.channel_title
+        
+        def compute(positions, group, batch, extract):
+            """Rows from the vectorized ``batch``, or row by row if it raises"""
+            try:
+                if pool is None or len(positions) <= PARALLEL_CHUNK_SIZE:
+                    return batch(positions).tolist()
+                chunks = [positions[start:start + PARALLEL_CHUNK_SIZE]
+                          for start in range(0, len(positions), PARALLEL_CHUNK_SIZE)]
+                futures = [pool.submit(_extract_group, group, [payload(group, i) for i in chunk]) for chunk in chunks]
+                return [row for future in futures for row in future.result().tolist()]
+            except Exception:
+                pass
+            rows = []
+            for i in positions:
+                try:
+                    rows.append(tuple(extract(i)))
+                except Exception as e:
+                    errors.setdefault(i, e)
+                    rows.append(None)
+            return rows
+        
+        def text_batch(positions):
+            return self._text_features_batch([text_context(videos[i]) for i in positions])
+        
+        def extract_text(i):
+            return self._analyze_text_patterns(videos[i]) + self._analyze_network_patterns(videos[i])
+        
+        def channel_batch(positions):
+            return self._temporal_features_batch([channel_histories[i] for i in positions])
+        
+        def extract_channel(i):
+            return self._analyze_temporal_patterns(videos[i], channel_histories[i])
+        
+        text_hashes = [None] * len(videos)
+        channel_hashes = [None] * len(videos)
+        if store is not None:
+            for i, video_data in enumerate(videos):
+                text = text_context(video_data)
+                text_hashes[i] = input_hash(TEXT_GROUP, text.title, text.description, text.tags, text.channel_title)
+                channel_hashes[i] = input_hash(CHANNEL_GROUP, [
+                    item.get('published_at') for item in channel_histories[i] or []
+                ])
+        
+        groups = [
+            (TEXT_GROUP, TEXT_COLUMNS, TEXT_POSITIONS, text_hashes, text_batch, extract_text),
+            (CHANNEL_GROUP, CHANNEL_COLUMNS, CHANNEL_POSITIONS, channel_hashes, channel_batch, extract_channel)
+        ]
+        for (name, _), columns, positions, hashes, batch, extract in groups:
+            rows = cached_rows(store, name, columns, keys, hashes, lambda stale: compute(stale, name, batch, extract))
+            extracted = [i for i, row in enumerate(rows) if row is not None]
+            if extracted:
+                X[np.ix_(extracted, positions)] = np.array([rows[i] for i in extracted], dtype=np.float64)
+        
+        try:
+            stats = [video_data.get('stats', {}) for video_data in videos]
+            X[:, BEHAVIORAL_POSITIONS], failed = self._behavioral_features_batch(
+                np.array([item.get('viewCount', 1) for item in stats], dtype=np.int64),
+                np.array([item.get('likeCount', 0) for item in stats], dtype=np.int64),
+                np.array([item.get('commentCount', 0) for item in stats], dtype=np.int64),
+                np.array([item.get('viewCount', 0) for item in stats], dtype=np.int64),
+                [video_data.get('published_at') for video_data in videos], now
+            )
+            for i in np.flatnonzero(failed):
+                X[i, BEHAVIORAL_POSITIONS] = 0.0
+                errors.setdefault(int(i), ZeroDivisionError('division by zero'))
+        except Exception:
+            for i, (video_data, channel_history) in enumerate(zip(videos, channel_histories)):
+                try:
+                    X[i, BEHAVIORAL_POSITIONS] = self._analyze_behavioral_patterns(video_data, channel_history, now)
+                except Exception as e:
+                    errors.setdefault(i, e)
+        return X, errors
+    
+    def _text_features_batch(self, texts):
+        """Text and network features (TEXT_COLUMNS order) for many TextContexts"""
+        title_words = np.array([text.title_word_count for text in texts], dtype=np.int64)
+        desc_words = np.array([text.description_word_count for text in texts], dtype=np.int64)
+        title_lower = [text.title_lower for text in texts]
+        description_lower = [text.description_lower for text in texts]
+        title_hits = TEXT_MATCHER.count_many('ai_phrases', title_lower)
+        desc_hits = TEXT_MATCHER.count_many('ai_phrases', description_lower)
+        sensational_hits = TEXT_MATCHER.count_many('sensational_words', [text.title_upper for text in texts])
+        channel_hits = TEXT_MATCHER.count_many('ai_channel_indicators', [text.channel_title_lower for text in texts])
+        
+        # Metadata consistency: (video, term, field) appearances, as in
+        # _check_metadata_consistency, averaged over the terms that appear
+        appearances = np.stack([
+            TEXT_MATCHER.found_many('ai_terms', title_lower),
+            TEXT_MATCHER.found_many('ai_terms', description_lower),
+            TEXT_MATCHER.found_many('ai_terms', [text.tags_text for text in texts])
+        ], axis=2).astype(np.int64)
+        appearing = appearances.any(axis=2)
+        term_counts = appearing.sum(axis=1)
+        consistency_sum = np.where(appearing, np.std(appearances, axis=2), 0.0).sum(axis=1)
+        metadata_consistency = np.where(term_counts > 0, 1 - consistency_sum / np.maximum(term_counts, 1), 0.5)
+        
+        return np.column_stack([
+            title_hits / np.maximum(1, title_words),
+            desc_hits / np.maximum(1, desc_words),
+            sensational_hits / np.maximum(1, title_words),
+            np.minimum(desc_words / 100, 1.0),
+            np.minimum(channel_hits / 3, 1.0),
+            metadata_consistency
+        ]).reshape(len(texts), len(TEXT_COLUMNS))
+    
+    def _temporal_features_batch(self, channel_histories):
+        """Temporal features for many histories, computed once per distinct history object"""
+        computed = {}
+        rows = []
+        for channel_history in channel_histories:
+            row = computed.get(id(channel_history))
+            if row is None:
+                row = computed[id(channel_history)] = self._analyze_temporal_patterns(None, channel_history)
+            rows.append(row)
+        return np.array(rows, dtype=np.float64).reshape(len(channel_histories), len(CHANNEL_COLUMNS))
+    
+    def _behavioral_features_batch(self, views, likes, comments, velocity_views, published_at, now):
+        """Behavioral features from count arrays; also returns the mask of zero-view rows
+        
+        ``views`` is the view count as the engagement ratio reads it and
+        ``velocity_views`` as view velocity does; they differ only in the
+        default for a missing count (1 and 0).
+        """
+        failed = views == 0
+        actual_engagement = (likes + comments) / np.where(failed, 1, views)
+        engagement_anomaly = np.minimum(np.abs(actual_engagement - 0.05) * 10, 1.0)
+        
+        like_comment_ratio = likes / np.maximum(1, comments)
+        ratio_anomaly = np.minimum(np.abs(like_comment_ratio - 10) / 20, 1.0)
+        
+        hours = np.array([hours_since(publish_time, now) for publish_time in published_at], dtype=np.float64)
+        positive = hours > 0
+        view_velocity = np.where(
+            positive, np.minimum(velocity_views / np.where(positive, hours, 1.0) / 1000, 1.0), 0.5
+        )
+        
+        features = np.column_stack([engagement_anomaly, ratio_anomaly, view_velocity])
+        return features.reshape(len(views), len(BEHAVIORAL_POSITIONS)), failed
+    
     def _analyze_text_patterns(self, video_data):
         """Advanced text analysis beyond simple keywords"""
-        title = video_data.get('title', '')
-        description = video_data.get('description', '')
+        text = text_context(video_data)
         
         # 1. AI keyword density with context
-        ai_phrases = [
-            'created with AI', 'generated by', 'AI tool', 'neural network',
-            'machine learning model', 'synthetic media', 'deepfake',
-            'GAN generated', 'diffusion model', 'prompt engineering'
-        ]
-        
-        title_words = len(title.split())
-        desc_words = len(description.split())
+        title_words = text.title_word_count
+        desc_words = text.description_word_count
         
-        title_score = sum(1 for phrase in ai_phrases if phrase.lower() in title.lower()) / max(1, title_words)
-        desc_score = sum(1 for phrase in ai_phrases if phrase.lower() in description.lower()) / max(1, desc_words)
+        title_score = TEXT_MATCHER.count('ai_phrases', text.title_lower) / max(1, title_words)
+        desc_score = TEXT_MATCHER.count('ai_phrases', text.description_lower) / max(1, desc_words)
         
         # 2. Title sensationalism score
-        sensational_words = ['SHOCKING', 'AMAZING', 'INCREDIBLE', 'MIND-BLOWING', 'UNBELIEVABLE', 'BREAKING']
-        sensational_score = sum(1 for word in sensational_words if word in title.upper()) / max(1, title_words)
+        sensational_score = TEXT_MATCHER.count('sensational_words', text.title_upper) / max(1, title_words)
         
         # 3. Description complexity (AI content often has technical descriptions)
-        desc_complexity = min(len(description.split()) / 100, 1.0)  # Normalized
+        desc_complexity = min(desc_words / 100, 1.0)  # Normalized
         
         return [title_score, desc_score, sensational_score, desc_complexity]
     
-    def _analyze_behavioral_patterns(self, video_data, channel_history):
+    def _analyze_behavioral_patterns(self, video_data, channel_history, now=None):
         """Analyze upload and engagement patterns"""
         stats = video_data.get('stats', {})
         views = stats.get('viewCount', 1)
@@ -84,7 +336,7 @@ class AdvancedAIAnalyzer:
         ratio_anomaly = min(abs(like_comment_ratio - 10) / 20, 1.0)  # Normalize
         
         # 3. View velocity (simplified)
-        view_velocity = self._calculate_view_velocity(video_data, channel_history)
+        view_velocity = self._calculate_view_velocity(video_data, channel_history, now)
         
         return [engagement_anomaly, ratio_anomaly, view_velocity]
     
@@ -101,65 +353,54 @@ class AdvancedAIAnalyzer:
     def _analyze_network_patterns(self, video_data):
         """Analyze channel network and metadata patterns"""
         # 1. Channel specialization in AI content
-        channel_title = video_data.get('channel_title', '').lower()
-        ai_channel_indicators = ['ai', 'artificial', 'neural', 'machine learning', 'tech', 'future', 'digital art']
-        channel_specialization = sum(1 for term in ai_channel_indicators if term in channel_title) / 3
+        channel_title = text_context(video_data).channel_title_lower
+        channel_specialization = TEXT_MATCHER.count('ai_channel_indicators', channel_title) / 3
         
         # 2. Metadata consistency
         metadata_consistency = self._check_metadata_consistency(video_data)
         
         return [min(channel_specialization, 1.0), metadata_consistency]
     
-    def _calculate_view_velocity(self, video_data, channel_history):
+    def _calculate_view_velocity(self, video_data, channel_history, now=None):
         """Calculate how quickly views are accumulating"""
         # Simplified version - in reality you'd need historical data
-        publish_time = video_data.get('published_at')
-        if publish_time:
-            try:
-                # Very basic time-based estimation
-                publish_date = datetime.fromisoformat(publish_time.replace('Z', '+00:00'))
-                time_since_publish = (datetime.now().astimezone() - publish_date).total_seconds() / 3600  # hours
-                
-                views = video_data.get('stats', {}).get('viewCount', 0)
-                if time_since_publish > 0:
-                    views_per_hour = views / time_since_publish
-                    # Normalize (1000 views/hour = max score)
-                    return min(views_per_hour / 1000, 1.0)
-            except:
-                pass
+        time_since_publish = hours_since(video_data.get('published_at'), now)
+        if time_since_publish is not None and time_since_publish > 0:
+            views = video_data.get('stats', {}).get('viewCount', 0)
+            views_per_hour = views / time_since_publish
+            # Normalize (1000 views/hour = max score)
+            return min(views_per_hour / 1000, 1.0)
         return 0.5
     
     def _calculate_upload_consistency(self, channel_history):
         """Calculate how consistent upload patterns are"""
-        if not channel_history or len(channel_history) < 3:
+        consistency = upload_consistency(channel_history)
+        if consistency is None:
             return 0.5
-        
-        # Simplified consistency calculation
-        return 0.7
+        return consistency
     
     def _calculate_pattern_regularity(self, channel_history):
         """Calculate regularity in content patterns"""
-        if not channel_history:
+        regularity = publish_hour_regularity(channel_history)
+        if regularity is None:
             return 0.5
-        return 0.6
+        return regularity
     
     def _check_metadata_consistency(self, video_data):
         """Check consistency between title, description, and tags"""
-        title = video_data.get('title', '').lower()
-        description = video_data.get('description', '').lower()
-        tags = video_data.get('tags', [])
-        
-        # Check if key terms appear consistently across metadata
-        all_text = f"{title} {description} {' '.join(tags)}".lower()
+        text = text_context(video_data)
         
-        ai_terms = ['ai', 'artificial', 'generated', 'neural', 'machine learning']
+        # Check if key terms appear consistently across metadata; terms never
+        # contain a newline, so a term is in some tag iff it is in the joined tags
         term_consistency = []
         
-        for term in ai_terms:
+        for in_title, in_description, in_tags in zip(TEXT_MATCHER.found('ai_terms', text.title_lower),
+                                                     TEXT_MATCHER.found('ai_terms', text.description_lower),
+                                                     TEXT_MATCHER.found('ai_terms', text.tags_text)):
             appearances = []
-            appearances.append(1 if term in title else 0)
-            appearances.append(1 if term in description else 0)
-            appearances.append(1 if any(term in tag.lower() for tag in tags) else 0)
+            appearances.append(1 if in_title else 0)
+            appearances.append(1 if in_description else 0)
+            appearances.append(1 if in_tags else 0)
             
             # Only calculate if term appears at least once
             if sum(appearances) > 0:
@@ -169,82 +410,224 @@ class AdvancedAIAnalyzer:
             return 1 - np.mean(term_consistency)  # Higher = more consistent
         return 0.5
     
-    def train_model(self, training_data):
-        """Train a simple ML model on extracted features"""
-        X = np.array([self.extract_advanced_features(item['video_data']) for item in training_data])
-        y = np.array([item['is_ai_content'] for item in training_data])
-        
-        # Scale features
-        X_scaled = self.scaler.fit_transform(X)
-        
-        # Train lightweight Random Forest
-        self.model = RandomForestClassifier(
-            n_estimators=50,
-            max_depth=10,
-            random_state=42,
-            n_jobs=1  # Use only one core for compatibility
-        )
-        self.model.fit(X_scaled, y)
-        
-        # Save model
+    def train_model(self, training_data, n_jobs=None, incremental=False, add_trees=None,
+                    n_estimators=50, max_depth=10, feature_indices=None):
+        """Train a simple ML model on extracted features
+        
+        ``n_jobs`` (default Config.TRAIN_N_JOBS, -1 for every CPU) sets both
+        the worker processes that extract features and the forest's n_jobs.
+        With ``incremental``, the saved model is extended instead: its scaler
+        is kept so the existing trees stay valid, and ``add_trees`` (default
+        Config.TRAIN_INCREMENT_TREES) new trees are fitted on
+        ``training_data`` alone, which then only needs the newly labeled
+        videos. Time and peak memory of every stage are printed and kept in
+        ``self.training_stages``.
+        
+        ``n_estimators`` and ``max_depth`` size a new forest, and
+        ``feature_indices`` restricts it to those feature columns
+        (benchmarks/bench_model_selection.py measures the trade-offs); an
+        extended model keeps the columns it was fitted on.
+        
+        Besides the joblib file, the forest is exported as arrays to
+        Config.ML_FOREST_PATH, which predict uses without importing sklearn.
+        """
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.preprocessing import StandardScaler
+        
+        n_jobs = joblib.effective_n_jobs(Config.TRAIN_N_JOBS if n_jobs is None else n_jobs)
+        base = self._saved_model() if incremental else None
+        self.training_stages = []
+        
+        with training_stage(self.training_stages, 'features'):
+            videos = [item['video_data'] for item in training_data]
+            if n_jobs > 1:
+                with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                    X, errors = self.feature_matrix(videos, pool=pool)
+            else:
+                X, errors = self.feature_matrix(videos)
+            feature_store = get_feature_store()
+            if feature_store is not None:
+                feature_store.flush()
+            if errors:
+                raise errors[min(errors)]
+            y = np.array([item['is_ai_content'] for item in training_data])
+        if n_jobs > 1:
+            # Workers are reaped once the pool shuts down
+            self.training_stages[-1]['workers_peak_rss_mb'] = peak_rss_mb(children=True)
+        
+        with training_stage(self.training_stages, 'scale'):
+            if base is not None:
+                self.scaler = base['scaler']
+                self.feature_indices = base.get('feature_indices')
+            else:
+                # Scale features
+                self.scaler = StandardScaler().fit(X)
+                self.feature_indices = feature_indices
+            X_scaled = self._model_input(X)
+        
+        with training_stage(self.training_stages, 'fit'):
+            if base is not None:
+                self.model = base['model']
+                if set(np.unique(y)) != set(self.model.classes_):
+                    raise ValueError(f"Incremental training data must contain every class {list(self.model.classes_)}")
+                # warm_start keeps the fitted trees and only fits the added ones
+                self.model.set_params(
+                    warm_start=True,
+                    n_estimators=len(self.model.estimators_) + (add_trees or Config.TRAIN_INCREMENT_TREES),
+                    n_jobs=n_jobs
+                )
+            else:
+                # Train lightweight Random Forest
+                self.model = RandomForestClassifier(
+                    n_estimators=n_estimators,
+                    max_depth=max_depth,
+                    random_state=42,
+                    n_jobs=n_jobs
+                )
+            self.model.fit(X_scaled, y)
+            # Inference scores small chunks, where worker threads only add overhead
+            self.model.set_params(warm_start=False, n_jobs=1)
+        
+        with training_stage(self.training_stages, 'save'):
+            self.save_model(self.model, self.scaler, self.feature_indices)
+        
+        mode = f"extended to {len(self.model.estimators_)} trees" if base is not None else "trained"
+        print(f"Model {mode} on {len(y)} videos and saved to {Config.ML_MODEL_PATH} (arrays in {Config.ML_FOREST_PATH})")
+        self._print_training_stages(n_jobs)
+        return self.model
+    
+    def save_model(self, model, scaler, feature_indices=None):
+        """Save a fitted forest and scaler as the model file and its array export
+        
+        ``feature_indices`` are the scaled feature columns the forest was
+        fitted on, None for all of them.
+        """
+        self.model = model
+        self.scaler = scaler
+        self.feature_indices = None if feature_indices is None else [int(i) for i in feature_indices]
+        self.feature_names = list(FEATURE_COLUMNS)
         model_data = {
             'model': self.model,
             'scaler': self.scaler,
             'feature_names': self.feature_names,
+            'feature_indices': self.feature_indices,
             'trained_at': datetime.now().isoformat()
         }
         joblib.dump(model_data, Config.ML_MODEL_PATH)
-        
-        print(f"Model trained and saved to {Config.ML_MODEL_PATH}")
-        return self.model
+        # The export maps split features back to full feature rows
+        export_forest(self.model, self.scaler, self.feature_names, Config.ML_FOREST_PATH, self.feature_indices)
+        get_model_registry().invalidate(Config.ML_MODEL_PATH)
+        get_model_registry().invalidate(Config.ML_FOREST_PATH)
     
-    def load_model(self):
-        """Load pre-trained model"""
+    def _model_input(self, X):
+        """Scaled feature rows restricted to the columns the model was fitted on"""
+        X_scaled = self.scaler.transform(X)
+        if self.feature_indices is not None:
+            X_scaled = X_scaled[:, self.feature_indices]
+        return X_scaled
+    
+    def _saved_model(self):
+        """A private copy of the saved sklearn model and scaler to extend, or None"""
         try:
-            loaded = joblib.load(Config.ML_MODEL_PATH)
+            # Not the registry's shared, memory-mapped entry: fitting modifies it
+            return joblib.load(Config.ML_MODEL_PATH)
+        except Exception as e:
+            print(f"No saved model to extend ({e}), training from scratch")
+            return None
+    
+    def _print_training_stages(self, n_jobs):
+        for stage in self.training_stages:
+            memory = "peak RSS n/a"
+            if stage['peak_rss_mb'] is not None:
+                memory = f"peak RSS {stage['peak_rss_mb']:.0f} MB (+{stage['peak_growth_mb']:.0f} MB)"
+            workers = ""
+            if stage.get('workers_peak_rss_mb') is not None:
+                workers = f", largest of {n_jobs} workers {stage['workers_peak_rss_mb']:.0f} MB"
+            print(f"   {stage['stage']:<8} {stage['seconds']:7.2f} s  {memory}{workers}")
+    
+    def load_model(self):
+        """Use the registry's current pre-trained model; False while there is none
+        
+        The registry loads the file once per process, remembers a missing
+        file and picks up a replaced one, so this is cheap to call per video.
+        The memory-mapped array export is preferred; the joblib file (which
+        imports sklearn) is only used when there is no export, or when it is
+        newer than the export because other tooling replaced it. Without
+        either file, a model assigned to or fitted on this instance is kept.
+        """
+        registry = get_model_registry()
+        forest_mtime = registry.mtime(Config.ML_FOREST_PATH)
+        model_mtime = registry.mtime(Config.ML_MODEL_PATH)
+        loaded = None
+        if forest_mtime is not None and (model_mtime is None or forest_mtime >= model_mtime):
+            loaded = registry.get(Config.ML_FOREST_PATH, load_forest)
+        if loaded is None:
+            # Reports a missing model file once
+            loaded = registry.get(Config.ML_MODEL_PATH)
+        if loaded is None:
+            return self.model is not None and self.scaler is not None
+        if loaded is not self._loaded:
+            self._loaded = loaded
             self.model = loaded['model']
             self.scaler = loaded['scaler']
             self.feature_names = loaded.get('feature_names', self.feature_names)
-            print("Pre-trained model loaded successfully")
-            return True
-        except Exception as e:
-            print(f"Could not load model: {e}")
-            return False
+            self.feature_indices = loaded.get('feature_indices')
+        return True
     
     def predict(self, video_data, channel_history=None):
         """Predict if content is AI-generated"""
-        if self.model is None and not self.load_model():
+        if not self.load_model():
             # Fallback to rule-based scoring
             return self._fallback_prediction(video_data)
         
         try:
             features = self.extract_advanced_features(video_data, channel_history)
-            features_scaled = self.scaler.transform(features.reshape(1, -1))
+            features_scaled = self._model_input(features.reshape(1, -1))
             probability = self.model.predict_proba(features_scaled)[0][1]
             return probability
         except Exception as e:
             print(f"Prediction error: {e}")
             return self._fallback_prediction(video_data)
     
+    def predict_many(self, videos, channel_histories=None):
+        """predict for many videos with one scaler transform and one model call
+        
+        Features come from feature_matrix, so stored feature groups are
+        reused. Only rows whose feature extraction fails fall back to
+        rule-based scoring on their own.
+        """
+        if channel_histories is None:
+            channel_histories = [None] * len(videos)
+        if not self.load_model():
+            return [self._fallback_prediction(video_data) for video_data in videos]
+        
+        probabilities = [None] * len(videos)
+        X, errors = self.feature_matrix(videos, channel_histories)
+        for i, e in sorted(errors.items()):
+            print(f"Prediction error: {e}")
+            probabilities[i] = self._fallback_prediction(videos[i])
+        
+        positions = [i for i in range(len(videos)) if i not in errors]
+        if positions:
+            try:
+                features_scaled = self._model_input(X[positions])
+                scored = self.model.predict_proba(features_scaled)[:, 1]
+            except Exception as e:
+                print(f"Prediction error: {e}")
+                scored = [self._fallback_prediction(videos[i]) for i in positions]
+            for i, probability in zip(positions, scored):
+                probabilities[i] = probability
+        return probabilities
+    
     def _fallback_prediction(self, video_data):
         """Enhanced fallback to rule-based scoring"""
         score = 0
         
         # Text analysis
-        title = video_data.get('title', '').lower()
-        description = video_data.get('description', '').lower()
+        text = text_context(video_data)
         
         # Advanced pattern matching with weights
-        patterns = [
-            (r'AI.*generated', 3), (r'created.*AI', 3), (r'neural.*network', 2),
-            (r'machine.*learning', 2), (r'synthetic.*media', 3), (r'deepfake', 4),
-            (r'GAN', 3), (r'diffusion.*model', 3), (r'prompt.*engineering', 3),
-            (r'AI.*art', 2), (r'artificial.*intelligence', 2)
-        ]
-        
-        for pattern, weight in patterns:
-            if re.search(pattern, f"{title} {description}", re.IGNORECASE):
-                score += weight
+        score += TEXT_MATCHER.pattern_score('fallback_patterns', text.text)
         
         # Engagement pattern analysis
         stats = video_data.get('stats', {})
@@ -260,9 +643,19 @@ class AdvancedAIAnalyzer:
                 score += 1
         
         # Channel specialization
-        channel_title = video_data.get('channel_title', '').lower()
-        if any(term in channel_title for term in ['ai', 'artificial', 'neural']):
+        if TEXT_MATCHER.matches_any('fallback_channel_terms', text.channel_title_lower):
             score += 2
         
         # Normalize to probability
-        return min(score / 20, 1.0)
\ No newline at end of file
+        return min(score / 20, 1.0)
+
+def _extract_group(group, payloads):
+    """Process-pool entry point: one feature group's rows for a chunk of videos
+    
+    Only raw text fields and upload histories are sent, not the video
+    dicts with their cached normalized text.
+    """
+    analyzer = AdvancedAIAnalyzer()
+    if group == TEXT_GROUP[0]:
+        return analyzer._text_features_batch([TextContext(*fields) for fields in payloads])
+    return analyzer._temporal_features_batch(payloads)
\ No newline at end of file
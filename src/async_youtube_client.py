@@ -0,0 +1,196 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from config import Config
+from youtube_client import YouTubeClient, MAX_IDS_PER_REQUEST, MAX_RESULTS_PER_PAGE
+
+class AsyncYouTubeClient:
+    """asyncio front-end to YouTubeClient that overlaps independent API calls
+    
+    Requests run on a bounded worker pool over the shared keep-alive
+    transport, so at most ``concurrency`` calls (default
+    Config.API_CONCURRENCY) are in flight at once and a group of
+    independent fetches takes about as long as the slowest one. The iter_*
+    methods are async iterators over the paged YouTubeClient streams.
+    """
+    
+    def __init__(self, concurrency=None, transport=None, base_url=None, scheduler=None, cache=None):
+        self.concurrency = concurrency or Config.API_CONCURRENCY
+        self.client = YouTubeClient(transport=transport, base_url=base_url,
+                                    scheduler=scheduler, cache=cache)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency,
+                                            thread_name_prefix='youtube-api')
+    
+    async def get_trending_videos(self, max_results=50):
+        """Get currently popular videos with enhanced data"""
+        return await self._run(self.client.get_trending_videos, max_results)
+    
+    async def iter_trending_videos(self, max_results=None):
+        """Async iterator over paged trending videos"""
+        async for video in self._iterate(self.client.iter_trending_videos(max_results)):
+            yield video
+    
+    async def search_ai_videos(self, query="AI generated", max_results=25):
+        """Search for videos with AI-related terms"""
+        return await self._run(self.client.search_ai_videos, query, max_results)
+    
+    async def iter_search_videos(self, query="AI generated", max_results=None):
+        """Async iterator over paged, detailed search results"""
+        async for video in self._iterate(self.client.iter_search_videos(query, max_results)):
+            yield video
+    
+    async def iter_candidate_videos(self, max_results=None, query="AI generated", buffer_size=MAX_RESULTS_PER_PAGE):
+        """Async stream of unique trending and AI-search videos as their pages arrive
+        
+        Same contract as YouTubeClient.iter_candidate_videos: both feeds are
+        paged concurrently into a bounded buffer and at most ``max_results``
+        unique videos are yielded (default Config.MAX_VIDEOS).
+        """
+        max_results = max_results or Config.MAX_VIDEOS
+        streams = [
+            self.iter_trending_videos(max_results),
+            self.iter_search_videos(query, max_results)
+        ]
+        
+        seen_ids = set()
+        async for video in _merge_streams(streams, buffer_size):
+            video_id = video.get('id')
+            if not video_id or video_id in seen_ids:
+                continue
+            seen_ids.add(video_id)
+            yield video
+            if len(seen_ids) >= max_results:
+                return
+    
+    async def fetch_candidate_videos(self, trending_results=20, search_results=20, query="AI generated"):
+        """Fetch trending and AI-search videos concurrently
+        
+        Returns (trending_videos, search_videos).
+        """
+        trending_videos, search_videos = await asyncio.gather(
+            self.get_trending_videos(max_results=trending_results),
+            self.search_ai_videos(query=query, max_results=search_results)
+        )
+        return trending_videos, search_videos
+    
+    def get_quota_metrics(self):
+        """Remaining daily quota and per-endpoint usage"""
+        return self.client.get_quota_metrics()
+    
+    async def get_video_details(self, video_id):
+        """Get detailed information for a specific video"""
+        videos, _ = await self.get_videos_details([video_id])
+        return videos[0] if videos else None
+    
+    async def get_videos_details(self, video_ids):
+        """Batched videos.list lookups with every 50-ID chunk fetched concurrently
+        
+        Same contract as YouTubeClient.get_videos_details: returns
+        (videos, missing_ids) with videos in input order.
+        """
+        unique_ids = list(dict.fromkeys(vid for vid in video_ids if vid))
+        chunks = [unique_ids[start:start + MAX_IDS_PER_REQUEST]
+                  for start in range(0, len(unique_ids), MAX_IDS_PER_REQUEST)]
+        
+        chunk_results = await asyncio.gather(
+            *(self._run(self.client.get_videos_details, chunk) for chunk in chunks)
+        )
+        
+        found = {}
+        for videos, _ in chunk_results:
+            for video in videos:
+                found[video.get('id')] = video
+        
+        videos = [found[vid] for vid in unique_ids if vid in found]
+        missing_ids = [vid for vid in unique_ids if vid not in found]
+        return videos, missing_ids
+    
+    async def get_channel_videos(self, channel_id, max_results=20):
+        """Get recent videos from a channel for context"""
+        playlists = await self.get_uploads_playlist_ids([channel_id])
+        if not playlists.get(channel_id):
+            return []
+        
+        uploads = [item async for item in self.iter_playlist_uploads(playlists[channel_id], max_results)]
+        channel_videos, _ = await self.get_videos_details([item['video_id'] for item in uploads])
+        return channel_videos
+    
+    async def get_channels_videos(self, channel_ids, max_results=20):
+        """Fetch recent uploads for several channels at once, keyed by channel ID"""
+        channel_ids = list(dict.fromkeys(cid for cid in channel_ids if cid))
+        results = await asyncio.gather(
+            *(self.get_channel_videos(cid, max_results) for cid in channel_ids)
+        )
+        return dict(zip(channel_ids, results))
+    
+    async def get_uploads_playlist_ids(self, channel_ids):
+        """Map channel IDs to their uploads playlist, chunks fetched concurrently"""
+        unique_ids = list(dict.fromkeys(cid for cid in channel_ids if cid))
+        chunks = [unique_ids[start:start + MAX_IDS_PER_REQUEST]
+                  for start in range(0, len(unique_ids), MAX_IDS_PER_REQUEST)]
+        
+        playlists = {}
+        for result in await asyncio.gather(
+                *(self._run(self.client.get_uploads_playlist_ids, chunk) for chunk in chunks)):
+            playlists.update(result)
+        return playlists
+    
+    async def iter_playlist_uploads(self, playlist_id, max_results=None, raise_errors=False):
+        """Async iterator over {'video_id', 'published_at'} of a playlist, newest upload first"""
+        async for item in self._iterate(self.client.iter_playlist_uploads(playlist_id, max_results, raise_errors)):
+            yield item
+    
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args))
+    
+    async def _iterate(self, iterator):
+        """Advance a blocking iterator on the worker pool"""
+        exhausted = object()
+        while True:
+            item = await self._run(next, iterator, exhausted)
+            if item is exhausted:
+                return
+            yield item
+    
+    def close(self):
+        self._executor.shutdown(wait=False)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+async def _merge_streams(streams, buffer_size):
+    """Drain several async iterators concurrently into one bounded stream
+    
+    Each stream is pumped by its own task; producers wait once
+    ``buffer_size`` items are buffered, and are cancelled if the consumer
+    abandons the merged stream.
+    """
+    buffer = asyncio.Queue(maxsize=buffer_size)
+    finished = object()
+    
+    async def produce(stream):
+        try:
+            async for item in stream:
+                await buffer.put(item)
+        except Exception as e:
+            print(f"Error streaming videos: {e}")
+        # Not reached once cancelled, when nothing reads the buffer any more
+        await buffer.put(finished)
+    
+    tasks = [asyncio.ensure_future(produce(stream)) for stream in streams]
+    active = len(tasks)
+    try:
+        while active:
+            item = await buffer.get()
+            if item is finished:
+                active -= 1
+                continue
+            yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
\ No newline at end of file
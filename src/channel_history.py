@@ -0,0 +1,131 @@
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime
+import numpy as np
+import requests
+from config import Config
+from utils import write_atomic
+
+class ChannelHistoryCache:
+    """Recent uploads per channel, fetched cheaply and kept across runs
+    
+    History comes from the channel's uploads playlist (playlistItems.list,
+    1 quota unit per 50 uploads). Each channel is fetched at most once per
+    run, and persisted entries are refreshed incrementally: only pages newer
+    than the last known upload are requested.
+    """
+    
+    def __init__(self, youtube_client, cache_dir=None, max_items=None, refresh_interval=None):
+        self.youtube = youtube_client
+        self.cache_dir = cache_dir or Config.CHANNEL_HISTORY_DIR
+        self.max_items = max_items or Config.CHANNEL_HISTORY_SIZE
+        self.refresh_interval = Config.CHANNEL_HISTORY_REFRESH if refresh_interval is None else refresh_interval
+        self._run_histories = {}
+    
+    def get_history(self, channel_id):
+        """Return [{'video_id', 'published_at'}, ...] newest first, or None if unavailable"""
+        if not channel_id:
+            return None
+        if channel_id in self._run_histories:
+            return self._run_histories[channel_id]
+        
+        self.prefetch([channel_id])
+        return self._run_histories.get(channel_id)
+    
+    def prefetch(self, channel_ids):
+        """Load or refresh history for several channels, resolving playlists in one batch"""
+        pending = [cid for cid in dict.fromkeys(channel_ids) if cid and cid not in self._run_histories]
+        if not pending:
+            return
+        
+        entries = {cid: self._load(cid) for cid in pending}
+        unresolved = [cid for cid, entry in entries.items() if not entry.get('uploads_playlist_id')]
+        if unresolved:
+            playlists = self.youtube.get_uploads_playlist_ids(unresolved)
+            for cid in unresolved:
+                entries[cid]['uploads_playlist_id'] = playlists.get(cid)
+        
+        for cid, entry in entries.items():
+            if entry.get('uploads_playlist_id') and self._is_stale(entry) and self._refresh(entry):
+                self._save(cid, entry)
+            self._run_histories[cid] = entry['items'] or None
+    
+    def _is_stale(self, entry):
+        return time.time() - entry.get('fetched_at', 0) >= self.refresh_interval
+    
+    def _refresh(self, entry):
+        """Prepend uploads newer than the newest one already stored
+        
+        Returns False, leaving the entry unchanged so it is retried, when a
+        page could not be fetched (including quota deferrals): a partial
+        fetch could leave a gap between the new uploads and the stored ones.
+        """
+        known_ids = {item['video_id'] for item in entry['items']}
+        new_items = []
+        try:
+            for item in self.youtube.iter_playlist_uploads(entry['uploads_playlist_id'], self.max_items,
+                                                           raise_errors=True):
+                if item['video_id'] in known_ids:
+                    break
+                new_items.append(item)
+        except requests.RequestException as e:
+            print(f"Could not refresh channel history: {e}")
+            return False
+        
+        entry['items'] = (new_items + entry['items'])[:self.max_items]
+        entry['fetched_at'] = time.time()
+        return True
+    
+    def _path(self, channel_id):
+        return os.path.join(self.cache_dir, f"{channel_id}.json")
+    
+    def _load(self, channel_id):
+        try:
+            with open(self._path(channel_id), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'uploads_playlist_id': None, 'fetched_at': 0, 'items': []}
+    
+    def _save(self, channel_id, entry):
+        try:
+            write_atomic(self._path(channel_id), json.dumps(entry))
+        except OSError as e:
+            print(f"Could not save channel history: {e}")
+
+def upload_times(channel_history):
+    """Parse upload timestamps from a channel history, oldest first"""
+    times = []
+    for item in channel_history or []:
+        published_at = item.get('published_at')
+        if not published_at:
+            continue
+        try:
+            times.append(datetime.fromisoformat(published_at.replace('Z', '+00:00')))
+        except ValueError:
+            continue
+    return sorted(times)
+
+def upload_consistency(channel_history):
+    """1 for uploads at perfectly even intervals, towards 0 for erratic ones"""
+    times = upload_times(channel_history)
+    if len(times) < 3:
+        return None
+    
+    intervals = np.diff([t.timestamp() for t in times])
+    mean_interval = np.mean(intervals)
+    if mean_interval <= 0:
+        return None
+    
+    # Coefficient of variation of the gaps between uploads
+    return 1 - min(np.std(intervals) / mean_interval, 1.0)
+
+def publish_hour_regularity(channel_history):
+    """Share of uploads published in the channel's most common hour of day"""
+    times = upload_times(channel_history)
+    if len(times) < 3:
+        return None
+    
+    hour_counts = Counter(t.hour for t in times)
+    return hour_counts.most_common(1)[0][1] / len(times)
\ No newline at end of file
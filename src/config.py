@@ -5,6 +5,7 @@ load_dotenv()
 
 class Config:
     YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
+    YOUTUBE_API_BASE_URL = os.getenv('YOUTUBE_API_BASE_URL', 'https://www.googleapis.com/youtube/v3')
     MAX_VIDEOS = int(os.getenv('MAX_VIDEOS', 50))
     UPDATE_FREQUENCY = int(os.getenv('UPDATE_FREQUENCY', 6))
     AI_KEYWORDS = [
@@ -16,9 +17,98 @@ class Config:
     
     # Advanced analysis settings
     ML_MODEL_PATH = 'ai_detector_model.joblib'
+    ML_FOREST_PATH = 'ai_detector_model.forest'  # array export of the model, used for inference
+    MODEL_RECHECK_INTERVAL = float(os.getenv('MODEL_RECHECK_INTERVAL', 30))  # seconds between checks for a new or changed model file
+    TRAIN_N_JOBS = int(os.getenv('TRAIN_N_JOBS', 1))  # feature-extraction processes and forest jobs; -1 uses every CPU
+    TRAIN_INCREMENT_TREES = int(os.getenv('TRAIN_INCREMENT_TREES', 10))  # trees added per incremental training run
+    MODEL_LATENCY_BUDGET_MS = float(os.getenv('MODEL_LATENCY_BUDGET_MS', 1.0))  # median single-video scoring time allowed when selecting a model
     CONFIDENCE_THRESHOLD = float(os.getenv('CONFIDENCE_THRESHOLD', 0.7))
+    # Cascade scoring: the ML model is skipped when the ensemble score is
+    # within CASCADE_EXIT_MARGIN of 0 or 1, and the thumbnail unless the
+    # running score is within CASCADE_BAND of CONFIDENCE_THRESHOLD
+    CASCADE_ENABLED = os.getenv('CASCADE_ENABLED', '0') == '1'
+    CASCADE_EXIT_MARGIN = float(os.getenv('CASCADE_EXIT_MARGIN', 0.1))
+    CASCADE_BAND = float(os.getenv('CASCADE_BAND', 0.15))
     MIN_VIEWS_FOR_ANALYSIS = 1000
     
+    # HTTP transport settings
+    HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', 10))
+    HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', 10))
+    HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 3))
+    HTTP_BACKOFF_BASE = 0.5  # seconds, doubled on every retry
+    HTTP_BACKOFF_MAX = 30
+    API_CONCURRENCY = int(os.getenv('API_CONCURRENCY', 8))  # parallel requests in AsyncYouTubeClient
+    
+    # API quota settings (YouTube grants 10,000 units per day by default)
+    DAILY_QUOTA = int(os.getenv('DAILY_QUOTA', 10000))
+    API_RATE_LIMIT = float(os.getenv('API_RATE_LIMIT', 10))  # requests per second
+    QUOTA_SEARCH_RESERVE = int(os.getenv('QUOTA_SEARCH_RESERVE', 1000))  # units kept back from search.list
+    QUOTA_STATE_PATH = os.getenv('QUOTA_STATE_PATH', '.quota_state.json')
+    QUOTA_SAVE_INTERVAL = float(os.getenv('QUOTA_SAVE_INTERVAL', 10))  # seconds between quota state writes
+    
+    # Conditional-request response cache; TTLs in seconds
+    RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', '1') == '1'
+    RESPONSE_CACHE_DIR = os.getenv('RESPONSE_CACHE_DIR', os.path.join('.cache', 'responses'))
+    CACHE_PART_TTLS = {
+        'statistics': 60 * 60,             # view/like counts move quickly
+        'snippet': 24 * 60 * 60,
+        'contentDetails': 7 * 24 * 60 * 60
+    }
+    CACHE_ENDPOINT_TTLS = {
+        'search': 6 * 60 * 60,
+        'playlistItems': 60 * 60,          # new uploads should show up quickly
+        'channels': 7 * 24 * 60 * 60       # uploads playlist IDs never change
+    }
+    
+    # Offline fixtures: when set, every API response and thumbnail is recorded
+    # here for replay through `python replay.py serve`
+    RECORD_FIXTURES_DIR = os.getenv('YOUTUBE_RECORD_DIR')
+    
+    # Per-channel upload history (fed to the temporal analyzers)
+    CHANNEL_HISTORY_DIR = os.getenv('CHANNEL_HISTORY_DIR', os.path.join('.cache', 'channels'))
+    CHANNEL_HISTORY_SIZE = int(os.getenv('CHANNEL_HISTORY_SIZE', 50))  # most recent uploads kept
+    CHANNEL_HISTORY_REFRESH = UPDATE_FREQUENCY * 60 * 60  # seconds before checking for new uploads
+    
+    # Thumbnail download pool and content-addressed cache
+    THUMBNAIL_CACHE_DIR = os.getenv('THUMBNAIL_CACHE_DIR', os.path.join('.cache', 'thumbnails'))
+    THUMBNAIL_WORKERS = int(os.getenv('THUMBNAIL_WORKERS', 8))
+    THUMBNAIL_PREFETCH_DEPTH = int(os.getenv('THUMBNAIL_PREFETCH_DEPTH', 16))  # videos downloaded ahead
+    
+    # Resolution thumbnails are analyzed at. The smallest variant covering it
+    # is downloaded and JPEGs are downscaled while decoding. Against full
+    # 1280x720 decodes, 320x180 keeps color variance, brightness, saturation
+    # and contrast within about +/-0.02 on natural images; edge density is
+    # resolution-dependent and reads roughly 0.03-0.06 higher. Images made
+    # mostly of pixel-level noise can move further.
+    THUMBNAIL_ANALYSIS_SIZE = (
+        int(os.getenv('THUMBNAIL_ANALYSIS_WIDTH', 320)),
+        int(os.getenv('THUMBNAIL_ANALYSIS_HEIGHT', 180))
+    )
+    # Pixels per vectorized feature block, default one analysis-size image:
+    # with a 2 MiB L2, blocks of 2+ images spill the float32 temporaries and
+    # cost 1.5-2x more per image; raise it in multiples of the analysis size
+    # on CPUs with larger caches
+    THUMBNAIL_BATCH_PIXELS = int(os.getenv('THUMBNAIL_BATCH_PIXELS', THUMBNAIL_ANALYSIS_SIZE[0] * THUMBNAIL_ANALYSIS_SIZE[1]))
+    ANALYSIS_BATCH_SIZE = int(os.getenv('ANALYSIS_BATCH_SIZE', 16))  # videos scored together in the main loop
+    
+    # Optional process pool for thumbnail decoding and feature extraction
+    THUMBNAIL_PROCESS_POOL = os.getenv('THUMBNAIL_PROCESS_POOL', '0') == '1'
+    THUMBNAIL_PROCESSES = int(os.getenv('THUMBNAIL_PROCESSES', 0)) or os.cpu_count() or 1
+    
+    # Perceptual-hash index of scored thumbnails; thumbnails within
+    # THUMBNAIL_HASH_RADIUS differing bits (of 64) reuse the stored score
+    THUMBNAIL_INDEX_ENABLED = os.getenv('THUMBNAIL_INDEX_ENABLED', '1') == '1'
+    THUMBNAIL_INDEX_PATH = os.getenv('THUMBNAIL_INDEX_PATH', os.path.join('.cache', 'thumbnail_index.json'))
+    THUMBNAIL_HASH_RADIUS = int(os.getenv('THUMBNAIL_HASH_RADIUS', 6))
+    
+    # Columnar store of computed features keyed by video ID (thumbnails by
+    # URL) and a hash of each feature group's inputs; unchanged groups are
+    # read back instead of recomputed
+    FEATURE_STORE_ENABLED = os.getenv('FEATURE_STORE_ENABLED', '1') == '1'
+    FEATURE_STORE_DIR = os.getenv('FEATURE_STORE_DIR', os.path.join('.cache', 'features'))
+    FEATURE_STORE_MAX_SHARDS = int(os.getenv('FEATURE_STORE_MAX_SHARDS', 16))  # shards per group before compacting
+    FEATURE_STORE_FLUSH_ROWS = int(os.getenv('FEATURE_STORE_FLUSH_ROWS', 5000))  # pending rows written as one shard
+    
     # Feature weights for ensemble
     ENSEMBLE_WEIGHTS = {
         'text_analyzer': 0.4,
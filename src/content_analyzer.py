@@ -1,45 +1,293 @@
-import requests
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
+import hashlib
 from PIL import Image
 import numpy as np
 from config import Config
+from thumbnail_cache import ThumbnailFetcher
+from thumbnail_index import MultiIndexHash, dhash, get_thumbnail_index
+from feature_store import get_feature_store, input_hash
+
+# Feature-store group of decoded thumbnail features, keyed by URL and
+# hashed on the image bytes and how they were brought to the analysis size
+THUMBNAIL_GROUP = ('thumbnail', 1)
+THUMBNAIL_COLUMNS = ('dhash', 'color_variance', 'edge_density', 'brightness_consistency',
+                     'saturation_level', 'contrast_level')
 
 class ContentAnalyzer:
-    def __init__(self):
+    def __init__(self, fetcher=None, processes=None, index=None, store=None):
+        self.fetcher = fetcher or ThumbnailFetcher()
+        # A fetcher passed in belongs to (and is closed by) the caller
+        self._owns_fetcher = fetcher is None
+        # Near-duplicate score index; index=False disables it for this analyzer
+        if index is None:
+            index = get_thumbnail_index()
+        self.index = index if index is not False else None
+        self.reused_scores = 0
+        # Stored features skip decoding unchanged thumbnails; store=False disables it
+        if store is None:
+            store = get_feature_store()
+        self.store = store if store is not False else None
+        # Worker processes for decoding and feature extraction; 0 keeps it in-process
+        if processes is None:
+            processes = Config.THUMBNAIL_PROCESSES if Config.THUMBNAIL_PROCESS_POOL else 0
+        self.processes = processes
+        self._process_pool = None
         self.ai_visual_patterns = [
             'surreal_imagery', 'hyper_realistic', 'abstract_patterns',
             'digital_artifacts', 'style_consistency'
         ]
     
+    def prefetch_thumbnail(self, thumbnail_url):
+        """Start downloading a thumbnail ahead of analyze_thumbnail"""
+        self.fetcher.prefetch(thumbnail_url)
+    
     def analyze_thumbnail(self, thumbnail_url):
         """Basic thumbnail analysis (runs on CPU)"""
         try:
             if not thumbnail_url:
                 return 0.5
                 
-            response = requests.get(thumbnail_url, timeout=10)
-            img = Image.open(BytesIO(response.content))
-            
-            # Convert to numpy array for analysis
-            img_array = np.array(img)
-            
-            # Simple feature extraction
-            features = {
-                'color_variance': self._calculate_color_variance(img_array),
-                'edge_density': self._estimate_edge_density(img_array),
-                'brightness_consistency': self._check_brightness_consistency(img_array),
-                'saturation_level': self._calculate_saturation(img_array),
-                'contrast_level': self._calculate_contrast(img_array)
-            }
+            data = self.fetcher.get(thumbnail_url)
+            input_hashes, stored = self._stored_features([thumbnail_url], [data])
+            if stored:
+                thumb_hash, features = stored[0]
+                cached = self._cached_score(thumbnail_url, thumb_hash)
+                if cached is not None:
+                    return cached
+            elif self.processes:
+                thumb_hash, features = self._get_process_pool().submit(thumbnail_features, data).result()
+                self._store_features([thumbnail_url], input_hashes, [thumb_hash], [features])
+                cached = self._cached_score(thumbnail_url, thumb_hash)
+                if cached is not None:
+                    return cached
+            else:
+                img = decode_thumbnail(data)
+                
+                # Near-duplicates of an already scored thumbnail reuse its score
+                thumb_hash = dhash(img) if self.index is not None or self.store is not None else None
+                cached = self._cached_score(thumbnail_url, thumb_hash)
+                if cached is not None:
+                    return cached
+                
+                # Simple feature extraction, on the same array as every other mode
+                features = self.extract_features(analysis_array(img))
+                self._store_features([thumbnail_url], input_hashes, [thumb_hash], [features])
             
             # Score based on common AI art characteristics
             score = self._calculate_thumbnail_score(features)
+            self._index_score(thumbnail_url, thumb_hash, score)
             return score
             
         except Exception as e:
             print(f"Thumbnail analysis failed: {e}")
             return 0.5
     
+    def analyze_thumbnails_batch(self, thumbnail_urls):
+        """Score many thumbnails at once; returns one score per URL
+        
+        Decoded thumbnails are brought to Config.THUMBNAIL_ANALYSIS_SIZE and
+        stacked into an (N, H, W, 3) array, and every feature and score is
+        computed for the whole stack in vectorized form, exactly as
+        analyze_thumbnail and the process pool score them; missing or broken
+        thumbnails score 0.5 and indexed near-duplicates reuse their stored
+        score. Thumbnails whose bytes have stored features are
+        scored from those without decoding.
+        """
+        for url in thumbnail_urls:
+            self.fetcher.prefetch(url)
+        if self.processes:
+            return self._analyze_in_processes(thumbnail_urls)
+        
+        scores = [0.5] * len(thumbnail_urls)
+        images = []
+        positions = []
+        hashes = []
+        pending = MultiIndexHash(self.index.radius if self.index is not None else 0)  # hashes of this batch's thumbnails awaiting scores
+        followers = []  # near-duplicates within the batch: (position, hash, image index)
+        datas = self._fetch_all(thumbnail_urls)
+        input_hashes, stored = self._stored_features(thumbnail_urls, datas)
+        for i, url in enumerate(thumbnail_urls):
+            if datas[i] is None:
+                continue
+            if i in stored:
+                scores[i] = self._stored_score(url, *stored[i])
+                continue
+            try:
+                img = decode_thumbnail(datas[i])
+                thumb_hash = dhash(img) if self.index is not None or self.store is not None else None
+                cached = self._cached_score(url, thumb_hash)
+                if cached is not None:
+                    scores[i] = cached
+                    continue
+                if self.index is not None:
+                    nearby = pending.search(thumb_hash)
+                    if nearby:
+                        followers.append((i, thumb_hash, min(nearby)[2]))
+                        continue
+                    pending.add(thumb_hash, len(images))
+                images.append(analysis_array(img))
+                positions.append(i)
+                hashes.append(thumb_hash)
+            except Exception as e:
+                print(f"Thumbnail analysis failed: {e}")
+        
+        if images:
+            features = self.extract_features_batch(np.stack(images))
+            self._store_features(
+                [thumbnail_urls[i] for i in positions], [input_hashes[i] for i in positions], hashes,
+                [{name: values[k] for name, values in features.items()} for k in range(len(positions))]
+            )
+            for i, thumb_hash, score in zip(positions, hashes, self._calculate_thumbnail_scores(features)):
+                scores[i] = float(score)
+                self._index_score(thumbnail_urls[i], thumb_hash, scores[i])
+        for i, thumb_hash, image_index in followers:
+            scores[i] = scores[positions[image_index]]
+            self._index_score(thumbnail_urls[i], thumb_hash, scores[i])
+            self.reused_scores += 1
+        return scores
+    
+    def _analyze_in_processes(self, thumbnail_urls):
+        """Decode and extract features in the process pool
+        
+        Only the encoded bytes of thumbnails without stored features are sent
+        to the workers and only the small feature dicts come back; scores
+        match analyze_thumbnail exactly.
+        """
+        pool = self._get_process_pool()
+        scores = [0.5] * len(thumbnail_urls)
+        datas = self._fetch_all(thumbnail_urls)
+        input_hashes, stored = self._stored_features(thumbnail_urls, datas)
+        futures = {}
+        for i, data in enumerate(datas):
+            if i in stored:
+                scores[i] = self._stored_score(thumbnail_urls[i], *stored[i])
+            elif data is not None:
+                futures[i] = pool.submit(thumbnail_features, data)
+        
+        for i, future in futures.items():
+            try:
+                thumb_hash, features = future.result()
+                self._store_features([thumbnail_urls[i]], [input_hashes[i]], [thumb_hash], [features])
+                cached = self._cached_score(thumbnail_urls[i], thumb_hash)
+                if cached is None:
+                    cached = self._calculate_thumbnail_score(features)
+                    self._index_score(thumbnail_urls[i], thumb_hash, cached)
+                scores[i] = cached
+            except Exception as e:
+                print(f"Thumbnail analysis failed: {e}")
+        return scores
+    
+    def _fetch_all(self, thumbnail_urls):
+        """Bytes per URL; None for missing URLs and failed downloads"""
+        datas = []
+        for url in thumbnail_urls:
+            data = None
+            if url:
+                try:
+                    data = self.fetcher.get(url)
+                except Exception as e:
+                    print(f"Thumbnail analysis failed: {e}")
+            datas.append(data)
+        return datas
+    
+    def _stored_features(self, thumbnail_urls, datas):
+        """Input hashes per thumbnail and {position: (dhash, features)} of the stored ones"""
+        if self.store is None:
+            return [None] * len(datas), {}
+        input_hashes = [
+            None if data is None else input_hash(
+                THUMBNAIL_GROUP, 'analysis_size', Config.THUMBNAIL_ANALYSIS_SIZE, hashlib.blake2b(data).hexdigest()
+            )
+            for data in datas
+        ]
+        positions = [i for i, data in enumerate(datas) if data is not None]
+        rows = self.store.lookup(THUMBNAIL_GROUP[0], THUMBNAIL_COLUMNS, [thumbnail_urls[i] for i in positions],
+                                 [input_hashes[i] for i in positions])
+        stored = {}
+        for i, row in zip(positions, rows):
+            if row is not None:
+                stored[i] = (int(row[0]), dict(zip(THUMBNAIL_COLUMNS[1:], row[1:])))
+        return input_hashes, stored
+    
+    def _store_features(self, thumbnail_urls, input_hashes, thumb_hashes, features):
+        if self.store is None:
+            return
+        rows = [
+            (np.uint64(thumb_hash),) + tuple(values[name] for name in THUMBNAIL_COLUMNS[1:])
+            for thumb_hash, values in zip(thumb_hashes, features)
+        ]
+        self.store.put(THUMBNAIL_GROUP[0], THUMBNAIL_COLUMNS, thumbnail_urls, input_hashes, rows)
+    
+    def _stored_score(self, thumbnail_url, thumb_hash, features):
+        """Score of a thumbnail from its stored features, as if it had been decoded"""
+        cached = self._cached_score(thumbnail_url, thumb_hash)
+        if cached is not None:
+            return cached
+        score = float(self._calculate_thumbnail_score(features))
+        self._index_score(thumbnail_url, thumb_hash, score)
+        return score
+    
+    def _get_process_pool(self):
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.processes)
+        return self._process_pool
+    
+    def close(self):
+        """Shut down the process pool, if one was started, and the thumbnail fetcher, and save the index"""
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+        if self._owns_fetcher:
+            self.fetcher.close()
+        if self.index is not None:
+            self.index.save()
+    
+    def _cached_score(self, thumbnail_url, thumb_hash):
+        """Score of an indexed near-duplicate (recording this thumbnail with it), or None"""
+        if self.index is None:
+            return None
+        match = self.index.lookup(thumb_hash)
+        if match is None:
+            return None
+        self.index.add(thumb_hash, thumbnail_url, match[1])
+        self.reused_scores += 1
+        return match[1]
+    
+    def _index_score(self, thumbnail_url, thumb_hash, score):
+        if self.index is not None:
+            self.index.add(thumb_hash, thumbnail_url, score)
+    
+    def thumbnail_duplicates(self, thumbnail_url):
+        """Number of other indexed thumbnails that are near-duplicates of this one"""
+        if self.index is None or not thumbnail_url:
+            return 0
+        return self.index.duplicate_count(thumbnail_url)
+    
+    def duplicate_clusters(self, min_size=2):
+        """Near-duplicate thumbnail URL clusters seen so far, largest first"""
+        if self.index is None:
+            return []
+        return self.index.clusters(min_size)
+    
+    def extract_features(self, img_array):
+        """Compute all five thumbnail features in one fused float32 kernel
+        
+        Equivalent to the individual _calculate_* helpers, which remain as the
+        reference implementation.
+        """
+        if img_array.ndim == 3:
+            planes = np.ascontiguousarray(img_array.transpose(2, 0, 1)[np.newaxis], dtype=np.float32)
+        else:
+            planes = img_array.astype(np.float32)[np.newaxis, np.newaxis]
+        
+        features = feature_kernel(planes, is_color=img_array.ndim == 3)
+        return {name: values[0] for name, values in features.items()}
+    
+    def extract_features_batch(self, images, block_pixels=None):
+        """Vectorized features for an (N, H, W, 3) stack, as the module-level extract_features_batch"""
+        return extract_features_batch(images, block_pixels)
+    
     def _calculate_color_variance(self, img_array):
         """AI art often has unusual color distributions"""
         if len(img_array.shape) != 3:
@@ -134,8 +382,125 @@ class ContentAnalyzer:
         
         return min(score, 1.0)
     
+    def _calculate_thumbnail_scores(self, features):
+        """Vectorized _calculate_thumbnail_score over arrays of features"""
+        score = np.zeros(len(features['color_variance']))
+        score = score + np.where(features['color_variance'] > 0.3, 0.3, 0.0)
+        edge_density = features['edge_density']
+        score = score + np.where((0.3 < edge_density) & (edge_density < 0.8), 0.2, 0.0)
+        score = score + np.where(features['brightness_consistency'] > 0.3, 0.2, 0.0)
+        score = score + np.where(features['saturation_level'] > 0.7, 0.2, 0.0)
+        score = score + np.where(features['contrast_level'] > 0.6, 0.1, 0.0)
+        return np.minimum(score, 1.0)
+    
     def analyze_video_content(self, video_url):
         """Placeholder for video content analysis"""
         # This would require video processing which is heavy
         # For now, return thumbnail analysis only
-        return 0.5
\ No newline at end of file
+        return 0.5
+
+def decode_thumbnail(data):
+    """Decode image bytes, letting JPEG decode straight to the analysis size
+    
+    Draft mode makes libjpeg scale by 1/2, 1/4 or 1/8 during decoding,
+    keeping the result at least Config.THUMBNAIL_ANALYSIS_SIZE.
+    """
+    img = Image.open(BytesIO(data))
+    if img.format == 'JPEG':
+        img.draft(img.mode, Config.THUMBNAIL_ANALYSIS_SIZE)
+    return img
+
+def analysis_array(img):
+    """RGB array of exactly the analysis size, the input of every scoring mode"""
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    if img.size != Config.THUMBNAIL_ANALYSIS_SIZE:
+        img = img.resize(Config.THUMBNAIL_ANALYSIS_SIZE, Image.BILINEAR)
+    return np.asarray(img)
+
+def thumbnail_features(data):
+    """Process-pool entry point: thumbnail bytes in, (dhash, feature dict) out"""
+    img = decode_thumbnail(data)
+    features = extract_features_batch(analysis_array(img)[np.newaxis])
+    return dhash(img), {name: float(values[0]) for name, values in features.items()}
+
+def extract_features_batch(images, block_pixels=None):
+    """Vectorized features for an (N, H, W, 3) stack; returns arrays of length N
+    
+    The stack is evaluated in blocks of about ``block_pixels`` pixels
+    (default Config.THUMBNAIL_BATCH_PIXELS) so the float32 temporaries stay
+    cache-resident; one huge block is memory-bound and slower per image.
+    """
+    count, height, width = images.shape[:3]
+    block_pixels = block_pixels or Config.THUMBNAIL_BATCH_PIXELS
+    block = max(1, block_pixels // (height * width))
+    
+    blocks = []
+    for start in range(0, count, block):
+        planes = np.ascontiguousarray(images[start:start + block].transpose(0, 3, 1, 2), dtype=np.float32)
+        blocks.append(feature_kernel(planes, is_color=True))
+    return {name: np.concatenate([features[name] for features in blocks]) for name in blocks[0]}
+
+def feature_kernel(planes, is_color):
+    """Fused feature computation over (N, C, H, W) float32 planes
+    
+    Grayscale is built once, per-channel sums and squared sums give the
+    color variance and brightness statistics, edges are summed without
+    padding and saturation is derived with NumPy using the same formula
+    as PIL's HSV conversion.
+    """
+    count, channels, height, width = planes.shape
+    flat = planes.reshape(count, channels, -1)
+    n_pixels = height * width
+    
+    # 1. Per-channel first and second moments (exact in float64)
+    channel_mean = flat.sum(axis=2, dtype=np.float64) / n_pixels
+    channel_sq_mean = np.einsum('nij,nij->ni', flat, flat, dtype=np.float64) / n_pixels
+    channel_var = channel_sq_mean - channel_mean ** 2
+    
+    if is_color:
+        color_variance = np.minimum(channel_var[:, :3].mean(axis=1) / 10000, 1.0)
+    else:
+        color_variance = np.zeros(count)
+    
+    # 2. Brightness consistency over all values pooled together
+    brightness = channel_mean.mean(axis=1)
+    brightness_std = np.sqrt(np.maximum(channel_sq_mean.mean(axis=1) - brightness ** 2, 0.0))
+    safe_brightness = np.where(brightness > 0, brightness, 1.0)
+    brightness_consistency = np.where(
+        brightness > 0, np.minimum(brightness_std / safe_brightness, 1.0), 0.5
+    )
+    
+    # 3. Edge density on the shared grayscale; the zero padding of the
+    #    reference version only affects the divisor
+    gray = planes[:, 0]
+    for channel in range(1, channels):
+        gray = gray + planes[:, channel]
+    if channels > 1:
+        gray = gray / np.float32(channels)
+    edges_h = np.abs(gray[:, 1:] - gray[:, :-1]).reshape(count, -1)
+    edges_v = np.abs(gray[:, :, 1:] - gray[:, :, :-1]).reshape(count, -1)
+    edge_sum = edges_h.sum(axis=1, dtype=np.float64) + edges_v.sum(axis=1, dtype=np.float64)
+    edge_density = np.minimum(edge_sum / n_pixels / 100, 1.0)
+    
+    # 4. Saturation as PIL computes it: trunc(255 * (max - min) / max)
+    if is_color and channels >= 3:
+        red, green, blue = planes[:, 0], planes[:, 1], planes[:, 2]
+        max_c = np.maximum(np.maximum(red, green), blue)
+        chroma = max_c - np.minimum(np.minimum(red, green), blue)
+        ratio = chroma / np.maximum(max_c, np.float32(1))  # chroma is 0 wherever max is 0
+        saturation = np.floor(ratio * np.float32(255)).reshape(count, -1)
+        saturation_level = saturation.sum(axis=1, dtype=np.float64) / n_pixels / 255.0
+    else:
+        saturation_level = np.full(count, 0.5)
+    
+    # 5. Contrast from the shared grayscale
+    contrast_level = np.minimum(gray.reshape(count, -1).std(axis=1, dtype=np.float64) / 80, 1.0)
+    
+    return {
+        'color_variance': color_variance,
+        'edge_density': edge_density,
+        'brightness_consistency': brightness_consistency,
+        'saturation_level': saturation_level,
+        'contrast_level': contrast_level
+    }
\ No newline at end of file
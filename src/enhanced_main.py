@@ -1,17 +1,27 @@
 import time
 import schedule
+from collections import Counter, deque
 from datetime import datetime
 import numpy as np
 from youtube_client import YouTubeClient
+from channel_history import ChannelHistoryCache
 from advanced_analyzer import AdvancedAIAnalyzer
 from ensemble_analyzer import EnsembleAIAnalyzer
 from content_analyzer import ContentAnalyzer
+from text_context import TextContext
+from video_frame import videos_to_frame
+from feature_store import get_feature_store
 from utils import save_enhanced_results, print_real_time_update, print_analysis_start, print_analysis_complete
 from visualizer import ResultsVisualizer
 from dashboard import AnalysisDashboard
 from config import Config
 
 class EnhancedAIDetector:
+    # Weights of the final score, in summation order
+    SCORE_WEIGHTS = {'advanced_score': 0.5, 'ensemble_score': 0.3, 'content_score': 0.2}
+    # Cascade stages in running order, named by the last score computed
+    CASCADE_STAGES = ('ensemble', 'advanced', 'content')
+    
     def __init__(self):
         self.advanced_analyzer = AdvancedAIAnalyzer()
         self.ensemble_analyzer = EnsembleAIAnalyzer()
@@ -19,28 +29,120 @@ class EnhancedAIDetector:
         self.youtube_client = YouTubeClient()
         self.visualizer = ResultsVisualizer()
         self.dashboard = AnalysisDashboard()
+        self.cascade_exits = Counter()
+    
+    def analyze_video_comprehensive(self, video_data, channel_history=None, content_score=None, ensemble=None,
+                                    advanced_score=None):
+        """Comprehensive analysis using multiple methods
         
-    def analyze_video_comprehensive(self, video_data, channel_history=None):
-        """Comprehensive analysis using multiple methods"""
+        ``content_score``, ``ensemble`` (an ``(ensemble_score,
+        component_scores)`` pair) and ``advanced_score`` may be passed in
+        when they were already computed as part of a batch.
+        """
         
         # Method 1: Advanced feature-based analysis
-        advanced_score = self.advanced_analyzer.predict(video_data, channel_history)
+        if advanced_score is None:
+            advanced_score = self.advanced_analyzer.predict(video_data, channel_history)
         
         # Method 2: Ensemble analysis
-        ensemble_score, component_scores = self.ensemble_analyzer.analyze_video(video_data, channel_history)
+        if ensemble is None:
+            ensemble = self.ensemble_analyzer.analyze_video(video_data, channel_history)
+        ensemble_score, component_scores = ensemble
         
         # Method 3: Content analysis (if thumbnail available)
-        thumbnail_url = video_data.get('thumbnail_url')
-        content_score = 0.5
-        if thumbnail_url:
-            content_score = self.content_analyzer.analyze_thumbnail(thumbnail_url)
+        if content_score is None:
+            content_score = self._thumbnail_score(video_data)
+        
+        scores = {'advanced_score': advanced_score, 'ensemble_score': ensemble_score, 'content_score': content_score}
+        return self._build_result(video_data, scores, component_scores, 'full')
+    
+    def analyze_video_cascade(self, video_data, channel_history=None, content_score=None, ensemble=None, staged=None):
+        """Cascade variant of analyze_video_comprehensive
+        
+        The cheap ensemble runs first, then the ML model, then the
+        thumbnail, stopping as soon as cascade_decided holds; the final
+        score is the weighted mean of the scores computed. Skipped scores
+        are reported as None. ``staged`` is a result of cascade_scores
+        computed earlier.
+        """
+        scores, component_scores = staged or self.cascade_scores(video_data, channel_history, ensemble)
+        scores = dict(scores)
+        if not self.cascade_decided(scores):
+            if content_score is None:
+                content_score = self._thumbnail_score(video_data)
+            scores['content_score'] = content_score
+        
+        stage = self.CASCADE_STAGES[len(scores) - 1]
+        self.cascade_exits[stage] += 1
+        return self._build_result(video_data, scores, component_scores, stage)
+    
+    def cascade_scores(self, video_data, channel_history=None, ensemble=None):
+        """Run the cascade stages before the thumbnail
+        
+        Returns ``(scores, component_scores)`` where ``scores`` holds the
+        ensemble score and, if that alone was not decisive, the ML score.
+        """
+        if ensemble is None:
+            ensemble = self.ensemble_analyzer.analyze_video(video_data, channel_history)
+        return self.cascade_scores_many([video_data], [channel_history], [ensemble])[0]
+    
+    def cascade_scores_many(self, videos, channel_histories, ensembles):
+        """cascade_scores for a chunk, scoring the undecided videos with one model call
+        
+        Videos whose ensemble analysis fails get None, so analyze_video_cascade
+        retries them on their own and only they fail.
+        """
+        staged = []
+        for video_data, channel_history, ensemble in zip(videos, channel_histories, ensembles):
+            try:
+                if ensemble is None:
+                    ensemble = self.ensemble_analyzer.analyze_video(video_data, channel_history)
+                ensemble_score, component_scores = ensemble
+                staged.append(({'ensemble_score': ensemble_score}, component_scores))
+            except Exception:
+                staged.append(None)
         
-        # Weighted final score
-        final_score = (
-            advanced_score * 0.5 +
-            ensemble_score * 0.3 +
-            content_score * 0.2
+        undecided = [i for i, stages in enumerate(staged)
+                     if stages is not None and not self.cascade_decided(stages[0])]
+        advanced_scores = self.advanced_analyzer.predict_many(
+            [videos[i] for i in undecided], [channel_histories[i] for i in undecided]
         )
+        for i, advanced_score in zip(undecided, advanced_scores):
+            staged[i][0]['advanced_score'] = advanced_score
+        return staged
+    
+    def cascade_decided(self, scores):
+        """True if the scores computed so far settle the video
+        
+        The ensemble alone settles it only within Config.CASCADE_EXIT_MARGIN
+        of 0 or 1; once the ML model has run, the running score has to be
+        outside the Config.CASCADE_BAND around the threshold.
+        """
+        if 'advanced_score' not in scores:
+            ensemble_score = scores['ensemble_score']
+            return min(ensemble_score, 1 - ensemble_score) <= Config.CASCADE_EXIT_MARGIN
+        return abs(self._weighted_score(scores) - Config.CONFIDENCE_THRESHOLD) > Config.CASCADE_BAND
+    
+    def _weighted_score(self, scores):
+        """Weighted mean of the available scores"""
+        total = 0
+        weight = 0
+        for name, score_weight in self.SCORE_WEIGHTS.items():
+            if name in scores:
+                total += scores[name] * score_weight
+                weight += score_weight
+        return total / weight
+    
+    def _thumbnail_score(self, video_data):
+        thumbnail_url = video_data.get('thumbnail_url')
+        if thumbnail_url:
+            return self.content_analyzer.analyze_thumbnail(thumbnail_url)
+        return 0.5
+    
+    def _build_result(self, video_data, scores, component_scores, stage):
+        advanced_score = scores.get('advanced_score')
+        ensemble_score = scores['ensemble_score']
+        content_score = scores.get('content_score')
         
         # Calculate overall confidence
         confidence = self._calculate_confidence(advanced_score, ensemble_score, content_score, component_scores)
@@ -52,18 +154,21 @@ class EnhancedAIDetector:
             'views': video_data.get('stats', {}).get('viewCount', 0),
             'likes': video_data.get('stats', {}).get('likeCount', 0),
             'comments': video_data.get('stats', {}).get('commentCount', 0),
-            'final_ai_score': final_score,
+            'final_ai_score': self._weighted_score(scores),
             'confidence': confidence,
             'advanced_score': advanced_score,
             'ensemble_score': ensemble_score,
             'content_score': content_score,
             'component_scores': component_scores,
+            'cascade_stage': stage,
+            'thumbnail_duplicates': self.content_analyzer.thumbnail_duplicates(video_data.get('thumbnail_url')),
             'analysis_time': datetime.now().isoformat()
         }
     
     def _calculate_confidence(self, advanced_score, ensemble_score, content_score, component_scores):
         """Calculate confidence based on score agreement"""
-        scores = [advanced_score, ensemble_score, content_score] + list(component_scores.values())
+        scores = [score for score in (advanced_score, ensemble_score, content_score) if score is not None]
+        scores += list(component_scores.values())
         variance = np.var(scores)
         
         # Lower variance = higher confidence
@@ -85,49 +190,43 @@ def analyze_youtube_ai_content_enhanced():
     print_analysis_start()
     
     detector = EnhancedAIDetector()
-    youtube = YouTubeClient()
     
-    # Get trending videos
-    print("📡 Fetching trending videos...")
-    trending_videos = youtube.get_trending_videos(max_results=20)
-    
-    # Search for AI-related videos
-    print("🔍 Searching for AI-related content...")
-    ai_videos = youtube.search_ai_videos(max_results=20)
-    
-    # Combine and deduplicate
-    all_videos = trending_videos + ai_videos
-    unique_videos = {}
-    
-    for video in all_videos:
-        video_id = video.get('id')
-        if video_id and video_id not in unique_videos:
-            unique_videos[video_id] = video
+    youtube = YouTubeClient()
+    channel_history = ChannelHistoryCache(youtube)
+    max_videos = Config.MAX_VIDEOS
     
-    videos_to_analyze = list(unique_videos.values())
-    print(f"🎯 Analyzing {len(videos_to_analyze)} unique videos with enhanced methods...\n")
+    # Stream trending videos and AI-related search results as pages arrive;
+    # both feeds are paged concurrently and deduplicated on the fly
+    print("📡 Streaming trending videos and AI-related search results...")
+    videos_to_analyze = youtube.iter_candidate_videos(max_results=max_videos)
+    if not Config.CASCADE_ENABLED:
+        # The cascade decides per chunk which thumbnails it needs
+        videos_to_analyze = prefetch_thumbnails(
+            videos_to_analyze,
+            detector.content_analyzer,
+            Config.THUMBNAIL_PREFETCH_DEPTH
+        )
+    print(f"🎯 Analyzing up to {max_videos} unique videos with enhanced methods...\n")
     
     results = []
-    for i, video in enumerate(videos_to_analyze, 1):
-        try:
-            # Print progress
-            title = video.get('snippet', {}).get('title', 'Unknown Title')
-            print_real_time_update(i, len(videos_to_analyze), title)
-            
-            # Extract features for analysis
-            features = extract_video_features(video)
-            
-            # Get channel context if available
-            channel_id = video.get('snippet', {}).get('channelId')
-            channel_context = None
-            
-            # Perform comprehensive analysis
-            analysis = detector.analyze_video_comprehensive(features, channel_context)
-            results.append(analysis)
-            
-        except Exception as e:
-            print(f"\n❌ Error analyzing video {i}: {e}")
+    i = 0
+    for chunk in iter_chunks(videos_to_analyze, Config.ANALYSIS_BATCH_SIZE):
+        # A malformed item only costs its own video
+        numbers = []
+        chunk_features = []
+        for video in chunk:
+            i += 1
+            try:
+                chunk_features.append(extract_video_features(video))
+                numbers.append(i)
+            except Exception as e:
+                print(f"\n❌ Error analyzing video {i}: {e}")
+        if not chunk_features:
             continue
+        
+        # Get channel contexts, then score the whole chunk together
+        channel_contexts = get_channel_contexts(channel_history, [features['channel_id'] for features in chunk_features])
+        results.extend(analyze_chunk(detector, numbers, chunk_features, channel_contexts, max_videos))
     
     print("\n")  # New line after progress bar
     
@@ -142,26 +241,165 @@ def analyze_youtube_ai_content_enhanced():
     
     print_analysis_complete(results)
     
+    youtube.scheduler.save()
+    quota = youtube.get_quota_metrics()
+    print(f"\n🎫 API quota: {quota['used']} units used this run, {quota['remaining']}/{quota['daily_budget']} remaining")
+    if quota['deferred_by_endpoint']:
+        print(f"   ⏸️  Deferred calls: {quota['deferred_by_endpoint']}")
+    if Config.CASCADE_ENABLED:
+        exits = ', '.join(f"{detector.cascade_exits[stage]} after {stage}" for stage in detector.CASCADE_STAGES)
+        print(f"   🪜 Cascade exits: {exits}")
+    detector.content_analyzer.close()
+    feature_store = get_feature_store()
+    if feature_store is not None:
+        feature_store.flush()
+        print(f"   🗃️  Feature store: {feature_store.hits} feature rows reused, {feature_store.misses} computed")
+    fetcher = detector.content_analyzer.fetcher
+    print(f"   🖼️  Thumbnails: {fetcher.downloads} downloaded, {fetcher.cache_hits} from cache, "
+          f"{detector.content_analyzer.reused_scores} scores reused from near-duplicates")
+    clusters = detector.content_analyzer.duplicate_clusters()
+    if clusters:
+        print(f"   🧬 Near-duplicate thumbnail clusters: {len(clusters)} (largest has {len(clusters[0])} thumbnails)")
+    if youtube.cache:
+        cache_stats = youtube.cache.get_stats()
+        print(f"   💾 Response cache: {cache_stats['hits']} fresh hits, "
+              f"{cache_stats['revalidated']} revalidated (304), {cache_stats['misses']} downloaded")
+    
     print(f"\n✨ Enhanced outputs created:")
     print(f"   📊 Beautiful console report")
     print(f"   📈 Interactive dashboard: {dashboard_path}")
     print(f"   💾 Data files in /results/ folder")
     
     return results
+
+def analyze_chunk(detector, numbers, chunk_features, channel_contexts, max_videos):
+    """Analyze a chunk of videos with one batched call per stage
+    
+    A failed batch call leaves its scores to each video's own analysis, so
+    only the videos that fail on their own are dropped. ``numbers`` are the
+    videos' positions in the run, for progress output.
+    """
+    # Run the ensemble over the whole chunk
+    try:
+        ensemble_rows = detector.ensemble_analyzer.analyze_batch(
+            videos_to_frame(chunk_features, channel_contexts)
+        ).to_dict('records')
+        ensembles = [(row.pop('ensemble_score'), row) for row in ensemble_rows]
+    except Exception as e:
+        print(f"\n⚠️ Batch ensemble failed, analyzing videos one by one: {e}")
+        ensembles = [None] * len(chunk_features)
+    
+    # In cascade mode only videos the cheaper stages leave undecided
+    # get their thumbnail downloaded and scored
+    thumbnail_urls = [features['thumbnail_url'] for features in chunk_features]
+    staged = [None] * len(chunk_features)
+    advanced_scores = [None] * len(chunk_features)
+    if Config.CASCADE_ENABLED:
+        try:
+            staged = detector.cascade_scores_many(chunk_features, channel_contexts, ensembles)
+        except Exception as e:
+            print(f"\n⚠️ Batch cascade scoring failed, scoring videos one by one: {e}")
+        thumbnail_urls = [
+            None if stages is None or detector.cascade_decided(stages[0]) else url
+            for url, stages in zip(thumbnail_urls, staged)
+        ]
+    else:
+        # One scaler transform and one model call for the whole chunk
+        try:
+            advanced_scores = detector.advanced_analyzer.predict_many(chunk_features, channel_contexts)
+        except Exception as e:
+            print(f"\n⚠️ Batch prediction failed, predicting videos one by one: {e}")
+    
+    # Score the chunk's thumbnails together in one vectorized pass. Withheld
+    # thumbnails keep None, so a video whose cascade stages are retried on
+    # their own still gets its thumbnail scored if it needs it; if the
+    # batch fails, each video scores its own thumbnail
+    content_scores = [None] * len(chunk_features)
+    positions = [i for i, url in enumerate(thumbnail_urls) if url is not None]
+    try:
+        batch_scores = detector.content_analyzer.analyze_thumbnails_batch([thumbnail_urls[i] for i in positions])
+        for i, content_score in zip(positions, batch_scores):
+            content_scores[i] = content_score
+    except Exception as e:
+        print(f"\n⚠️ Batch thumbnail analysis failed, analyzing thumbnails one by one: {e}")
+    
+    results = []
+    for number, features, channel_context, content_score, ensemble, stages, advanced_score in zip(
+            numbers, chunk_features, channel_contexts, content_scores, ensembles, staged, advanced_scores):
+        try:
+            # Print progress
+            print_real_time_update(number, max_videos, features['title'] or 'Unknown Title')
+            
+            # Perform comprehensive analysis
+            if Config.CASCADE_ENABLED:
+                analysis = detector.analyze_video_cascade(features, channel_context, content_score, ensemble, stages)
+            else:
+                analysis = detector.analyze_video_comprehensive(
+                    features, channel_context, content_score, ensemble, advanced_score
+                )
+            results.append(analysis)
+            
+        except Exception as e:
+            print(f"\n❌ Error analyzing video {number}: {e}")
+            continue
+    return results
+
+def get_channel_contexts(channel_history, channel_ids):
+    """Upload history per channel ID, None for channels whose lookup fails"""
+    try:
+        channel_history.prefetch(channel_ids)
+    except Exception as e:
+        print(f"\n⚠️ Channel history prefetch failed, fetching channels one by one: {e}")
+    
+    contexts = []
+    for channel_id in channel_ids:
+        try:
+            contexts.append(channel_history.get_history(channel_id))
+        except Exception as e:
+            print(f"\n⚠️ Channel history unavailable for {channel_id}: {e}")
+            contexts.append(None)
+    return contexts
+
+def prefetch_thumbnails(videos, content_analyzer, depth):
+    """Yield videos unchanged while downloading thumbnails up to ``depth`` videos ahead"""
+    lookahead = deque()
+    for video in videos:
+        content_analyzer.prefetch_thumbnail(video.get('thumbnail_url'))
+        lookahead.append(video)
+        if len(lookahead) > depth:
+            yield lookahead.popleft()
+    while lookahead:
+        yield lookahead.popleft()
+
+def iter_chunks(items, size):
+    """Group an iterable into lists of at most ``size`` items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
 def extract_video_features(video_item):
     """Extract features from YouTube API response for analysis"""
     snippet = video_item.get('snippet', {})
     stats = video_item.get('statistics', {})
     content_details = video_item.get('contentDetails', {})
+    title = snippet.get('title', '')
+    description = snippet.get('description', '')
+    tags = snippet.get('tags', [])
+    channel_title = snippet.get('channelTitle', '')
     
     return {
         'video_id': video_item.get('id'),
-        'title': snippet.get('title', ''),
-        'description': snippet.get('description', ''),
-        'channel_title': snippet.get('channelTitle', ''),
+        'title': title,
+        'description': description,
+        'channel_title': channel_title,
         'channel_id': snippet.get('channelId', ''),
         'published_at': snippet.get('publishedAt', ''),
-        'tags': snippet.get('tags', []),
+        'tags': tags,
         'category_id': snippet.get('categoryId', ''),
         'thumbnail_url': video_item.get('thumbnail_url', ''),
         'stats': {
@@ -170,7 +408,9 @@ def extract_video_features(video_item):
             'commentCount': int(stats.get('commentCount', 0)),
             'favoriteCount': int(stats.get('favoriteCount', 0))
         },
-        'duration': content_details.get('duration', '')
+        'duration': content_details.get('duration', ''),
+        # Normalized text shared by every analyzer
+        'text_context': TextContext(title, description, tags, channel_title)
     }
 
 def run_enhanced_analysis():
@@ -1,9 +1,19 @@
 import numpy as np
+import pandas as pd
 from collections import defaultdict
 from config import Config
-import re
+from channel_history import upload_consistency, publish_hour_regularity
+from feature_store import cached_rows, get_feature_store, input_hash
+from text_matcher import TEXT_MATCHER
+from text_context import text_context
 from datetime import datetime
 
+# Analyzers whose batch scores only depend on a video's text and category,
+# kept in the feature store; bump the version when either changes
+STORED_GROUP = ('ensemble_text', 1)
+STORED_ANALYZERS = ('text_analyzer', 'metadata_analyzer')
+STORED_COLUMNS = ('text_score', 'text_confidence', 'metadata_score', 'metadata_confidence')
+
 class EnsembleAIAnalyzer:
     def __init__(self):
         self.analyzers = {
@@ -37,45 +47,91 @@ class EnsembleAIAnalyzer:
             ensemble_score /= total_weight
         
         return ensemble_score, scores
+    
+    def analyze_batch(self, frame, store=None):
+        """Vectorized analyze_video over a video frame (see video_frame.videos_to_frame)
+        
+        Returns a DataFrame indexed like ``frame`` with the ensemble score and
+        each analyzer's score, equal to analyze_video row by row. Text and
+        metadata scores are read from ``store`` (the shared feature store by
+        default, False for none) for videos whose text is unchanged.
+        """
+        if store is None:
+            store = get_feature_store()
+        stored = self._stored_scores(frame, store) if store else {}
+        scores = {}
+        confidences = {}
+        
+        for name, analyzer in self.analyzers.items():
+            if name in stored:
+                scores[name], confidences[name] = stored[name]
+            else:
+                scores[name], confidences[name] = analyzer.analyze_batch(frame)
+        
+        # Weighted ensemble score, accumulated in the same order as analyze_video
+        ensemble_score = np.zeros(len(frame))
+        total_weight = np.zeros(len(frame))
+        
+        for name, score in scores.items():
+            weight = self.weights[name] * confidences[name]
+            ensemble_score += score * weight
+            total_weight += weight
+        
+        positive = total_weight > 0
+        ensemble_score = np.where(positive, ensemble_score / np.where(positive, total_weight, 1), ensemble_score)
+        
+        results = pd.DataFrame(scores, index=frame.index)
+        results.insert(0, 'ensemble_score', ensemble_score)
+        return results
+    
+    def _stored_scores(self, frame, store):
+        """(scores, confidences) of the stored analyzers, computing only stale rows"""
+        keys = frame['video_id'].tolist()
+        hashes = [
+            input_hash(STORED_GROUP, text.title, text.description, text.tags, text.channel_title, category)
+            for text, category in zip(frame['text_context'], frame['category_id'])
+        ]
+        
+        def compute(positions):
+            subset = frame.iloc[positions]
+            columns = []
+            for name in STORED_ANALYZERS:
+                columns.extend(self.analyzers[name].analyze_batch(subset))
+            return list(zip(*columns))
+        
+        rows = cached_rows(store, STORED_GROUP[0], STORED_COLUMNS, keys, hashes, compute)
+        table = np.array(rows, dtype=np.float64).reshape(len(frame), len(STORED_COLUMNS))
+        return {
+            name: (table[:, 2 * k], table[:, 2 * k + 1])
+            for k, name in enumerate(STORED_ANALYZERS)
+        }
 
 class TextAnalyzer:
     def analyze(self, video_data, context=None):
         """Advanced text pattern analysis"""
-        title = video_data.get('title', '')
-        description = video_data.get('description', '')
+        text = text_context(video_data)
         
-        if not title and not description:
+        if not text.title and not text.description:
             return 0.5, 0.1
         
-        text = f"{title} {description}".lower()
-        words = text.split()
+        word_count = text.word_count
         
-        if not words:
+        if not word_count:
             return 0.5, 0.1
         
-        # 1. Technical jargon density
-        technical_terms = [
-            'neural', 'algorithm', 'model', 'training', 'inference',
-            'parameter', 'topology', 'activation', 'backpropagation',
-            'transformer', 'diffusion', 'latent', 'embedding'
-        ]
+        hits = TEXT_MATCHER.counts(text.text, ('technical_terms', 'creative_words', 'ai_tools'))
         
-        tech_density = sum(1 for term in technical_terms if term in text) / len(words)
+        # 1. Technical jargon density
+        tech_density = hits['technical_terms'] / word_count
         
         # 2. Creative vs technical language ratio
-        creative_words = ['beautiful', 'amazing', 'stunning', 'creative', 'artistic', 'aesthetic']
-        creative_density = sum(1 for word in creative_words if word in text) / len(words)
+        creative_density = hits['creative_words'] / word_count
         
         # 3. Specific AI tool mentions
-        ai_tools = [
-            'midjourney', 'dall-e', 'stable diffusion', 'chatgpt', 'gpt-4',
-            'runway ml', 'leonardo ai', 'bluewillow', 'nightcafe',
-            'dream studio', 'novelai', 'playground ai'
-        ]
-        tool_mentions = sum(1 for tool in ai_tools if tool in text)
+        tool_mentions = hits['ai_tools']
         
         # 4. Pattern-based scoring
-        pattern_score = self._analyze_text_patterns(title, description)
+        pattern_score = self._analyze_text_patterns(text)
         
         # Combine scores
         score = min((
@@ -85,30 +141,53 @@ class TextAnalyzer:
             (1 - creative_density)  # Lower creative = higher AI probability
         ) / 5, 1.0)
         
-        confidence = 0.8 if len(words) > 10 else 0.5
+        confidence = 0.8 if word_count > 10 else 0.5
         
         return score, confidence
     
-    def _analyze_text_patterns(self, title, description):
+    def _analyze_text_patterns(self, text):
         """Analyze specific text patterns common in AI content"""
-        patterns = [
-            (r'AI.*generat', 0.3),
-            (r'created.*by.*AI', 0.4),
-            (r'neural.*network', 0.3),
-            (r'machine.*learn', 0.3),
-            (r'prompt.*engineer', 0.4),
-            (r'this.*AI.*created', 0.4),
-            (r'100%.*AI', 0.5)
-        ]
-        
-        text = f"{title} {description}".lower()
-        score = 0
-        
-        for pattern, weight in patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                score += weight
+        score = TEXT_MATCHER.pattern_score('text_patterns', text.text)
         
         return min(score, 1.0)
+    
+    def analyze_batch(self, frame):
+        """analyze over a video frame; returns (scores, confidences) arrays"""
+        count = len(frame)
+        has_words = np.zeros(count, dtype=bool)
+        word_counts = np.zeros(count, dtype=np.int64)
+        tech_hits = np.zeros(count, dtype=np.int64)
+        creative_hits = np.zeros(count, dtype=np.int64)
+        tool_mentions = np.zeros(count, dtype=np.int64)
+        pattern_scores = np.zeros(count)
+        
+        # String matching is per row; everything after it is array arithmetic
+        for i, text in enumerate(frame['text_context']):
+            if not text.title and not text.description:
+                continue
+            word_counts[i] = text.word_count
+            if not word_counts[i]:
+                continue
+            has_words[i] = True
+            hits = TEXT_MATCHER.counts(text.text, ('technical_terms', 'creative_words', 'ai_tools'))
+            tech_hits[i] = hits['technical_terms']
+            creative_hits[i] = hits['creative_words']
+            tool_mentions[i] = hits['ai_tools']
+            pattern_scores[i] = self._analyze_text_patterns(text)
+        
+        words = np.maximum(word_counts, 1)
+        tech_density = tech_hits / words
+        creative_density = creative_hits / words
+        
+        scores = np.minimum((
+            tech_density * 3 +
+            np.minimum(tool_mentions * 0.3, 1.0) +
+            pattern_scores +
+            (1 - creative_density)
+        ) / 5, 1.0)
+        confidences = np.where(word_counts > 10, 0.8, 0.5)
+        
+        return np.where(has_words, scores, 0.5), np.where(has_words, confidences, 0.1)
 
 class BehaviorAnalyzer:
     def analyze(self, video_data, context=None):
@@ -155,14 +234,85 @@ class BehaviorAnalyzer:
         confidence = 0.9 if views > 1000 else 0.5
         
         return final_score, confidence
+    
+    def analyze_batch(self, frame):
+        """analyze over a video frame; returns (scores, confidences) arrays"""
+        views = frame['view_count'].to_numpy()
+        likes = frame['like_count'].to_numpy()
+        comments = frame['comment_count'].to_numpy()
+        no_views = views == 0
+        has_comments = comments > 0
+        
+        # 1. Engagement rate anomaly
+        engagement_rate = (likes + comments) / np.where(no_views, 1, views)
+        engagement_score = np.select(
+            [engagement_rate < 0.005, engagement_rate > 0.15, engagement_rate < 0.02],
+            [0.8, 0.6, 0.7],
+            default=0.3
+        )
+        
+        # 2. Like/comment ratio anomaly
+        like_comment_ratio = likes / np.where(has_comments, comments, 1)
+        ratio_score = np.where(
+            has_comments,
+            np.select([like_comment_ratio > 20, like_comment_ratio < 2], [0.7, 0.6], default=0.3),
+            np.where(views > 10000, 0.6, 0.4)
+        )
+        
+        # 3. View to subscriber ratio (simplified)
+        view_subscriber_score = np.where(views > 50000, 0.6, 0.4)
+        
+        final_score = (engagement_score + ratio_score + view_subscriber_score) / 3
+        confidence = np.where(views > 1000, 0.9, 0.5)
+        
+        return np.where(no_views, 0.5, final_score), np.where(no_views, 0.1, confidence)
 
 class TemporalAnalyzer:
     def analyze(self, video_data, context=None):
         """Analyze temporal patterns"""
-        # This would require historical data
-        # For now, return neutral score with low confidence
-        
-        publish_time = video_data.get('published_at')
+        history_result = self._analyze_history(context)
+        if history_result is not None:
+            return history_result
+        return self._analyze_publish_time(video_data.get('published_at'))
+    
+    def analyze_batch(self, frame):
+        """analyze over a video frame; returns (scores, confidences) arrays
+        
+        Rows sharing a channel history object or a publish time reuse the
+        result computed for the first of them.
+        """
+        history_results = {}
+        publish_results = {}
+        results = []
+        
+        for context, publish_time in zip(frame['channel_context'], frame['published_at']):
+            key = id(context)
+            if key not in history_results:
+                history_results[key] = self._analyze_history(context)
+            result = history_results[key]
+            if result is None:
+                if publish_time not in publish_results:
+                    publish_results[publish_time] = self._analyze_publish_time(publish_time)
+                result = publish_results[publish_time]
+            results.append(result)
+        
+        results = np.array(results, dtype=float).reshape(-1, 2)
+        return results[:, 0], results[:, 1]
+    
+    def _analyze_history(self, context):
+        """(score, confidence) from channel upload history, or None without enough history"""
+        # With channel upload history: AI content farms tend to publish on a
+        # rigid schedule, at the same hour of day
+        consistency = upload_consistency(context)
+        regularity = publish_hour_regularity(context)
+        if consistency is not None and regularity is not None:
+            score = 0.3 + 0.5 * (consistency + regularity) / 2
+            confidence = 0.6 if len(context) >= 10 else 0.4
+            return score, confidence
+        return None
+    
+    def _analyze_publish_time(self, publish_time):
+        # Without history, fall back to a neutral score with low confidence
         if publish_time:
             try:
                 # Very basic temporal analysis
@@ -178,32 +328,50 @@ class TemporalAnalyzer:
         
         return 0.5, 0.3
 
+AI_CATEGORIES = ['27', '28', '22']  # Education, Science & Technology, People & Blogs
+
 class MetadataAnalyzer:
     def analyze(self, video_data, context=None):
         """Analyze metadata patterns"""
-        tags = video_data.get('tags', [])
+        text = text_context(video_data)
+        tags = text.tags
         category = video_data.get('category_id', '')
         
         # 1. Tag analysis
-        ai_tags = [
-            'aiart', 'ai generated', 'neuralart', 'generativeai', 
-            'machinelearning', 'artificialintelligence', 'digitalart',
-            'ai', 'neuralnetwork', 'stablediffusion', 'midjourney'
-        ]
-        
-        ai_tag_count = sum(1 for tag in tags if any(ai_tag in tag.lower() for ai_tag in ai_tags))
+        ai_tag_count = self._ai_tag_count(text)
         tag_score = min(ai_tag_count / 3, 1.0)
         
         # 2. Category analysis
-        ai_categories = ['27', '28', '22']  # Education, Science & Technology, People & Blogs
-        category_score = 0.7 if category in ai_categories else 0.3
+        category_score = 0.7 if category in AI_CATEGORIES else 0.3
         
         # 3. Channel name analysis
-        channel_title = video_data.get('channel_title', '').lower()
-        channel_terms = ['ai', 'artificial', 'neural', 'machine learning', 'tech']
-        channel_score = 0.7 if any(term in channel_title for term in channel_terms) else 0.3
+        channel_score = 0.7 if TEXT_MATCHER.matches_any('channel_terms', text.channel_title_lower) else 0.3
         
         final_score = (tag_score + category_score + channel_score) / 3
         confidence = 0.8 if tags or category else 0.3
         
-        return final_score, confidence
\ No newline at end of file
+        return final_score, confidence
+    
+    def analyze_batch(self, frame):
+        """analyze over a video frame; returns (scores, confidences) arrays"""
+        texts = frame['text_context']
+        categories = frame['category_id']
+        ai_tag_counts = np.array([self._ai_tag_count(text) for text in texts], dtype=np.int64)
+        channel_matches = np.array([TEXT_MATCHER.matches_any('channel_terms', text.channel_title_lower)
+                                    for text in texts], dtype=bool)
+        has_tags = np.array([bool(text.tags) for text in texts], dtype=bool)
+        
+        tag_score = np.minimum(ai_tag_counts / 3, 1.0)
+        category_score = np.where(categories.isin(AI_CATEGORIES).to_numpy(), 0.7, 0.3)
+        channel_score = np.where(channel_matches, 0.7, 0.3)
+        
+        final_score = (tag_score + category_score + channel_score) / 3
+        confidence = np.where(has_tags | categories.astype(bool).to_numpy(), 0.8, 0.3)
+        
+        return final_score, confidence
+    
+    def _ai_tag_count(self, text):
+        # No term spans the newlines of tags_text, so one check rules out every tag
+        if not TEXT_MATCHER.matches_any('ai_tags', text.tags_text):
+            return 0
+        return sum(1 for tag in text.tags_lower if TEXT_MATCHER.matches_any('ai_tags', tag))
\ No newline at end of file
@@ -0,0 +1,187 @@
+import atexit
+import glob
+import hashlib
+import io
+import os
+import threading
+import time
+import numpy as np
+from config import Config
+from utils import write_atomic
+
+def input_hash(*parts):
+    """Hex digest identifying the inputs a feature group was computed from"""
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+class FeatureStore:
+    """Columnar on-disk store of feature groups, one row per key
+    
+    Each group is a directory of .npz shards holding a ``key`` column, an
+    ``input_hash`` column and one array per feature column. A stored row is
+    used only while the hash of the inputs its group depends on matches.
+    New rows are kept in memory and written as one new shard on flush,
+    which also happens once ``flush_rows`` rows are pending; later shards
+    override earlier ones, and once a group has more than ``max_shards``
+    files they are compacted into one.
+    """
+    
+    def __init__(self, path=None, max_shards=None, flush_rows=None):
+        self.path = path or Config.FEATURE_STORE_DIR
+        self.max_shards = max_shards or Config.FEATURE_STORE_MAX_SHARDS
+        self.flush_rows = flush_rows or Config.FEATURE_STORE_FLUSH_ROWS
+        self.hits = 0
+        self.misses = 0
+        self._groups = {}  # name -> {'columns', 'chunks', 'index', 'pending'}
+        self._pending_rows = 0
+        self._lock = threading.RLock()
+    
+    def lookup(self, group, columns, keys, input_hashes):
+        """Stored row tuple (in ``columns`` order) per key, or None where missing or stale"""
+        with self._lock:
+            state = self._group(group, columns)
+            rows = []
+            for key, expected in zip(keys, input_hashes):
+                location = state['index'].get(key)
+                if location is None or location[0] != expected:
+                    rows.append(None)
+                    continue
+                chunk = state['chunks'][location[1]]
+                rows.append(tuple(chunk[column][location[2]] for column in columns))
+            self.hits += sum(row is not None for row in rows)
+            self.misses += sum(row is None for row in rows)
+            return rows
+    
+    def put(self, group, columns, keys, input_hashes, rows):
+        """Store row tuples for keys; flushed to disk by flush()"""
+        if not keys:
+            return
+        with self._lock:
+            state = self._group(group, columns)
+            chunk = {'key': np.asarray(keys, dtype=str), 'input_hash': np.asarray(input_hashes, dtype=str)}
+            for position, column in enumerate(columns):
+                chunk[column] = np.asarray([row[position] for row in rows])
+            self._add_chunk(state, chunk)
+            state['pending'].append(chunk)
+            self._pending_rows += len(keys)
+            if self._pending_rows >= self.flush_rows:
+                self.flush()
+    
+    def read(self, group, columns):
+        """Every current row of a group as arrays: ``key``, ``input_hash`` and the columns"""
+        with self._lock:
+            state = self._group(group, columns)
+            names = ('key', 'input_hash') + tuple(columns)
+            if not state['index']:
+                return {name: np.array([]) for name in names}
+            offsets = np.cumsum([0] + [len(chunk['key']) for chunk in state['chunks']])
+            positions = np.array([offsets[chunk] + row for _, chunk, row in state['index'].values()])
+            return {
+                name: np.concatenate([chunk[name] for chunk in state['chunks']])[positions]
+                for name in names
+            }
+    
+    def flush(self):
+        """Write each group's new rows as one shard, compacting groups with too many shards"""
+        with self._lock:
+            self._pending_rows = 0
+            for name, state in self._groups.items():
+                if not state['pending']:
+                    continue
+                directory = os.path.join(self.path, name)
+                pending = state['pending']
+                state['pending'] = []
+                shard = {column: np.concatenate([chunk[column] for chunk in pending]) for column in pending[0]}
+                try:
+                    os.makedirs(directory, exist_ok=True)
+                    _write_shard(directory, shard)
+                    shards = sorted(glob.glob(os.path.join(directory, '*.npz')))
+                    if len(shards) > self.max_shards:
+                        self._compact(state, directory, shards)
+                except OSError as e:
+                    print(f"Could not save feature store group {name}: {e}")
+    
+    def _group(self, name, columns):
+        """Loaded state of a group; shards written for other columns are ignored"""
+        columns = tuple(columns)
+        state = self._groups.get(name)
+        if state is not None and state['columns'] == columns:
+            return state
+        
+        state = {'columns': columns, 'chunks': [], 'index': {}, 'pending': []}
+        for shard_path in sorted(glob.glob(os.path.join(self.path, name, '*.npz'))):
+            try:
+                with np.load(shard_path) as shard:
+                    if set(shard.files) != {'key', 'input_hash'} | set(columns):
+                        continue
+                    self._add_chunk(state, {column: shard[column] for column in shard.files})
+            except Exception as e:
+                print(f"Could not read feature store shard {shard_path}: {e}")
+        self._groups[name] = state
+        return state
+    
+    def _add_chunk(self, state, chunk):
+        number = len(state['chunks'])
+        state['chunks'].append(chunk)
+        index = state['index']
+        for row, (key, hash_value) in enumerate(zip(chunk['key'].tolist(), chunk['input_hash'].tolist())):
+            index[key] = (hash_value, number, row)
+    
+    def _compact(self, state, directory, shards):
+        """Replace every shard of a group with one holding the current rows"""
+        offsets = np.cumsum([0] + [len(chunk['key']) for chunk in state['chunks']])
+        positions = np.array([offsets[chunk] + row for _, chunk, row in state['index'].values()])
+        merged = {
+            column: np.concatenate([chunk[column] for chunk in state['chunks']])[positions]
+            for column in state['chunks'][0]
+        }
+        _write_shard(directory, merged)
+        for shard_path in shards:
+            os.remove(shard_path)
+        state['chunks'] = []
+        state['index'] = {}
+        self._add_chunk(state, merged)
+
+def _write_shard(directory, arrays):
+    """Write a shard atomically under a name that sorts after existing shards"""
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    write_atomic(os.path.join(directory, f"{time.time_ns():020d}-{os.getpid()}.npz"), buffer.getvalue())
+
+def cached_rows(store, group, columns, keys, input_hashes, compute):
+    """Row tuples for every key, computing and storing only missing or stale ones
+    
+    ``compute(positions)`` returns one row tuple per position, or None for
+    rows that could not be computed (those are not stored). Without a
+    store, or for empty keys, every row is computed.
+    """
+    if store is None:
+        return compute(list(range(len(keys))))
+    
+    rows = store.lookup(group, columns, keys, input_hashes)
+    stale = [i for i, row in enumerate(rows) if row is None]
+    if stale:
+        computed = compute(stale)
+        new = []
+        for i, row in zip(stale, computed):
+            rows[i] = row
+            if row is not None and keys[i]:
+                new.append(i)
+        store.put(group, columns, [keys[i] for i in new], [input_hashes[i] for i in new], [rows[i] for i in new])
+    return rows
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+def get_feature_store():
+    """Return the process-wide feature store, or None when it is disabled
+    
+    Rows still pending when the process exits are flushed then.
+    """
+    global _shared_store
+    if not Config.FEATURE_STORE_ENABLED:
+        return None
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = FeatureStore()
+            atexit.register(_shared_store.flush)
+        return _shared_store
\ No newline at end of file
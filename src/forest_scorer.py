@@ -0,0 +1,143 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# Arrays of an exported forest, one .npy file each so they can be memory-mapped
+FOREST_ARRAYS = (
+    'feature', 'threshold', 'left', 'missing_left', 'proba',
+    'roots', 'max_depth', 'classes', 'mean', 'scale', 'feature_names'
+)
+
+class ArrayScaler:
+    """StandardScaler.transform from its mean and scale arrays"""
+    
+    def __init__(self, mean, scale):
+        self.mean = mean
+        self.scale = scale
+    
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+
+class ArrayForest:
+    """RandomForestClassifier.predict_proba over flattened tree arrays
+    
+    The nodes of every tree live in the same arrays, laid out breadth
+    first so a node's right child directly follows its left one, and all
+    rows walk all trees together for ``max_depth`` steps of vectorized
+    gathers. Leaves point at themselves with an infinite threshold. Like
+    sklearn, inputs are compared as float32 and the trees' class
+    probabilities are summed in tree order before dividing by the number
+    of trees.
+    """
+    
+    def __init__(self, arrays):
+        # Plain ndarray views of the (possibly memory-mapped) files
+        self.feature = np.asarray(arrays['feature'])
+        self.threshold = np.asarray(arrays['threshold'])
+        self.left = np.asarray(arrays['left'])
+        self.missing_left = np.asarray(arrays['missing_left'])
+        self.proba = np.asarray(arrays['proba'])
+        self.roots = np.asarray(arrays['roots'])
+        self.max_depth = int(arrays['max_depth'])
+        self.classes_ = np.asarray(arrays['classes'])
+    
+    def predict_proba(self, X):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        missing = bool(np.isnan(X).any())
+        flat = X.ravel()
+        row_starts = (np.arange(len(X), dtype=np.int32) * X.shape[1])[:, None]
+        nodes = np.repeat(self.roots[None, :], len(X), axis=0)
+        for _ in range(self.max_depth):
+            values = flat.take(row_starts + self.feature.take(nodes))
+            go_left = values <= self.threshold.take(nodes)
+            if missing:
+                go_left |= np.isnan(values) & self.missing_left.take(nodes)
+            nodes = self.left.take(nodes) + ~go_left
+        
+        proba = np.zeros((len(X), self.proba.shape[1]))
+        for tree in range(nodes.shape[1]):
+            proba += self.proba.take(nodes[:, tree], axis=0)
+        return proba / nodes.shape[1]
+
+def flatten_forest(model, scaler, feature_names, feature_indices=None):
+    """Arrays of a fitted single-output RandomForestClassifier and its StandardScaler
+    
+    A model fitted on the columns ``feature_indices`` of the scaled
+    features has its split features mapped back to those columns, so the
+    export scores full feature rows like any other.
+    """
+    column = np.arange(model.n_features_in_) if feature_indices is None else np.asarray(feature_indices)
+    features, thresholds, lefts, missing, probas, roots = [], [], [], [], [], []
+    offset = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        
+        # Breadth-first order, numbering both children of a node together
+        order = [0]
+        left = {}
+        for node in order:
+            if tree.children_left[node] >= 0:
+                left[node] = offset + len(order)
+                order.extend((tree.children_left[node], tree.children_right[node]))
+        order = np.asarray(order)
+        leaf = tree.children_left[order] < 0
+        
+        features.append(np.where(leaf, 0, column[np.where(leaf, 0, tree.feature[order])]))
+        thresholds.append(np.where(leaf, np.inf, tree.threshold[order]))
+        lefts.append([left.get(node, offset + i) for i, node in enumerate(order)])
+        missing_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count))
+        missing.append(np.asarray(missing_left, dtype=bool)[order] | leaf)
+        
+        value = tree.value[order, 0, :]
+        normalizer = value.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        probas.append(value / normalizer)
+        
+        roots.append(offset)
+        offset += len(order)
+    
+    n_features = len(feature_names)
+    return {
+        'feature': np.concatenate(features).astype(np.int32),
+        'threshold': np.concatenate(thresholds).astype(np.float64),
+        'left': np.concatenate(lefts).astype(np.int32),
+        'missing_left': np.concatenate(missing),
+        'proba': np.concatenate(probas).astype(np.float64),
+        'roots': np.asarray(roots, dtype=np.int32),
+        'max_depth': np.asarray(max(e.tree_.max_depth for e in model.estimators_)),
+        'classes': np.asarray(model.classes_),
+        'mean': np.zeros(n_features) if scaler.mean_ is None else np.asarray(scaler.mean_, dtype=np.float64),
+        'scale': np.ones(n_features) if scaler.scale_ is None else np.asarray(scaler.scale_, dtype=np.float64),
+        'feature_names': np.asarray(feature_names, dtype=str)
+    }
+
+def export_forest(model, scaler, feature_names, path, feature_indices=None):
+    """Write the forest and scaler as a directory of .npy files
+    
+    The directory is built next to ``path`` and renamed into place, so
+    readers never see a partial export; between retiring the old directory
+    and the rename ``path`` is briefly missing.
+    """
+    arrays = flatten_forest(model, scaler, feature_names, feature_indices)
+    parent = os.path.dirname(os.path.abspath(path))
+    staging = tempfile.mkdtemp(dir=parent, prefix=os.path.basename(path) + '.')
+    for name in FOREST_ARRAYS:
+        np.save(os.path.join(staging, name + '.npy'), arrays[name])
+    
+    if os.path.exists(path):
+        retired = staging + '.old'
+        os.rename(path, retired)
+        os.rename(staging, path)
+        shutil.rmtree(retired, ignore_errors=True)
+    else:
+        os.rename(staging, path)
+
+def load_forest(path):
+    """Memory-map an exported forest; returns the same keys as the joblib model file"""
+    arrays = {name: np.load(os.path.join(path, name + '.npy'), mmap_mode='r') for name in FOREST_ARRAYS}
+    return {
+        'model': ArrayForest(arrays),
+        'scaler': ArrayScaler(arrays['mean'], arrays['scale']),
+        'feature_names': [str(name) for name in arrays['feature_names']]
+    }
\ No newline at end of file
@@ -0,0 +1,75 @@
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from config import Config
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class HTTPTransport:
+    """Keep-alive HTTP session shared by every API and thumbnail request"""
+    
+    def __init__(self, pool_size=None, max_retries=None, backoff_base=None, timeout=None):
+        self.pool_size = pool_size or Config.HTTP_POOL_SIZE
+        self.max_retries = Config.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = Config.HTTP_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.timeout = timeout or Config.HTTP_TIMEOUT
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Google APIs only compress responses for clients that advertise gzip
+        # in both Accept-Encoding and the User-Agent
+        self.session.headers.update({
+            'Accept-Encoding': 'gzip, deflate',
+            'User-Agent': 'youtube-ai-analyzer/1.0 (gzip)'
+        })
+    
+    def get(self, url, params=None, headers=None, timeout=None):
+        """GET with bounded retries and jittered exponential backoff"""
+        attempt = 0
+        while True:
+            try:
+                response = self.session.get(url, params=params, headers=headers,
+                                            timeout=timeout or self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                self._sleep_before_retry(attempt)
+                attempt += 1
+                continue
+            
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                self._sleep_before_retry(attempt, response.headers.get('Retry-After'))
+                attempt += 1
+                continue
+            
+            return response
+    
+    def _sleep_before_retry(self, attempt, retry_after=None):
+        """Full-jitter backoff, honouring a numeric Retry-After header"""
+        delay = random.uniform(0, self.backoff_base * (2 ** attempt))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        time.sleep(min(delay, Config.HTTP_BACKOFF_MAX))
+    
+    def close(self):
+        self.session.close()
+
+_shared_transport = None
+_shared_lock = threading.Lock()
+
+def get_transport():
+    """Return the process-wide transport, creating it on first use"""
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = HTTPTransport()
+            if Config.RECORD_FIXTURES_DIR:
+                from replay import RecordingTransport
+                _shared_transport = RecordingTransport(_shared_transport, Config.RECORD_FIXTURES_DIR)
+        return _shared_transport
\ No newline at end of file
@@ -0,0 +1,100 @@
+import os
+import threading
+import time
+import joblib
+from config import Config
+
+class ModelRegistry:
+    """Trained model files, loaded once per process and shared by every analyzer
+    
+    Files are loaded with ``mmap_mode`` so the numpy arrays of uncompressed
+    dumps are mapped read-only from the page cache instead of copied. A
+    missing or unreadable file is remembered too, so callers fall back
+    without touching the filesystem, and reported once. At most once per
+    ``recheck_interval`` seconds the file is stat'ed again; a file that
+    appeared or whose mtime changed is loaded and replaces the old entry.
+    
+    Workers forked after a model is loaded share its pages copy-on-write.
+    """
+    
+    def __init__(self, recheck_interval=None, mmap_mode='r'):
+        self.recheck_interval = Config.MODEL_RECHECK_INTERVAL if recheck_interval is None else recheck_interval
+        self.mmap_mode = mmap_mode
+        self.loads = 0
+        self._entries = {}  # path -> [mtime_ns or None, loaded dict or None, monotonic time of last check]
+        self._stats = {}  # path -> [mtime_ns or None, monotonic time of last stat], for mtime()
+        self._reported_missing = set()
+        self._lock = threading.Lock()
+    
+    def get(self, path, loader=None):
+        """Return the dict stored at ``path``, or None while it is missing or unreadable
+        
+        ``loader(path)`` reads the file instead of joblib.load when given.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and now - entry[2] < self.recheck_interval:
+                return entry[1]
+            
+            mtime = self._mtime(path)
+            if entry is not None and entry[0] == mtime:
+                entry[2] = now
+                return entry[1]
+            if mtime is not None:
+                self._reported_missing.discard(path)
+            
+            if mtime is None:
+                if path not in self._reported_missing:
+                    self._reported_missing.add(path)
+                    print(f"Could not load model: {path} not found")
+                loaded = None
+            else:
+                loaded = self._load(path, loader, replacing=entry is not None and entry[1] is not None)
+            self._entries[path] = [mtime, loaded, now]
+            return loaded
+    
+    def mtime(self, path):
+        """mtime_ns of ``path`` (None while missing) without loading it, stat'ed at most once per recheck_interval"""
+        now = time.monotonic()
+        with self._lock:
+            stat = self._stats.get(path)
+            if stat is None or now - stat[1] >= self.recheck_interval:
+                stat = [self._mtime(path), now]
+                self._stats[path] = stat
+            return stat[0]
+    
+    def invalidate(self, path):
+        """Forget ``path`` so the next get checks the file again"""
+        with self._lock:
+            self._entries.pop(path, None)
+            self._stats.pop(path, None)
+            self._reported_missing.discard(path)
+    
+    def _load(self, path, loader=None, replacing=False):
+        try:
+            loaded = loader(path) if loader else joblib.load(path, mmap_mode=self.mmap_mode)
+        except Exception as e:
+            print(f"Could not load model: {e}")
+            return None
+        self.loads += 1
+        print("Model file changed, reloaded" if replacing else "Pre-trained model loaded successfully")
+        return loaded
+    
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+_shared_registry = None
+_shared_lock = threading.Lock()
+
+def get_model_registry():
+    """Return the process-wide model registry"""
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = ModelRegistry()
+        return _shared_registry
\ No newline at end of file
@@ -0,0 +1,182 @@
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+import requests
+from config import Config
+from utils import write_atomic
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+except Exception:
+    # No tz database (e.g. Windows without the tzdata package): Pacific
+    # standard time, so the reset is an hour late during daylight saving
+    QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+
+# YouTube Data API v3 quota cost per call, in units
+ENDPOINT_COSTS = {
+    'search': 100,
+    'videos': 1,
+    'channels': 1,
+    'playlistItems': 1,
+    'commentThreads': 1
+}
+DEFAULT_COST = 1
+
+# Expensive endpoints that are refused first once the budget runs low, so
+# the remaining units go to cheap detail lookups
+DEFERRABLE_ENDPOINTS = {'search'}
+
+class QuotaDeferred(requests.RequestException):
+    """Raised when a call is held back to protect the daily quota"""
+
+class QuotaScheduler:
+    """Accounting for the daily API quota plus a per-second rate limit
+    
+    The daily bucket holds ``daily_budget`` units and is refilled at
+    midnight Pacific time, when YouTube resets the quota. Its state is
+    persisted to ``state_path`` (at most every ``save_interval`` seconds
+    and by save()) so separate scheduled runs share one budget.
+    """
+    
+    def __init__(self, daily_budget=None, rate_limit=None, search_reserve=None, state_path=None,
+                 save_interval=None):
+        self.daily_budget = daily_budget or Config.DAILY_QUOTA
+        self.rate_limit = rate_limit or Config.API_RATE_LIMIT
+        self.search_reserve = Config.QUOTA_SEARCH_RESERVE if search_reserve is None else search_reserve
+        self.state_path = Config.QUOTA_STATE_PATH if state_path is None else state_path
+        self.save_interval = Config.QUOTA_SAVE_INTERVAL if save_interval is None else save_interval
+        
+        self._lock = threading.Lock()
+        self._tokens = float(self.daily_budget)
+        self._day = quota_day()
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        self._rate_tokens = float(self.rate_limit)
+        self._rate_updated_at = time.monotonic()
+        
+        self.used_by_endpoint = {}
+        self.calls_by_endpoint = {}
+        self.deferred_by_endpoint = {}
+        
+        self._load_state()
+    
+    def cost_of(self, endpoint):
+        return ENDPOINT_COSTS.get(endpoint, DEFAULT_COST)
+    
+    def acquire(self, endpoint):
+        """Reserve quota for one call, waiting for the per-second limit
+        
+        Raises QuotaDeferred if the daily budget cannot cover the call; search
+        calls are refused earlier, once only the reserve is left.
+        """
+        cost = self.cost_of(endpoint)
+        with self._lock:
+            self._refill()
+            floor = self.search_reserve if endpoint in DEFERRABLE_ENDPOINTS else 0
+            if self._tokens - cost < floor:
+                self.deferred_by_endpoint[endpoint] = self.deferred_by_endpoint.get(endpoint, 0) + 1
+                raise QuotaDeferred(
+                    f"{endpoint}.list deferred: {int(self._tokens)} quota units left "
+                    f"(cost {cost}, reserve {floor})"
+                )
+            
+            self._tokens -= cost
+            self.used_by_endpoint[endpoint] = self.used_by_endpoint.get(endpoint, 0) + cost
+            self.calls_by_endpoint[endpoint] = self.calls_by_endpoint.get(endpoint, 0) + 1
+            self._dirty = True
+            if time.monotonic() - self._saved_at >= self.save_interval:
+                self._save_state()
+            
+            wait = self._take_rate_token()
+        
+        if wait > 0:
+            time.sleep(wait)
+    
+    def remaining(self):
+        with self._lock:
+            self._refill()
+            return int(self._tokens)
+    
+    def save(self):
+        """Write the quota state if calls were accounted since the last save"""
+        with self._lock:
+            if self._dirty:
+                self._save_state()
+    
+    def get_metrics(self):
+        """Snapshot of quota usage for reporting"""
+        with self._lock:
+            self._refill()
+            return {
+                'daily_budget': self.daily_budget,
+                'remaining': int(self._tokens),
+                'used': sum(self.used_by_endpoint.values()),
+                'used_by_endpoint': dict(self.used_by_endpoint),
+                'calls_by_endpoint': dict(self.calls_by_endpoint),
+                'deferred_by_endpoint': dict(self.deferred_by_endpoint)
+            }
+    
+    def _refill(self):
+        """Refill the daily bucket once the quota day has changed"""
+        day = quota_day()
+        if day != self._day:
+            self._tokens = float(self.daily_budget)
+            self._day = day
+    
+    def _take_rate_token(self):
+        """Take one slot from the per-second bucket; returns how long to wait for it"""
+        now = time.monotonic()
+        self._rate_tokens = min(self.rate_limit, self._rate_tokens + (now - self._rate_updated_at) * self.rate_limit)
+        self._rate_updated_at = now
+        self._rate_tokens -= 1
+        if self._rate_tokens >= 0:
+            return 0
+        return -self._rate_tokens / self.rate_limit
+    
+    def _load_state(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+            if 'day' in state:
+                day = state['day']
+            else:
+                # State written before quota days were tracked
+                day = quota_day(float(state['updated_at']))
+            if day == self._day:
+                self._tokens = min(float(state['tokens']), self.daily_budget)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not load quota state: {e}")
+    
+    def _save_state(self):
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        if not self.state_path:
+            return
+        state = {'tokens': self._tokens, 'day': self._day}
+        try:
+            write_atomic(self.state_path, json.dumps(state))
+        except OSError as e:
+            print(f"Could not save quota state: {e}")
+
+def quota_day(timestamp=None):
+    """The quota day (a Pacific-time date string) a Unix time falls in, default now"""
+    moment = datetime.fromtimestamp(time.time() if timestamp is None else timestamp, QUOTA_TIMEZONE)
+    return moment.date().isoformat()
+
+_shared_scheduler = None
+_shared_lock = threading.Lock()
+
+def get_scheduler():
+    """Return the process-wide quota scheduler, creating it on first use"""
+    global _shared_scheduler
+    with _shared_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = QuotaScheduler()
+            atexit.register(_shared_scheduler.save)
+        return _shared_scheduler
\ No newline at end of file
@@ -0,0 +1,284 @@
+"""
+Offline record/replay harness for the YouTube Data API
+
+Record real responses and thumbnails by running the analyzer with
+YOUTUBE_RECORD_DIR set (or `python replay.py record --fixtures DIR`), then
+replay them from a local stub server with configurable latency and error
+injection:
+
+    python replay.py serve --fixtures fixtures/ --latency 0.05 --error-rate 0.02
+    python replay.py bench --fixtures fixtures/
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
+from config import Config
+from response_cache import request_key
+from utils import write_atomic
+
+API_PREFIX = '/youtube/v3'
+
+def thumbnail_key(url):
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+class RecordingTransport:
+    """Transport wrapper that saves every successful response as a fixture
+    
+    API responses go to ``api/<endpoint>/<key>.json`` (keyed like the
+    response cache, without the API key); anything else, i.e. thumbnails, is
+    stored under ``thumbnails/<sha256 of url>``.
+    """
+    
+    def __init__(self, transport, fixtures_dir):
+        self.transport = transport
+        self.fixtures_dir = fixtures_dir
+        self.api_path = urlparse(Config.YOUTUBE_API_BASE_URL).path.rstrip('/')
+    
+    def get(self, url, params=None, headers=None, timeout=None):
+        response = self.transport.get(url, params=params, headers=headers, timeout=timeout)
+        if response.status_code == 200:
+            try:
+                self._record(url, params or {}, response)
+            except OSError as e:
+                print(f"Could not record fixture for {url}: {e}")
+        return response
+    
+    def _record(self, url, params, response):
+        path = urlparse(url).path
+        if path.startswith(self.api_path + '/'):
+            endpoint = path[len(self.api_path) + 1:]
+            fixture = {
+                'endpoint': endpoint,
+                'params': {k: str(v) for k, v in params.items() if k != 'key'},
+                'etag': response.headers.get('ETag'),
+                'body': response.json()
+            }
+            fixture_path = os.path.join(self.fixtures_dir, 'api', endpoint,
+                                        f"{request_key(endpoint, params)}.json")
+            write_atomic(fixture_path, json.dumps(fixture))
+        else:
+            blob_path = os.path.join(self.fixtures_dir, 'thumbnails', thumbnail_key(url))
+            write_atomic(blob_path, response.content)
+    
+    def close(self):
+        self.transport.close()
+
+class StubYouTubeServer:
+    """Local HTTP server that replays recorded fixtures
+    
+    ``latency`` seconds are added to every response and a ``error_rate``
+    fraction of requests fail with ``error_status``; the error sequence is
+    reproducible for a given ``seed``.
+    """
+    
+    def __init__(self, fixtures_dir, host='127.0.0.1', port=0, latency=0.0,
+                 error_rate=0.0, error_status=503, seed=0):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self.request_count = 0
+        self.error_count = 0
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+    
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+    
+    @property
+    def thumbnail_base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/thumbnails"
+    
+    def start(self):
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def serve_forever(self):
+        self.httpd.serve_forever()
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+    
+    def _should_fail(self):
+        with self._random_lock:
+            self.request_count += 1
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+            if fail:
+                self.error_count += 1
+            return fail
+    
+    def _load_api_fixture(self, endpoint, params):
+        path = os.path.join(self.fixtures_dir, 'api', endpoint, f"{request_key(endpoint, params)}.json")
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _rewrite_thumbnails(self, body):
+        """Point recorded thumbnail URLs at this server"""
+        for item in body.get('items', []):
+            thumbnails = item.get('snippet', {}).get('thumbnails', {})
+            for variant in thumbnails.values():
+                if variant.get('url'):
+                    variant['url'] = f"{self.thumbnail_base_url}/{thumbnail_key(variant['url'])}"
+        return body
+    
+    def _make_handler(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                if server._should_fail():
+                    self._send_json(server.error_status, {'error': {
+                        'code': server.error_status, 'message': 'Injected error'}})
+                    return
+                
+                parsed = urlparse(self.path)
+                if parsed.path.startswith(API_PREFIX + '/'):
+                    self._serve_api(parsed.path[len(API_PREFIX) + 1:], dict(parse_qsl(parsed.query)))
+                elif parsed.path.startswith('/thumbnails/'):
+                    self._serve_thumbnail(os.path.basename(parsed.path))
+                else:
+                    self._send_json(404, {'error': {'code': 404, 'message': 'Not found'}})
+            
+            def _serve_api(self, endpoint, params):
+                fixture = server._load_api_fixture(endpoint, params)
+                if fixture is None:
+                    self._send_json(404, {'error': {'code': 404, 'message': f'No fixture for {endpoint}'}})
+                    return
+                
+                etag = fixture.get('etag')
+                if etag and self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                
+                self._send_json(200, server._rewrite_thumbnails(fixture['body']), etag)
+            
+            def _serve_thumbnail(self, key):
+                try:
+                    with open(os.path.join(server.fixtures_dir, 'thumbnails', key), 'rb') as f:
+                        data = f.read()
+                except OSError:
+                    self._send_json(404, {'error': {'code': 404, 'message': 'Thumbnail not recorded'}})
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/jpeg')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def _send_json(self, status, body, etag=None):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=UTF-8')
+                if etag:
+                    self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+
+def run_benchmark(fixtures_dir, latency=0.0, error_rate=0.0, seed=0, rate_limit=1000):
+    """Run the full analysis against the stub server and report throughput"""
+    with StubYouTubeServer(fixtures_dir, latency=latency, error_rate=error_rate, seed=seed) as stub, \
+            tempfile.TemporaryDirectory(prefix='replay-cache-') as cache_dir:
+        # Isolate the run from the live configuration and on-disk state:
+        # every cache starts empty and is discarded afterwards
+        Config.YOUTUBE_API_BASE_URL = stub.base_url
+        Config.RESPONSE_CACHE_ENABLED = False
+        Config.RESPONSE_CACHE_DIR = os.path.join(cache_dir, 'responses')
+        Config.CHANNEL_HISTORY_DIR = os.path.join(cache_dir, 'channels')
+        Config.THUMBNAIL_CACHE_DIR = os.path.join(cache_dir, 'thumbnails')
+        Config.THUMBNAIL_INDEX_PATH = os.path.join(cache_dir, 'thumbnail_index.json')
+        Config.FEATURE_STORE_DIR = os.path.join(cache_dir, 'features')
+        Config.RECORD_FIXTURES_DIR = None
+        Config.QUOTA_STATE_PATH = ''
+        Config.API_RATE_LIMIT = rate_limit
+        
+        from enhanced_main import analyze_youtube_ai_content_enhanced
+        start = time.perf_counter()
+        results = analyze_youtube_ai_content_enhanced()
+        elapsed = time.perf_counter() - start
+    
+    print(f"\n⏱️  Replayed {len(results)} videos in {elapsed:.2f}s "
+          f"({len(results) / max(elapsed, 1e-9):.1f} videos/s, "
+          f"{stub.request_count} requests, {stub.error_count} injected errors)")
+    return elapsed, results
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay YouTube API fixtures")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    record = subparsers.add_parser('record', help="Run a live analysis and record every response")
+    record.add_argument('--fixtures', required=True)
+    
+    for name, help_text in [('serve', "Serve recorded fixtures"),
+                            ('bench', "Benchmark the pipeline against recorded fixtures")]:
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('--fixtures', required=True)
+        sub.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response")
+        sub.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests that fail")
+        sub.add_argument('--seed', type=int, default=0)
+        if name == 'serve':
+            sub.add_argument('--host', default='127.0.0.1')
+            sub.add_argument('--port', type=int, default=8765)
+            sub.add_argument('--error-status', type=int, default=503)
+        else:
+            sub.add_argument('--rate-limit', type=float, default=1000, help="Client requests per second")
+    
+    args = parser.parse_args()
+    
+    if args.command == 'record':
+        Config.RECORD_FIXTURES_DIR = args.fixtures
+        from enhanced_main import analyze_youtube_ai_content_enhanced
+        analyze_youtube_ai_content_enhanced()
+        print(f"\n📼 Fixtures recorded to {args.fixtures}")
+    elif args.command == 'serve':
+        stub = StubYouTubeServer(args.fixtures, host=args.host, port=args.port, latency=args.latency,
+                                 error_rate=args.error_rate, error_status=args.error_status, seed=args.seed)
+        print(f"🧪 Replaying {args.fixtures} at {stub.base_url}")
+        print(f"   Point the analyzer at it with YOUTUBE_API_BASE_URL={stub.base_url}")
+        try:
+            stub.serve_forever()
+        except KeyboardInterrupt:
+            stub.stop()
+    else:
+        run_benchmark(args.fixtures, latency=args.latency, error_rate=args.error_rate,
+                      seed=args.seed, rate_limit=args.rate_limit)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
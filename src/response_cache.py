@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from config import Config
+from utils import write_atomic
+
+def request_key(endpoint, params):
+    """Stable key for a request; the API key is never part of it
+    
+    Values are compared as strings so a request rebuilt from a query string
+    maps to the same key as the original call.
+    """
+    cacheable = {k: str(v) for k, v in params.items() if k != 'key'}
+    raw = json.dumps([endpoint, cacheable], sort_keys=True)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    """On-disk cache of API responses keyed by endpoint and params
+    
+    Entries keep the response ETag. While an entry is younger than its TTL it
+    is served without touching the network; after that the client revalidates
+    with If-None-Match and a 304 refreshes the stored copy.
+    """
+    
+    def __init__(self, cache_dir=None, part_ttls=None, endpoint_ttls=None):
+        self.cache_dir = cache_dir or Config.RESPONSE_CACHE_DIR
+        self.part_ttls = part_ttls or Config.CACHE_PART_TTLS
+        self.endpoint_ttls = endpoint_ttls or Config.CACHE_ENDPOINT_TTLS
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()  # the client counts from several threads
+    
+    def key_for(self, endpoint, params):
+        return request_key(endpoint, params)
+    
+    def ttl_for(self, endpoint, params):
+        """Seconds an entry stays fresh: the shortest TTL of the parts it holds"""
+        if endpoint in self.endpoint_ttls:
+            return self.endpoint_ttls[endpoint]
+        parts = [p for p in str(params.get('part', '')).split(',') if p]
+        ttls = [self.part_ttls[p] for p in parts if p in self.part_ttls]
+        return min(ttls) if ttls else 0
+    
+    def get(self, endpoint, params):
+        path = self._path(endpoint, self.key_for(endpoint, params))
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def is_fresh(self, entry, endpoint, params):
+        age = time.time() - entry.get('stored_at', 0)
+        return age < self.ttl_for(endpoint, params)
+    
+    def put(self, endpoint, params, body, etag=None):
+        entry = {'etag': etag, 'stored_at': time.time(), 'body': body}
+        self._write(self._path(endpoint, self.key_for(endpoint, params)), entry)
+        return entry
+    
+    def touch(self, endpoint, params, entry):
+        """Mark a revalidated (304) entry as fresh again"""
+        entry['stored_at'] = time.time()
+        self._write(self._path(endpoint, self.key_for(endpoint, params)), entry)
+    
+    def record(self, outcome):
+        """Count a 'hits', 'revalidated' or 'misses' outcome"""
+        with self._stats_lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+    
+    def get_stats(self):
+        with self._stats_lock:
+            return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses}
+    
+    def _path(self, endpoint, key):
+        return os.path.join(self.cache_dir, endpoint, key[:2], f"{key}.json")
+    
+    def _write(self, path, entry):
+        try:
+            write_atomic(path, json.dumps(entry))
+        except OSError as e:
+            print(f"Could not write response cache entry: {e}")
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+def get_response_cache():
+    """Return the process-wide response cache, or None when caching is disabled"""
+    global _shared_cache
+    # Recording needs every response to go over the wire
+    if not Config.RESPONSE_CACHE_ENABLED or Config.RECORD_FIXTURES_DIR:
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+        return _shared_cache
\ No newline at end of file
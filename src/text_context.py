@@ -0,0 +1,81 @@
+from functools import cached_property
+
+class TextContext:
+    """Normalized text of one video, computed lazily and at most once
+    
+    Built once per video (see extract_video_features) and read by every
+    analyzer, so the title and description are lowercased, joined and
+    split a single time. Instances are immutable; derived fields are
+    computed on first access and cached.
+    """
+    
+    def __init__(self, title='', description='', tags=(), channel_title=''):
+        object.__setattr__(self, 'title', title)
+        object.__setattr__(self, 'description', description)
+        object.__setattr__(self, 'tags', tuple(tags))
+        object.__setattr__(self, 'channel_title', channel_title)
+    
+    @classmethod
+    def from_video(cls, video_data):
+        return cls(
+            video_data.get('title', ''),
+            video_data.get('description', ''),
+            video_data.get('tags', []),
+            video_data.get('channel_title', '')
+        )
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("TextContext is immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError("TextContext is immutable")
+    
+    @cached_property
+    def title_lower(self):
+        return self.title.lower()
+    
+    @cached_property
+    def title_upper(self):
+        return self.title.upper()
+    
+    @cached_property
+    def description_lower(self):
+        return self.description.lower()
+    
+    @cached_property
+    def text(self):
+        """Lowercased "title description"; equal to lowercasing the joined string"""
+        return f"{self.title_lower} {self.description_lower}"
+    
+    @cached_property
+    def title_word_count(self):
+        return len(self.title.split())
+    
+    @cached_property
+    def description_word_count(self):
+        return len(self.description.split())
+    
+    @cached_property
+    def word_count(self):
+        # The joining space only separates, so no need to split the joined text
+        return self.title_word_count + self.description_word_count
+    
+    @cached_property
+    def tags_lower(self):
+        return tuple(tag.lower() for tag in self.tags)
+    
+    @cached_property
+    def tags_text(self):
+        """Lowercased tags joined by newlines; no matcher term spans a newline"""
+        return '\n'.join(self.tags_lower)
+    
+    @cached_property
+    def channel_title_lower(self):
+        return self.channel_title.lower()
+
+def text_context(video_data):
+    """The video's shared TextContext, or a new one for plain feature dicts"""
+    context = video_data.get('text_context')
+    if context is None:
+        context = TextContext.from_video(video_data)
+    return context
\ No newline at end of file
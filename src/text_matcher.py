@@ -0,0 +1,183 @@
+import re
+import numpy as np
+
+# Characters that survive str.lower() but that re.IGNORECASE still folds
+# onto ASCII letters (dotless i and long s)
+_EXTRA_CASE_FOLDS = ('ı', 'ſ')
+
+class TermMatcher:
+    """Every analyzer's term lists and ``a.*b`` patterns, compiled once
+    
+    Terms are plain substrings, written in the case of the text they are
+    matched against (lowercase unless noted). Each distinct term is
+    searched once per call however many of the requested lists contain
+    it. Patterns are sequences of literal atoms joined by ``.*`` and
+    matched case-insensitively against lowercased text; instead of a
+    backtracking regex search they become a chain of bounded str.find
+    calls per line, with the same result as ``re.search(pattern, text,
+    re.IGNORECASE)``.
+    """
+    
+    def __init__(self, term_lists, pattern_lists=None):
+        self.term_lists = {name: tuple(terms) for name, terms in term_lists.items()}
+        self.pattern_lists = {}
+        for name, patterns in (pattern_lists or {}).items():
+            self.pattern_lists[name] = tuple(
+                (self._atoms(pattern), weight, re.compile(pattern, re.IGNORECASE))
+                for pattern, weight in patterns
+            )
+        self._plans = {}
+    
+    def count(self, name, text):
+        """Number of the list's terms that occur in ``text``"""
+        return sum(1 for term in self.term_lists[name] if term in text)
+    
+    def found(self, name, text):
+        """One bool per term of the list, in list order"""
+        return [term in text for term in self.term_lists[name]]
+    
+    def matches_any(self, name, text):
+        return any(term in text for term in self.term_lists[name])
+    
+    def found_many(self, name, texts):
+        """found for many texts at once: a (len(texts), terms) bool array
+        
+        The texts are joined by NUL characters, which no term contains, and
+        every term is located with one regex scan of the joined string; the
+        offsets of its matches give the rows it occurs in. Each match runs
+        on to the next NUL, so a row yields at most one match (a row that
+        contains NUL itself may yield more, which only repeats its row).
+        """
+        terms = self.term_lists[name]
+        found = np.zeros((len(texts), len(terms)), dtype=bool)
+        if not texts:
+            return found
+        lengths = np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=len(texts))
+        row_starts = np.cumsum(lengths) - lengths
+        joined = '\0'.join(texts)
+        for k, term in enumerate(terms):
+            offsets = np.fromiter((match.start() for match in re.finditer(re.escape(term) + '[^\\0]*', joined)), dtype=np.int64)
+            found[np.searchsorted(row_starts, offsets, side='right') - 1, k] = True
+        return found
+    
+    def count_many(self, name, texts):
+        """count for many texts at once, as an int array"""
+        return self.found_many(name, texts).sum(axis=1)
+    
+    def counts(self, text, names):
+        """Per-list hit counts for several lists, searching shared terms once"""
+        names = tuple(names)
+        plan = self._plans.get(names)
+        if plan is None:
+            plan = self._plans[names] = self._plan(names)
+        terms, list_positions = plan
+        present = [term in text for term in terms]
+        return {name: sum(present[i] for i in positions) for name, positions in zip(names, list_positions)}
+    
+    def pattern_score(self, name, text):
+        """Sum of the weights of the list's patterns found in lowercased ``text``"""
+        use_regex = any(ch in text for ch in _EXTRA_CASE_FOLDS)
+        score = 0
+        for atoms, weight, regex in self.pattern_lists[name]:
+            if regex.search(text) if use_regex else self._ordered_on_one_line(text, atoms):
+                score += weight
+        return score
+    
+    def _plan(self, names):
+        terms = []
+        index = {}
+        list_positions = []
+        for name in names:
+            positions = []
+            for term in self.term_lists[name]:
+                if term not in index:
+                    index[term] = len(terms)
+                    terms.append(term)
+                positions.append(index[term])
+            list_positions.append(tuple(positions))
+        return tuple(terms), tuple(list_positions)
+    
+    @staticmethod
+    def _atoms(pattern):
+        atoms = tuple(atom.lower() for atom in pattern.split('.*'))
+        for atom in atoms:
+            if not atom or any(ch in '.^$*+?{}[]\\|()\n' for ch in atom):
+                raise ValueError(f"Pattern {pattern!r} is not a sequence of literals joined by '.*'")
+        return atoms
+    
+    @staticmethod
+    def _ordered_on_one_line(text, atoms):
+        """True if the atoms occur in order, without overlap, on one line
+        
+        Taking the earliest match of every atom is optimal, so each line is
+        settled by one find per atom.
+        """
+        first = atoms[0]
+        start = 0
+        while True:
+            position = text.find(first, start)
+            if position < 0:
+                return False
+            line_end = text.find('\n', position)
+            if line_end < 0:
+                line_end = len(text)
+            position += len(first)
+            for atom in atoms[1:]:
+                position = text.find(atom, position, line_end)
+                if position < 0:
+                    break
+                position += len(atom)
+            else:
+                return True
+            start = line_end + 1
+
+TEXT_MATCHER = TermMatcher(
+    term_lists={
+        # TextAnalyzer
+        'technical_terms': [
+            'neural', 'algorithm', 'model', 'training', 'inference',
+            'parameter', 'topology', 'activation', 'backpropagation',
+            'transformer', 'diffusion', 'latent', 'embedding'
+        ],
+        'creative_words': ['beautiful', 'amazing', 'stunning', 'creative', 'artistic', 'aesthetic'],
+        'ai_tools': [
+            'midjourney', 'dall-e', 'stable diffusion', 'chatgpt', 'gpt-4',
+            'runway ml', 'leonardo ai', 'bluewillow', 'nightcafe',
+            'dream studio', 'novelai', 'playground ai'
+        ],
+        # MetadataAnalyzer
+        'ai_tags': [
+            'aiart', 'ai generated', 'neuralart', 'generativeai',
+            'machinelearning', 'artificialintelligence', 'digitalart',
+            'ai', 'neuralnetwork', 'stablediffusion', 'midjourney'
+        ],
+        'channel_terms': ['ai', 'artificial', 'neural', 'machine learning', 'tech'],
+        # AdvancedAIAnalyzer
+        'ai_phrases': [
+            'created with ai', 'generated by', 'ai tool', 'neural network',
+            'machine learning model', 'synthetic media', 'deepfake',
+            'gan generated', 'diffusion model', 'prompt engineering'
+        ],
+        'sensational_words': ['SHOCKING', 'AMAZING', 'INCREDIBLE', 'MIND-BLOWING', 'UNBELIEVABLE', 'BREAKING'],  # uppercased title
+        'ai_channel_indicators': ['ai', 'artificial', 'neural', 'machine learning', 'tech', 'future', 'digital art'],
+        'ai_terms': ['ai', 'artificial', 'generated', 'neural', 'machine learning'],
+        'fallback_channel_terms': ['ai', 'artificial', 'neural']
+    },
+    pattern_lists={
+        'text_patterns': [
+            (r'AI.*generat', 0.3),
+            (r'created.*by.*AI', 0.4),
+            (r'neural.*network', 0.3),
+            (r'machine.*learn', 0.3),
+            (r'prompt.*engineer', 0.4),
+            (r'this.*AI.*created', 0.4),
+            (r'100%.*AI', 0.5)
+        ],
+        'fallback_patterns': [
+            (r'AI.*generated', 3), (r'created.*AI', 3), (r'neural.*network', 2),
+            (r'machine.*learning', 2), (r'synthetic.*media', 3), (r'deepfake', 4),
+            (r'GAN', 3), (r'diffusion.*model', 3), (r'prompt.*engineering', 3),
+            (r'AI.*art', 2), (r'artificial.*intelligence', 2)
+        ]
+    }
+)
\ No newline at end of file
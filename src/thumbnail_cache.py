@@ -0,0 +1,90 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from http_transport import get_transport
+from utils import write_atomic
+
+class ThumbnailFetcher:
+    """Downloads thumbnails ahead of analysis into a content-addressed disk cache
+    
+    Image bytes are stored once under the SHA-256 of their content
+    (``objects/``), and each URL points at its content hash (``urls/``), so
+    re-runs and thumbnails shared between URLs are never downloaded twice.
+    """
+    
+    def __init__(self, transport=None, cache_dir=None, max_workers=None):
+        self.transport = transport or get_transport()
+        self.cache_dir = cache_dir or Config.THUMBNAIL_CACHE_DIR
+        self.max_workers = max_workers or Config.THUMBNAIL_WORKERS
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix='thumbnail-fetch')
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        # Recording needs every thumbnail to go over the wire
+        self.read_cache = not Config.RECORD_FIXTURES_DIR
+        self.downloads = 0
+        self.cache_hits = 0
+    
+    def prefetch(self, url):
+        """Start downloading a thumbnail in the background"""
+        if not url:
+            return
+        with self._lock:
+            if url not in self._in_flight:
+                self._in_flight[url] = self._executor.submit(self._fetch, url)
+    
+    def get(self, url):
+        """Return thumbnail bytes, waiting for a prefetch if one is running"""
+        if not url:
+            return None
+        with self._lock:
+            future = self._in_flight.pop(url, None)
+        if future is not None:
+            return future.result()
+        return self._fetch(url)
+    
+    def close(self):
+        self._executor.shutdown(wait=False)
+    
+    def _fetch(self, url):
+        data = self._read_cached(url) if self.read_cache else None
+        if data is not None:
+            with self._lock:
+                self.cache_hits += 1
+            return data
+        
+        response = self.transport.get(url)
+        response.raise_for_status()
+        data = response.content
+        with self._lock:
+            self.downloads += 1
+        self._store(url, data)
+        return data
+    
+    def _url_path(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, 'urls', key[:2], key)
+    
+    def _object_path(self, content_hash):
+        return os.path.join(self.cache_dir, 'objects', content_hash[:2], content_hash)
+    
+    def _read_cached(self, url):
+        try:
+            with open(self._url_path(url), encoding='ascii') as f:
+                content_hash = f.read().strip()
+            with open(self._object_path(content_hash), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def _store(self, url, data):
+        content_hash = hashlib.sha256(data).hexdigest()
+        try:
+            object_path = self._object_path(content_hash)
+            if not os.path.exists(object_path):
+                write_atomic(object_path, data)
+            write_atomic(self._url_path(url), content_hash.encode('ascii'))
+        except OSError as e:
+            print(f"Could not cache thumbnail: {e}")
\ No newline at end of file
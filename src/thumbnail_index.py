@@ -0,0 +1,181 @@
+import json
+import threading
+from PIL import Image
+import numpy as np
+from config import Config
+from utils import write_atomic
+
+def dhash(img, hash_size=8):
+    """64-bit difference hash of a decoded image
+    
+    The image is reduced to a (hash_size + 1) x hash_size grayscale grid and
+    each bit records whether brightness increases left to right, so
+    re-encodes, rescales and small edits change only a few bits.
+    """
+    gray = np.asarray(img.convert('L').resize((hash_size + 1, hash_size), Image.BOX), dtype=np.int16)
+    bits = gray[:, 1:] > gray[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+class MultiIndexHash:
+    """Hamming-radius search over integer hashes by multi-index hashing
+    
+    Each hash is split into ``radius + 1`` disjoint bit chunks and filed
+    under every chunk value. Two hashes within ``radius`` bits must agree
+    exactly on at least one chunk, so a search only verifies the entries
+    sharing a chunk with the query instead of scanning the whole index.
+    """
+    
+    def __init__(self, radius, bits=64):
+        self.radius = radius
+        chunks = min(radius + 1, bits)
+        bounds = [bits * i // chunks for i in range(chunks + 1)]
+        self._chunks = [(low, (1 << (high - low)) - 1) for low, high in zip(bounds, bounds[1:])]
+        self._tables = [{} for _ in self._chunks]
+        self._entries = []  # (hash, item)
+    
+    def add(self, hash_value, item):
+        position = len(self._entries)
+        self._entries.append((hash_value, item))
+        for table, (shift, mask) in zip(self._tables, self._chunks):
+            table.setdefault((hash_value >> shift) & mask, []).append(position)
+    
+    def search(self, hash_value, radius=None):
+        """All (distance, hash, item) within ``radius`` (at most the index radius)"""
+        radius = self.radius if radius is None else min(radius, self.radius)
+        candidates = set()
+        for table, (shift, mask) in zip(self._tables, self._chunks):
+            candidates.update(table.get((hash_value >> shift) & mask, ()))
+        
+        matches = []
+        for position in candidates:
+            entry_hash, item = self._entries[position]
+            distance = hamming_distance(hash_value, entry_hash)
+            if distance <= radius:
+                matches.append((distance, entry_hash, item))
+        return matches
+    
+    def __len__(self):
+        return len(self._entries)
+
+class ThumbnailIndex:
+    """Persistent perceptual-hash index of scored thumbnails
+    
+    Thumbnails are keyed by URL and stored with their dHash and score. A
+    thumbnail within ``radius`` bits of an indexed one is a near-duplicate
+    and reuses its score. Near-duplicate clusters across all runs are
+    exposed as a signal of reused (content-farm) artwork. Scores depend on
+    the analysis resolution, so an index built at another
+    Config.THUMBNAIL_ANALYSIS_SIZE is discarded on load.
+    """
+    
+    def __init__(self, path=None, radius=None):
+        self.path = path or Config.THUMBNAIL_INDEX_PATH
+        self.radius = Config.THUMBNAIL_HASH_RADIUS if radius is None else radius
+        self.analysis_size = list(Config.THUMBNAIL_ANALYSIS_SIZE)
+        self.table = MultiIndexHash(self.radius)
+        self._entries = {}  # url -> (hash, score)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+    
+    def lookup(self, hash_value):
+        """(url, score) of the closest indexed near-duplicate, or None"""
+        matches = self._search(hash_value, self.radius)
+        if not matches:
+            return None
+        _, url, score = min(matches, key=lambda match: match[0])
+        return url, score
+    
+    def add(self, hash_value, url, score):
+        with self._lock:
+            if self._entries.get(url, (None,))[0] != hash_value:
+                self.table.add(hash_value, url)
+            self._entries[url] = (hash_value, score)
+            self._dirty = True
+    
+    def duplicate_count(self, url):
+        """Number of other indexed thumbnails that are near-duplicates of ``url``"""
+        entry = self._entries.get(url)
+        if entry is None:
+            return 0
+        return sum(1 for _, match_url, _ in self._search(entry[0], self.radius) if match_url != url)
+    
+    def clusters(self, min_size=2):
+        """Groups of near-duplicate thumbnail URLs, largest first
+        
+        Clusters are the connected components of the "within radius" graph,
+        so chains of small edits end up in one cluster.
+        """
+        parent = {url: url for url in self._entries}
+        
+        def find(url):
+            while parent[url] != url:
+                parent[url] = parent[parent[url]]
+                url = parent[url]
+            return url
+        
+        for url, (hash_value, _) in self._entries.items():
+            for _, match_url, _ in self._search(hash_value, self.radius):
+                parent[find(match_url)] = find(url)
+        
+        groups = {}
+        for url in self._entries:
+            groups.setdefault(find(url), []).append(url)
+        clusters = [sorted(group) for group in groups.values() if len(group) >= min_size]
+        return sorted(clusters, key=len, reverse=True)
+    
+    def save(self):
+        """Write the index atomically if it changed"""
+        if not self._dirty:
+            return
+        with self._lock:
+            data = {
+                'analysis_size': self.analysis_size,
+                'entries': [[f"{hash_value:016x}", url, score]
+                            for url, (hash_value, score) in self._entries.items()]
+            }
+            self._dirty = False
+        try:
+            write_atomic(self.path, json.dumps(data))
+        except OSError as e:
+            print(f"Could not write thumbnail index: {e}")
+    
+    def _search(self, hash_value, radius):
+        """Current (distance, url, score) matches; nodes left behind by changed thumbnails are skipped"""
+        with self._lock:
+            matches = self.table.search(hash_value, radius)
+            return [(distance, url, self._entries[url][1])
+                    for distance, node_hash, url in matches
+                    if self._entries[url][0] == node_hash]
+    
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('analysis_size') != self.analysis_size:
+            return
+        for hash_hex, url, score in data.get('entries', []):
+            hash_value = int(hash_hex, 16)
+            self.table.add(hash_value, url)
+            self._entries[url] = (hash_value, score)
+    
+    def __len__(self):
+        return len(self._entries)
+
+_shared_index = None
+_shared_lock = threading.Lock()
+
+def get_thumbnail_index():
+    """Return the process-wide thumbnail index, or None when it is disabled"""
+    global _shared_index
+    if not Config.THUMBNAIL_INDEX_ENABLED:
+        return None
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = ThumbnailIndex()
+        return _shared_index
\ No newline at end of file
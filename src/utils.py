@@ -1,9 +1,9 @@
 import pandas as pd
 import json
 import os
+import tempfile
 from datetime import datetime
 import numpy as np
-from visualizer import ResultsVisualizer
 
 def save_enhanced_results(results, filename=None):
     """Save results with enhanced formatting and visualization"""
@@ -13,7 +13,9 @@ def save_enhanced_results(results, filename=None):
     
     os.makedirs('results', exist_ok=True)
     
-    # Create visualizer instance
+    # Create visualizer instance (imported here so the cache modules that
+    # use write_atomic do not pull in plotly)
+    from visualizer import ResultsVisualizer
     visualizer = ResultsVisualizer()
     
     # Print beautiful console output
@@ -38,6 +40,7 @@ def save_enhanced_results(results, filename=None):
             'advanced_score': result.get('advanced_score', 0),
             'ensemble_score': result.get('ensemble_score', 0),
             'content_score': result.get('content_score', 0),
+            'cascade_stage': result.get('cascade_stage'),
             'analysis_time': result.get('analysis_time'),
             'ai_category': get_ai_category(result.get('final_ai_score', 0))
         }
@@ -83,6 +86,29 @@ def get_ai_category(score):
     else:
         return "VERY_LOW"
 
+def write_atomic(path, data):
+    """Replace ``path`` with ``data`` (bytes or text, written as UTF-8)
+    
+    The data goes to a temporary file in the same directory that is then
+    renamed over ``path``, so readers never see a partial file. Raises
+    OSError; the temporary file is removed on failure.
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
 def convert_numpy_types(obj):
     """Convert numpy types to Python native types for JSON serialization"""
     if isinstance(obj, (np.integer, np.floating)):
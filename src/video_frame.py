@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+from text_context import TextContext
+
+# Columns of a video batch; stats are flattened into integer columns
+TEXT_COLUMNS = ['video_id', 'title', 'description', 'channel_title', 'channel_id',
+                'published_at', 'category_id', 'thumbnail_url', 'duration']
+STAT_COLUMNS = {'viewCount': 'view_count', 'likeCount': 'like_count',
+                'commentCount': 'comment_count', 'favoriteCount': 'favorite_count'}
+
+def videos_to_frame(videos, channel_contexts=None):
+    """Columnar batch of feature dicts as built by extract_video_features
+    
+    One row per video. Tags, the shared TextContext and the optional
+    channel upload history (one entry per video, as passed to the
+    analyzers) are kept as object columns.
+    """
+    frame = pd.DataFrame({
+        column: pd.Series([video.get(column, '') for video in videos], dtype=object)
+        for column in TEXT_COLUMNS
+    })
+    frame['tags'] = pd.Series([video.get('tags', []) for video in videos], dtype=object)
+    for key, column in STAT_COLUMNS.items():
+        frame[column] = np.array([video.get('stats', {}).get(key, 0) for video in videos], dtype=np.int64)
+    frame['text_context'] = pd.Series([
+        video.get('text_context') or TextContext.from_video(video) for video in videos
+    ], dtype=object)
+    if channel_contexts is None:
+        channel_contexts = [None] * len(videos)
+    frame['channel_context'] = pd.Series(list(channel_contexts), dtype=object)
+    return frame
\ No newline at end of file
@@ -1,119 +1,354 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import time
 from config import Config
+from http_transport import get_transport
+from quota_scheduler import get_scheduler
+from response_cache import get_response_cache
+
+# videos.list accepts at most 50 comma-separated IDs per call, and list
+# endpoints return at most 50 items per page
+MAX_IDS_PER_REQUEST = 50
+MAX_RESULTS_PER_PAGE = 50
+
+# Partial-response masks: only the fields extract_video_features and
+# _enhance_video_data actually read are sent over the wire
+VIDEO_PARTS = 'snippet,statistics,contentDetails'
+VIDEO_ITEM_FIELDS = (
+    'items(id,'
+    'snippet(title,description,channelTitle,channelId,publishedAt,tags,categoryId,thumbnails),'
+    'statistics(viewCount,likeCount,commentCount,favoriteCount),'
+    'contentDetails(duration))'
+)
+VIDEO_FIELDS = f'{VIDEO_ITEM_FIELDS},nextPageToken'
+# Nominal thumbnail sizes, used when the API omits width/height
+THUMBNAIL_SIZES = {
+    'default': (120, 90),
+    'medium': (320, 180),
+    'high': (480, 360),
+    'standard': (640, 480),
+    'maxres': (1280, 720)
+}
+
+SEARCH_FIELDS = 'items(id(videoId)),nextPageToken'
+CHANNEL_UPLOADS_FIELDS = 'items(id,contentDetails(relatedPlaylists(uploads)))'
+PLAYLIST_ITEM_FIELDS = 'items(contentDetails(videoId,videoPublishedAt)),nextPageToken'
 
 class YouTubeClient:
-    def __init__(self):
+    def __init__(self, transport=None, base_url=None, scheduler=None, cache=None):
         self.api_key = Config.YOUTUBE_API_KEY
-        self.base_url = "https://www.googleapis.com/youtube/v3"
+        self.base_url = base_url or Config.YOUTUBE_API_BASE_URL
+        self.transport = transport or get_transport()
+        self.scheduler = scheduler or get_scheduler()
+        self.cache = cache if cache is not None else get_response_cache()
     
     def get_trending_videos(self, max_results=50):
         """Get currently popular videos with enhanced data"""
-        url = f"{self.base_url}/videos"
+        return list(self.iter_trending_videos(max_results))
+    
+    def iter_trending_videos(self, max_results=None):
+        """Yield popular videos page by page, following nextPageToken
+        
+        The next page is requested in the background while the caller works
+        through the current one; at most ``max_results`` videos are yielded
+        (default Config.MAX_VIDEOS).
+        """
         params = {
-            'part': 'snippet,statistics,contentDetails',
+            'part': VIDEO_PARTS,
+            'fields': VIDEO_FIELDS,
             'chart': 'mostPopular',
-            'maxResults': max_results,
-            'key': self.api_key,
             'regionCode': 'US'
         }
         
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            videos = response.json().get('items', [])
-            
+        for page in self._iter_pages('videos', params, max_results, "Error fetching videos"):
             # Enhance video data with additional info
-            enhanced_videos = []
-            for video in videos:
-                enhanced_video = self._enhance_video_data(video)
-                enhanced_videos.append(enhanced_video)
-            
-            return enhanced_videos
-        except requests.RequestException as e:
-            print(f"Error fetching videos: {e}")
-            return []
+            for video in page:
+                yield self._enhance_video_data(video)
     
     def search_ai_videos(self, query="AI generated", max_results=25):
         """Search for videos with AI-related terms"""
-        url = f"{self.base_url}/search"
-        params = {
-            'part': 'snippet',
-            'q': query,
-            'type': 'video',
-            'order': 'viewCount',
-            'maxResults': max_results,
-            'key': self.api_key
-        }
+        return list(self.iter_search_videos(query, max_results))
+    
+    def iter_search_videos(self, query="AI generated", max_results=None):
+        """Yield detailed search results page by page, following nextPageToken"""
+        params = self._ai_search_params(query)
         
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            search_results = response.json().get('items', [])
-            
-            # Get detailed information for each video
-            detailed_videos = []
-            for item in search_results:
-                video_id = item['id']['videoId']
-                detailed_video = self.get_video_details(video_id)
-                if detailed_video:
-                    detailed_videos.append(detailed_video)
-            
-            return detailed_videos
-        except requests.RequestException as e:
-            print(f"Error searching videos: {e}")
-            return []
+        for video_ids in self._iter_search_id_pages(params, max_results, "Error searching videos"):
+            # Get detailed information for the whole page in batched calls
+            detailed_videos, _ = self.get_videos_details(video_ids)
+            yield from detailed_videos
+    
+    def iter_candidate_videos(self, max_results=None, query="AI generated", buffer_size=MAX_RESULTS_PER_PAGE):
+        """Stream unique trending and AI-search videos as their pages arrive
+        
+        Both feeds are paged concurrently on background threads into a
+        bounded buffer, so memory stays constant however large the crawl.
+        At most ``max_results`` unique videos are yielded (default
+        Config.MAX_VIDEOS); each feed is capped at the same number.
+        """
+        max_results = max_results or Config.MAX_VIDEOS
+        streams = [
+            lambda: self.iter_trending_videos(max_results),
+            lambda: self.iter_search_videos(query, max_results)
+        ]
+        
+        seen_ids = set()
+        for video in _merge_streams(streams, buffer_size):
+            video_id = video.get('id')
+            if not video_id or video_id in seen_ids:
+                continue
+            seen_ids.add(video_id)
+            yield video
+            if len(seen_ids) >= max_results:
+                return
+    
+    def get_quota_metrics(self):
+        """Remaining daily quota and per-endpoint usage"""
+        return self.scheduler.get_metrics()
     
     def get_video_details(self, video_id):
         """Get detailed information for a specific video"""
-        url = f"{self.base_url}/videos"
-        params = {
-            'part': 'snippet,statistics,contentDetails',
-            'id': video_id,
-            'key': self.api_key
-        }
+        videos, _ = self.get_videos_details([video_id])
+        return videos[0] if videos else None
+    
+    def get_videos_details(self, video_ids):
+        """Get detailed information for many videos, 50 IDs per request
         
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            items = response.json().get('items', [])
-            return items[0] if items else None
-        except requests.RequestException as e:
-            print(f"Error getting video details: {e}")
-            return None
+        Returns a tuple of (videos, missing_ids). Videos keep the order of
+        ``video_ids`` (duplicates are fetched once); missing_ids lists the IDs
+        the API did not return, e.g. deleted or private videos.
+        """
+        unique_ids = list(dict.fromkeys(vid for vid in video_ids if vid))
+        
+        found = {}
+        for start in range(0, len(unique_ids), MAX_IDS_PER_REQUEST):
+            chunk = unique_ids[start:start + MAX_IDS_PER_REQUEST]
+            params = {
+                'part': VIDEO_PARTS,
+                'fields': VIDEO_ITEM_FIELDS,
+                'id': ','.join(chunk)
+            }
+            
+            try:
+                for item in self._get_json('videos', params).get('items', []):
+                    found[item.get('id')] = self._enhance_video_data(item)
+            except requests.RequestException as e:
+                print(f"Error getting video details: {e}")
+        
+        videos = [found[vid] for vid in unique_ids if vid in found]
+        missing_ids = [vid for vid in unique_ids if vid not in found]
+        return videos, missing_ids
     
     def get_channel_videos(self, channel_id, max_results=20):
-        """Get recent videos from a channel for context"""
-        url = f"{self.base_url}/search"
+        """Get recent videos from a channel for context
+        
+        Reads the channel's uploads playlist (1 quota unit per page) instead
+        of search.list (100 units).
+        """
+        playlist_id = self.get_uploads_playlist_ids([channel_id]).get(channel_id)
+        if not playlist_id:
+            return []
+        
+        video_ids = [item['video_id'] for item in self.iter_playlist_uploads(playlist_id, max_results)]
+        channel_videos, _ = self.get_videos_details(video_ids)
+        return channel_videos
+    
+    def get_uploads_playlist_ids(self, channel_ids):
+        """Map channel IDs to their uploads playlist, 50 channels per request"""
+        unique_ids = list(dict.fromkeys(cid for cid in channel_ids if cid))
+        
+        playlists = {}
+        for start in range(0, len(unique_ids), MAX_IDS_PER_REQUEST):
+            chunk = unique_ids[start:start + MAX_IDS_PER_REQUEST]
+            params = {
+                'part': 'contentDetails',
+                'fields': CHANNEL_UPLOADS_FIELDS,
+                'id': ','.join(chunk)
+            }
+            
+            try:
+                for item in self._get_json('channels', params).get('items', []):
+                    uploads = item.get('contentDetails', {}).get('relatedPlaylists', {}).get('uploads')
+                    if uploads:
+                        playlists[item.get('id')] = uploads
+            except requests.RequestException as e:
+                print(f"Error getting channel playlists: {e}")
+        
+        return playlists
+    
+    def iter_playlist_uploads(self, playlist_id, max_results=None, raise_errors=False):
+        """Yield {'video_id', 'published_at'} for a playlist, newest upload first
+        
+        A failed page ends the stream early, or with ``raise_errors`` raises
+        its RequestException (including QuotaDeferred) so callers can tell a
+        partial history from a complete one.
+        """
         params = {
+            'part': 'contentDetails',
+            'fields': PLAYLIST_ITEM_FIELDS,
+            'playlistId': playlist_id
+        }
+        
+        for page in self._iter_pages('playlistItems', params, max_results, "Error getting playlist items",
+                                     raise_errors):
+            for item in page:
+                details = item.get('contentDetails', {})
+                if details.get('videoId'):
+                    yield {
+                        'video_id': details['videoId'],
+                        'published_at': details.get('videoPublishedAt', '')
+                    }
+    
+    def _ai_search_params(self, query):
+        return {
             'part': 'snippet',
-            'channelId': channel_id,
+            'fields': SEARCH_FIELDS,
+            'q': query,
             'type': 'video',
-            'order': 'date',
-            'maxResults': max_results,
-            'key': self.api_key
+            'order': 'viewCount'
         }
+    
+    def _iter_search_id_pages(self, params, max_results, error_message):
+        for page in self._iter_pages('search', params, max_results, error_message):
+            yield [item['id']['videoId'] for item in page]
+    
+    def _iter_pages(self, endpoint, params, max_results, error_message, raise_errors=False):
+        """Yield lists of items from a paged endpoint, prefetching the next page"""
+        remaining = max_results or Config.MAX_VIDEOS
         
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json().get('items', [])
-        except requests.RequestException as e:
-            print(f"Error getting channel videos: {e}")
-            return []
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='youtube-prefetch') as prefetcher:
+            future = prefetcher.submit(self._get_page, endpoint, params, None, remaining)
+            while future is not None:
+                try:
+                    page = future.result()
+                except requests.RequestException as e:
+                    if raise_errors:
+                        raise
+                    print(f"{error_message}: {e}")
+                    return
+                
+                items = page.get('items', [])[:remaining]
+                remaining -= len(items)
+                next_token = page.get('nextPageToken')
+                
+                # Start fetching the next page before handing this one out
+                future = None
+                if next_token and items and remaining > 0:
+                    future = prefetcher.submit(self._get_page, endpoint, params, next_token, remaining)
+                
+                yield items
+    
+    def _get_page(self, endpoint, params, page_token, remaining):
+        page_params = {**params, 'maxResults': min(remaining, MAX_RESULTS_PER_PAGE)}
+        if page_token:
+            page_params['pageToken'] = page_token
+        return self._get_json(endpoint, page_params)
+    
+    def _get_json(self, endpoint, params):
+        """Call an API endpoint through the shared transport and decode the body
+        
+        Fresh cached responses are returned without a request; stale ones are
+        revalidated with If-None-Match and reused on 304 Not Modified.
+        """
+        cached = self.cache.get(endpoint, params) if self.cache else None
+        if cached and self.cache.is_fresh(cached, endpoint, params):
+            self.cache.record('hits')
+            return cached['body']
+        
+        headers = None
+        if cached and cached.get('etag'):
+            headers = {'If-None-Match': cached['etag']}
+        
+        self.scheduler.acquire(endpoint)
+        url = f"{self.base_url}/{endpoint}"
+        response = self.transport.get(url, params={**params, 'key': self.api_key}, headers=headers)
+        
+        if response.status_code == 304 and cached:
+            self.cache.record('revalidated')
+            self.cache.touch(endpoint, params, cached)
+            return cached['body']
+        
+        response.raise_for_status()
+        body = response.json()
+        if self.cache:
+            self.cache.record('misses')
+            self.cache.put(endpoint, params, body, response.headers.get('ETag'))
+        return body
     
     def _enhance_video_data(self, video):
         """Add thumbnail URL and other enhancements to video data"""
         snippet = video.get('snippet', {})
         
-        # Add thumbnail URL (highest quality available)
+        # Add thumbnail URL (smallest variant that covers the analysis size)
         thumbnails = snippet.get('thumbnails', {})
-        thumbnail_url = ''
-        for quality in ['maxres', 'standard', 'high', 'medium', 'default']:
-            if quality in thumbnails:
-                thumbnail_url = thumbnails[quality]['url']
-                break
-        
-        # Add thumbnail URL to video data
-        video['thumbnail_url'] = thumbnail_url
-        return video
\ No newline at end of file
+        video['thumbnail_url'] = select_thumbnail_url(thumbnails, Config.THUMBNAIL_ANALYSIS_SIZE)
+        return video
+
+def select_thumbnail_url(thumbnails, min_size):
+    """Pick the smallest thumbnail at least ``min_size`` (width, height)
+    
+    Falls back to the largest variant when none is big enough.
+    """
+    variants = []
+    for quality, thumbnail in thumbnails.items():
+        if not thumbnail.get('url'):
+            continue
+        default_size = THUMBNAIL_SIZES.get(quality, (0, 0))
+        width = thumbnail.get('width') or default_size[0]
+        height = thumbnail.get('height') or default_size[1]
+        variants.append((width * height, width, height, thumbnail['url']))
+    
+    if not variants:
+        return ''
+    
+    min_width, min_height = min_size
+    large_enough = [v for v in variants if v[1] >= min_width and v[2] >= min_height]
+    if large_enough:
+        return min(large_enough)[3]
+    return max(variants)[3]
+
+def _merge_streams(stream_factories, buffer_size):
+    """Drain several iterators concurrently into one bounded stream
+    
+    Each factory is called on its own daemon thread; producers block once
+    ``buffer_size`` items are waiting, and stop early if the consumer
+    abandons the merged generator.
+    """
+    buffer = queue.Queue(maxsize=buffer_size)
+    stop = threading.Event()
+    finished = object()
+    
+    def put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce(make_stream):
+        try:
+            for item in make_stream():
+                if not put(item):
+                    break
+        except Exception as e:
+            print(f"Error streaming videos: {e}")
+        finally:
+            put(finished)
+    
+    for make_stream in stream_factories:
+        threading.Thread(target=produce, args=(make_stream,), daemon=True).start()
+    
+    active = len(stream_factories)
+    try:
+        while active:
+            item = buffer.get()
+            if item is finished:
+                active -= 1
+                continue
+            yield item
+    finally:
+        stop.set()
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules in src/ are imported flat, as the entry points do
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
\ No newline at end of file
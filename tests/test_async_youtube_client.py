@@ -0,0 +1,122 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from async_youtube_client import AsyncYouTubeClient
+from quota_scheduler import QuotaScheduler
+from replay import StubYouTubeServer
+from response_cache import request_key
+from youtube_client import SEARCH_FIELDS, VIDEO_FIELDS, VIDEO_ITEM_FIELDS, VIDEO_PARTS
+
+TRENDING = {'part': VIDEO_PARTS, 'fields': VIDEO_FIELDS, 'chart': 'mostPopular', 'regionCode': 'US'}
+SEARCH = {'part': 'snippet', 'fields': SEARCH_FIELDS, 'q': 'AI generated', 'type': 'video', 'order': 'viewCount'}
+
+def video(video_id):
+    return {'id': video_id, 'snippet': {'title': f'Video {video_id}', 'thumbnails': {}}}
+
+def write_fixture(fixtures_dir, endpoint, params, body):
+    path = os.path.join(fixtures_dir, 'api', endpoint, f"{request_key(endpoint, params)}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'endpoint': endpoint, 'params': params, 'etag': None, 'body': body}, f)
+
+def details(fixtures_dir, ids, found=None):
+    items = [video(vid) for vid in (ids if found is None else found)]
+    write_fixture(fixtures_dir, 'videos', {'part': VIDEO_PARTS, 'fields': VIDEO_ITEM_FIELDS, 'id': ','.join(ids)},
+                  {'items': items})
+
+@pytest.fixture
+def stub(tmp_path):
+    fixtures = str(tmp_path)
+    # Trending: two pages of three videos
+    write_fixture(fixtures, 'videos', {**TRENDING, 'maxResults': 3},
+                  {'items': [video('t1'), video('shared')], 'nextPageToken': 'page2'})
+    write_fixture(fixtures, 'videos', {**TRENDING, 'maxResults': 1, 'pageToken': 'page2'}, {'items': [video('t2')]})
+    # Search: one page of IDs, then their details
+    write_fixture(fixtures, 'search', {**SEARCH, 'maxResults': 3},
+                  {'items': [{'id': {'videoId': vid}} for vid in ('s1', 'shared', 's2')]})
+    details(fixtures, ['s1', 'shared', 's2'])
+    with StubYouTubeServer(fixtures) as server:
+        yield server, fixtures
+
+def client(server, concurrency=4):
+    scheduler = QuotaScheduler(daily_budget=10000, rate_limit=10000, state_path='')
+    return AsyncYouTubeClient(concurrency=concurrency, base_url=server.base_url, scheduler=scheduler, cache=False)
+
+def ids(videos):
+    return [v['id'] for v in videos]
+
+def test_trending_follows_next_page_token(stub):
+    server, _ = stub
+    async def run():
+        async with client(server) as youtube:
+            listed = await youtube.get_trending_videos(max_results=3)
+            streamed = [v async for v in youtube.iter_trending_videos(max_results=3)]
+            return listed, streamed
+    listed, streamed = asyncio.run(run())
+    
+    assert ids(listed) == ids(streamed) == ['t1', 'shared', 't2']
+
+def test_search_returns_detailed_videos_in_order(stub):
+    server, _ = stub
+    async def run():
+        async with client(server) as youtube:
+            return await youtube.search_ai_videos(max_results=3)
+    
+    assert ids(asyncio.run(run())) == ['s1', 'shared', 's2']
+
+def test_fetch_candidate_videos_returns_both_feeds(stub):
+    server, _ = stub
+    async def run():
+        async with client(server) as youtube:
+            return await youtube.fetch_candidate_videos(trending_results=3, search_results=3)
+    trending, search = asyncio.run(run())
+    
+    assert ids(trending) == ['t1', 'shared', 't2']
+    assert ids(search) == ['s1', 'shared', 's2']
+
+def test_iter_candidate_videos_merges_unique_videos(stub):
+    server, _ = stub
+    async def run():
+        async with client(server) as youtube:
+            return [v async for v in youtube.iter_candidate_videos(max_results=3)]
+    merged = asyncio.run(run())
+    
+    assert len(merged) == 3 and len(set(ids(merged))) == 3
+    assert set(ids(merged)) <= {'t1', 't2', 's1', 's2', 'shared'}
+
+def test_abandoning_iter_candidate_videos_stops_the_feeds(stub):
+    server, _ = stub
+    async def run():
+        async with client(server) as youtube:
+            stream = youtube.iter_candidate_videos(max_results=3, buffer_size=1)
+            first = await stream.__anext__()
+            await stream.aclose()
+            return first
+    
+    assert asyncio.run(run())['id'] in {'t1', 't2', 's1', 's2', 'shared'}
+
+def test_videos_details_chunks_are_fetched_concurrently(stub):
+    server, fixtures = stub
+    wanted = [f'v{i}' for i in range(120)]
+    details(fixtures, wanted[:50])
+    details(fixtures, wanted[50:100], found=wanted[50:99])
+    details(fixtures, wanted[100:])
+    async def run():
+        async with client(server, concurrency=3) as youtube:
+            return await youtube.get_videos_details(wanted + wanted[:5] + [''])
+    videos, missing = asyncio.run(run())
+    
+    assert ids(videos) == [vid for vid in wanted if vid != 'v99']
+    assert missing == ['v99']
+
+def test_calls_are_charged_to_the_quota(stub):
+    server, _ = stub
+    async def run():
+        async with client(server) as youtube:
+            await youtube.fetch_candidate_videos(trending_results=3, search_results=3)
+            return youtube.get_quota_metrics()
+    
+    assert asyncio.run(run())['used_by_endpoint'] == {'videos': 3, 'search': 100}
\ No newline at end of file
@@ -0,0 +1,102 @@
+import pytest
+
+from config import Config
+from enhanced_main import EnhancedAIDetector, analyze_chunk, extract_video_features
+
+class StubContentAnalyzer:
+    """Scores every thumbnail 0.2; like ContentAnalyzer, a missing URL scores 0.5"""
+    
+    def __init__(self):
+        self.analyzed = []
+    
+    def analyze_thumbnails_batch(self, thumbnail_urls):
+        self.analyzed.extend(url for url in thumbnail_urls if url)
+        return [0.2 if url else 0.5 for url in thumbnail_urls]
+    
+    def analyze_thumbnail(self, thumbnail_url):
+        self.analyzed.append(thumbnail_url)
+        return 0.2
+    
+    def thumbnail_duplicates(self, thumbnail_url):
+        return 0
+
+def make_videos(count):
+    return [extract_video_features({
+        'id': f'v{i}',
+        'thumbnail_url': f'http://thumbnails.test/{i}.jpg',
+        'snippet': {'title': f'AI generated video {i}', 'description': 'Made with Midjourney',
+                    'channelTitle': 'Channel', 'channelId': 'c1', 'publishedAt': '2024-01-01T00:00:00Z'},
+        'statistics': {'viewCount': 1000 + i, 'likeCount': 50, 'commentCount': 5}
+    }) for i in range(count)]
+
+def run(detector, videos):
+    return analyze_chunk(detector, list(range(1, len(videos) + 1)), videos, [None] * len(videos), len(videos))
+
+@pytest.fixture
+def detector(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'ML_MODEL_PATH', str(tmp_path / 'model.joblib'))
+    monkeypatch.setattr(Config, 'ML_FOREST_PATH', str(tmp_path / 'model.forest'))
+    monkeypatch.setattr(Config, 'FEATURE_STORE_ENABLED', False)
+    monkeypatch.setattr(Config, 'THUMBNAIL_INDEX_ENABLED', False)
+    monkeypatch.setattr(Config, 'CASCADE_ENABLED', True)
+    # Every video stays undecided until its thumbnail is scored
+    monkeypatch.setattr(Config, 'CASCADE_EXIT_MARGIN', 0.0)
+    monkeypatch.setattr(Config, 'CASCADE_BAND', 1.0)
+    detector = EnhancedAIDetector()
+    detector.content_analyzer.close()
+    detector.content_analyzer = StubContentAnalyzer()
+    return detector
+
+def test_undecided_videos_get_their_thumbnail_scored(detector):
+    videos = make_videos(6)
+    results = run(detector, videos)
+    
+    assert [result['cascade_stage'] for result in results] == ['content'] * 6
+    assert [result['content_score'] for result in results] == [0.2] * 6
+    assert sorted(detector.content_analyzer.analyzed) == sorted(video['thumbnail_url'] for video in videos)
+
+def test_failed_batch_model_call_still_scores_thumbnails(detector):
+    predict_many = detector.advanced_analyzer.predict_many
+    
+    def fail_on_batches(videos, channel_histories=None):
+        if len(videos) > 1:
+            raise RuntimeError("batch prediction failed")
+        return predict_many(videos, channel_histories)
+    detector.advanced_analyzer.predict_many = fail_on_batches
+    
+    videos = make_videos(6)
+    results = run(detector, videos)
+    # Withheld thumbnails are not scored as a 0.5 placeholder but by each video's retry
+    assert [result['content_score'] for result in results] == [0.2] * 6
+    assert sorted(detector.content_analyzer.analyzed) == sorted(video['thumbnail_url'] for video in videos)
+
+def test_failed_ensemble_of_one_video_only_affects_that_video(detector):
+    analyze_video = detector.ensemble_analyzer.analyze_video
+    calls = []
+    
+    def fail_first_call(video_data, channel_history=None):
+        calls.append(video_data['video_id'])
+        if len(calls) == 1:
+            raise RuntimeError("ensemble failed")
+        return analyze_video(video_data, channel_history)
+    detector.ensemble_analyzer.analyze_batch = lambda frame: (_ for _ in ()).throw(RuntimeError("batch failed"))
+    detector.ensemble_analyzer.analyze_video = fail_first_call
+    
+    results = run(detector, make_videos(4))
+    assert [result['content_score'] for result in results] == [0.2] * 4
+    assert [result['advanced_score'] is not None for result in results] == [True] * 4
+
+def test_decided_videos_skip_the_thumbnail(detector, monkeypatch):
+    monkeypatch.setattr(Config, 'CASCADE_EXIT_MARGIN', 0.5)
+    results = run(detector, make_videos(4))
+    
+    assert [result['cascade_stage'] for result in results] == ['ensemble'] * 4
+    assert [result['content_score'] for result in results] == [None] * 4
+    assert detector.content_analyzer.analyzed == []
+
+def test_full_mode_scores_every_thumbnail(detector, monkeypatch):
+    monkeypatch.setattr(Config, 'CASCADE_ENABLED', False)
+    results = run(detector, make_videos(4))
+    
+    assert [result['cascade_stage'] for result in results] == ['full'] * 4
+    assert [result['content_score'] for result in results] == [0.2] * 4
\ No newline at end of file
@@ -0,0 +1,79 @@
+import json
+
+from channel_history import ChannelHistoryCache, publish_hour_regularity, upload_consistency
+from quota_scheduler import QuotaDeferred
+
+def upload(number, hour=12):
+    return {'video_id': f'v{number}', 'published_at': f'2024-01-{number:02d}T{hour:02d}:00:00Z'}
+
+class FakeClient:
+    """Uploads playlist per channel, newest first; ``fail_after`` uploads then QuotaDeferred"""
+    
+    def __init__(self, uploads, fail_after=None):
+        self.uploads = uploads
+        self.fail_after = fail_after
+        self.playlist_calls = 0
+        self.page_calls = 0
+    
+    def get_uploads_playlist_ids(self, channel_ids):
+        self.playlist_calls += 1
+        return {cid: f'UU{cid}' for cid in channel_ids if cid in self.uploads}
+    
+    def iter_playlist_uploads(self, playlist_id, max_results=None, raise_errors=False):
+        self.page_calls += 1
+        for position, item in enumerate(self.uploads[playlist_id[2:]][:max_results]):
+            if self.fail_after is not None and position >= self.fail_after:
+                if raise_errors:
+                    raise QuotaDeferred("playlistItems.list deferred")
+                return
+            yield item
+
+def test_history_is_fetched_once_per_run_and_persisted(tmp_path):
+    client = FakeClient({'c1': [upload(3), upload(2), upload(1)]})
+    cache = ChannelHistoryCache(client, cache_dir=str(tmp_path), max_items=10, refresh_interval=3600)
+    
+    assert [item['video_id'] for item in cache.get_history('c1')] == ['v3', 'v2', 'v1']
+    cache.get_history('c1')
+    assert client.page_calls == 1
+    
+    # A fresh persisted entry is reused by the next run without any call
+    rerun = FakeClient({'c1': []})
+    assert len(ChannelHistoryCache(rerun, cache_dir=str(tmp_path), refresh_interval=3600).get_history('c1')) == 3
+    assert (rerun.playlist_calls, rerun.page_calls) == (0, 0)
+
+def test_refresh_prepends_only_new_uploads(tmp_path):
+    ChannelHistoryCache(FakeClient({'c1': [upload(2), upload(1)]}), cache_dir=str(tmp_path), max_items=3).get_history('c1')
+    
+    client = FakeClient({'c1': [upload(4), upload(3), upload(2), upload(1)]})
+    history = ChannelHistoryCache(client, cache_dir=str(tmp_path), max_items=3, refresh_interval=0).get_history('c1')
+    assert [item['video_id'] for item in history] == ['v4', 'v3', 'v2']
+    assert client.playlist_calls == 0
+
+def test_failed_refresh_is_not_saved(tmp_path):
+    ChannelHistoryCache(FakeClient({'c1': [upload(2), upload(1)]}), cache_dir=str(tmp_path)).get_history('c1')
+    saved = json.loads((tmp_path / 'c1.json').read_text())
+    
+    client = FakeClient({'c1': [upload(5), upload(4), upload(3), upload(2), upload(1)]}, fail_after=1)
+    history = ChannelHistoryCache(client, cache_dir=str(tmp_path), refresh_interval=0).get_history('c1')
+    # The stored history is served as it was, and retried on the next run
+    assert [item['video_id'] for item in history] == ['v2', 'v1']
+    assert json.loads((tmp_path / 'c1.json').read_text()) == saved
+
+def test_failed_first_fetch_stores_nothing(tmp_path):
+    client = FakeClient({'c1': [upload(2), upload(1)]}, fail_after=0)
+    
+    assert ChannelHistoryCache(client, cache_dir=str(tmp_path)).get_history('c1') is None
+    assert not (tmp_path / 'c1.json').exists()
+
+def test_channel_without_uploads_playlist(tmp_path):
+    assert ChannelHistoryCache(FakeClient({}), cache_dir=str(tmp_path)).get_history('missing') is None
+
+def test_upload_statistics():
+    regular = [upload(day) for day in (1, 3, 5, 7)]
+    erratic = [upload(1, 3), upload(2, 9), upload(9, 17), upload(10, 23)]
+    
+    assert upload_consistency(regular) == 1.0
+    assert upload_consistency(erratic) < 0.5
+    assert publish_hour_regularity(regular) == 1.0
+    assert publish_hour_regularity(erratic) == 0.25
+    assert upload_consistency(regular[:2]) is None
\ No newline at end of file
@@ -0,0 +1,79 @@
+import glob
+import os
+
+from feature_store import FeatureStore, cached_rows, input_hash
+
+COLUMNS = ('a', 'b')
+
+def shard_count(path, group='group'):
+    return len(glob.glob(os.path.join(path, group, '*.npz')))
+
+def test_lookup_returns_stored_rows_and_counts_hits(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    store.put('group', COLUMNS, ['x', 'y'], ['h1', 'h2'], [(1.0, 2.0), (3.0, 4.0)])
+    
+    assert store.lookup('group', COLUMNS, ['y', 'x', 'z'], ['h2', 'h1', 'h3']) == [(3.0, 4.0), (1.0, 2.0), None]
+    assert (store.hits, store.misses) == (2, 1)
+
+def test_stale_input_hash_is_a_miss(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    store.put('group', COLUMNS, ['x'], [input_hash('old')], [(1.0, 2.0)])
+    
+    assert store.lookup('group', COLUMNS, ['x'], [input_hash('new')]) == [None]
+
+def test_rows_survive_a_flush_and_later_shards_win(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    store.put('group', COLUMNS, ['x', 'y'], ['h', 'h'], [(1.0, 2.0), (3.0, 4.0)])
+    store.flush()
+    store.put('group', COLUMNS, ['x'], ['h2'], [(5.0, 6.0)])
+    store.flush()
+    
+    reopened = FeatureStore(str(tmp_path))
+    assert reopened.lookup('group', COLUMNS, ['x', 'y'], ['h2', 'h']) == [(5.0, 6.0), (3.0, 4.0)]
+    assert reopened.lookup('group', COLUMNS, ['x'], ['h']) == [None]
+
+def test_unflushed_rows_are_not_on_disk(tmp_path):
+    store = FeatureStore(str(tmp_path), flush_rows=10)
+    store.put('group', COLUMNS, ['x'], ['h'], [(1.0, 2.0)])
+    
+    assert shard_count(str(tmp_path)) == 0
+    assert FeatureStore(str(tmp_path)).lookup('group', COLUMNS, ['x'], ['h']) == [None]
+
+def test_flush_rows_triggers_a_flush(tmp_path):
+    store = FeatureStore(str(tmp_path), flush_rows=2)
+    store.put('group', COLUMNS, ['x', 'y'], ['h', 'h'], [(1.0, 2.0), (3.0, 4.0)])
+    
+    assert shard_count(str(tmp_path)) == 1
+
+def test_compaction_keeps_only_current_rows(tmp_path):
+    store = FeatureStore(str(tmp_path), max_shards=2)
+    for value in range(3):
+        store.put('group', COLUMNS, ['x', f'k{value}'], [f'h{value}', 'h'], [(value, value), (value, -value)])
+        store.flush()
+    
+    assert shard_count(str(tmp_path)) == 1
+    rows = FeatureStore(str(tmp_path)).read('group', COLUMNS)
+    assert sorted(rows['key'].tolist()) == ['k0', 'k1', 'k2', 'x']
+    assert rows['input_hash'][rows['key'].tolist().index('x')] == 'h2'
+
+def test_shards_written_for_other_columns_are_ignored(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    store.put('group', COLUMNS, ['x'], ['h'], [(1.0, 2.0)])
+    store.flush()
+    
+    assert FeatureStore(str(tmp_path)).lookup('group', ('a',), ['x'], ['h']) == [None]
+
+def test_cached_rows_computes_only_missing_rows(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    store.put('group', COLUMNS, ['x'], ['h'], [(1.0, 2.0)])
+    computed = []
+    
+    def compute(positions):
+        computed.extend(positions)
+        return [None if i == 2 else (float(i), 0.0) for i in positions]
+    
+    rows = cached_rows(store, 'group', COLUMNS, ['x', 'y', 'z'], ['h', 'h', 'h'], compute)
+    assert rows == [(1.0, 2.0), (1.0, 0.0), None]
+    assert computed == [1, 2]
+    # Rows that could not be computed are not stored
+    assert store.lookup('group', COLUMNS, ['y', 'z'], ['h', 'h']) == [(1.0, 0.0), None]
\ No newline at end of file
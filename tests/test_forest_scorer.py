@@ -0,0 +1,60 @@
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from forest_scorer import export_forest, load_forest
+
+FEATURE_NAMES = [f'f{i}' for i in range(6)]
+
+def fitted(feature_indices=None, missing=False):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, len(FEATURE_NAMES))) * [1, 10, 100, 1, 1, 1]
+    y = (X[:, 0] + X[:, 1] / 10 - X[:, 3] > 0).astype(int)
+    if missing:
+        X[rng.random(X.shape) < 0.1] = np.nan
+    scaler = StandardScaler().fit(X)
+    columns = slice(None) if feature_indices is None else feature_indices
+    model = RandomForestClassifier(n_estimators=15, max_depth=6, random_state=0).fit(scaler.transform(X)[:, columns], y)
+    return model, scaler, X
+
+def test_export_matches_sklearn(tmp_path):
+    model, scaler, X = fitted()
+    path = str(tmp_path / 'model.forest')
+    export_forest(model, scaler, FEATURE_NAMES, path)
+    loaded = load_forest(path)
+    
+    expected = model.predict_proba(scaler.transform(X))
+    np.testing.assert_allclose(loaded['model'].predict_proba(loaded['scaler'].transform(X)), expected, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(loaded['model'].classes_, model.classes_)
+    assert loaded['feature_names'] == FEATURE_NAMES
+
+def test_export_of_a_feature_subset_scores_full_rows(tmp_path):
+    columns = [1, 3, 4]
+    model, scaler, X = fitted(columns)
+    path = str(tmp_path / 'model.forest')
+    export_forest(model, scaler, FEATURE_NAMES, path, columns)
+    loaded = load_forest(path)
+    
+    expected = model.predict_proba(scaler.transform(X)[:, columns])
+    np.testing.assert_allclose(loaded['model'].predict_proba(loaded['scaler'].transform(X)), expected, rtol=0, atol=1e-12)
+
+def test_export_handles_missing_values(tmp_path):
+    model, scaler, X = fitted(missing=True)
+    path = str(tmp_path / 'model.forest')
+    export_forest(model, scaler, FEATURE_NAMES, path)
+    loaded = load_forest(path)
+    
+    expected = model.predict_proba(scaler.transform(X))
+    np.testing.assert_allclose(loaded['model'].predict_proba(loaded['scaler'].transform(X)), expected, rtol=0, atol=1e-12)
+
+def test_export_replaces_an_existing_export(tmp_path):
+    model, scaler, X = fitted()
+    path = str(tmp_path / 'model.forest')
+    export_forest(model, scaler, FEATURE_NAMES, path)
+    smaller = RandomForestClassifier(n_estimators=3, max_depth=2, random_state=1).fit(scaler.transform(X), model.predict(scaler.transform(X)))
+    export_forest(smaller, scaler, FEATURE_NAMES, path)
+    loaded = load_forest(path)
+    
+    expected = smaller.predict_proba(scaler.transform(X))
+    np.testing.assert_allclose(loaded['model'].predict_proba(loaded['scaler'].transform(X)), expected, rtol=0, atol=1e-12)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['model.forest']
\ No newline at end of file
@@ -0,0 +1,100 @@
+import os
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from advanced_analyzer import FEATURE_COLUMNS, AdvancedAIAnalyzer
+from config import Config
+from model_registry import ModelRegistry
+
+def bump_mtime(path, seconds=10):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10 ** 9))
+
+def test_file_is_loaded_once_and_shared(tmp_path):
+    path = str(tmp_path / 'model.joblib')
+    joblib.dump({'model': 'a'}, path)
+    registry = ModelRegistry(recheck_interval=0)
+    
+    first = registry.get(path)
+    assert registry.get(path) is first
+    assert registry.loads == 1
+
+def test_changed_file_is_reloaded(tmp_path):
+    path = str(tmp_path / 'model.joblib')
+    joblib.dump({'model': 'a'}, path)
+    registry = ModelRegistry(recheck_interval=0)
+    registry.get(path)
+    
+    joblib.dump({'model': 'b'}, path)
+    bump_mtime(path)
+    assert registry.get(path) == {'model': 'b'}
+    assert registry.loads == 2
+
+def test_files_are_rechecked_only_after_the_interval(tmp_path):
+    path = str(tmp_path / 'model.joblib')
+    registry = ModelRegistry(recheck_interval=3600)
+    assert registry.get(path) is None
+    assert registry.mtime(path) is None
+    
+    joblib.dump({'model': 'a'}, path)
+    assert registry.get(path) is None
+    assert registry.mtime(path) is None
+    registry.invalidate(path)
+    assert registry.get(path) == {'model': 'a'}
+    assert registry.mtime(path) == os.stat(path).st_mtime_ns
+
+def test_missing_file_is_reported_once(tmp_path, capsys):
+    path = str(tmp_path / 'missing.joblib')
+    registry = ModelRegistry(recheck_interval=0)
+    for _ in range(3):
+        assert registry.get(path) is None
+    
+    assert capsys.readouterr().out.count('not found') == 1
+
+def test_unreadable_file_gives_none(tmp_path):
+    path = tmp_path / 'broken.joblib'
+    path.write_bytes(b'not a joblib file')
+    
+    assert ModelRegistry(recheck_interval=0).get(str(path)) is None
+
+@pytest.fixture
+def model_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'ML_MODEL_PATH', str(tmp_path / 'model.joblib'))
+    monkeypatch.setattr(Config, 'ML_FOREST_PATH', str(tmp_path / 'model.forest'))
+    monkeypatch.setattr(Config, 'MODEL_RECHECK_INTERVAL', 0)
+    # A registry of its own, so nothing loaded by other tests is reused
+    monkeypatch.setattr('model_registry._shared_registry', ModelRegistry(recheck_interval=0))
+
+def fitted(n_estimators=5):
+    rng = np.random.default_rng(0)
+    X = rng.random((100, len(FEATURE_COLUMNS)))
+    y = (X[:, 0] > 0.5).astype(int)
+    scaler = StandardScaler().fit(X)
+    return RandomForestClassifier(n_estimators=n_estimators, random_state=0).fit(scaler.transform(X), y), scaler
+
+def test_in_memory_model_is_kept_without_model_files(model_paths):
+    analyzer = AdvancedAIAnalyzer()
+    assert not analyzer.load_model()
+    
+    analyzer.model, analyzer.scaler = fitted()
+    assert analyzer.load_model()
+    assert isinstance(analyzer.model, RandomForestClassifier)
+
+def test_export_is_preferred_unless_the_joblib_file_is_newer(model_paths):
+    model, scaler = fitted()
+    AdvancedAIAnalyzer().save_model(model, scaler)
+    analyzer = AdvancedAIAnalyzer()
+    assert analyzer.load_model()
+    assert type(analyzer.model).__name__ == 'ArrayForest'
+    assert analyzer.feature_names == FEATURE_COLUMNS
+    
+    # Other tooling replaces the joblib file; the stale export must not shadow it
+    replacement, _ = fitted(n_estimators=3)
+    joblib.dump({'model': replacement, 'scaler': scaler}, Config.ML_MODEL_PATH)
+    bump_mtime(Config.ML_MODEL_PATH)
+    assert analyzer.load_model()
+    assert isinstance(analyzer.model, RandomForestClassifier) and len(analyzer.model.estimators_) == 3
\ No newline at end of file
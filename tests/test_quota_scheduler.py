@@ -0,0 +1,89 @@
+import json
+import time
+
+import pytest
+
+import quota_scheduler
+from quota_scheduler import QuotaDeferred, QuotaScheduler, quota_day
+
+def scheduler(tmp_path=None, **options):
+    options.setdefault('daily_budget', 1000)
+    options.setdefault('search_reserve', 200)
+    options.setdefault('rate_limit', 10000)
+    options.setdefault('save_interval', 3600)
+    options.setdefault('state_path', str(tmp_path / 'quota.json') if tmp_path else '')
+    return QuotaScheduler(**options)
+
+def test_calls_are_charged_by_endpoint():
+    quota = scheduler()
+    for endpoint in ['search', 'videos', 'videos', 'channels', 'unknown']:
+        quota.acquire(endpoint)
+    
+    metrics = quota.get_metrics()
+    assert metrics['used'] == 104
+    assert metrics['remaining'] == 896
+    assert metrics['used_by_endpoint'] == {'search': 100, 'videos': 2, 'channels': 1, 'unknown': 1}
+    assert metrics['calls_by_endpoint'] == {'search': 1, 'videos': 2, 'channels': 1, 'unknown': 1}
+
+def test_search_is_deferred_once_only_the_reserve_is_left():
+    quota = scheduler()
+    for _ in range(8):
+        quota.acquire('search')
+    with pytest.raises(QuotaDeferred):
+        quota.acquire('search')
+    
+    # Cheap calls still spend the reserve, down to zero
+    for _ in range(200):
+        quota.acquire('videos')
+    with pytest.raises(QuotaDeferred):
+        quota.acquire('videos')
+    
+    metrics = quota.get_metrics()
+    assert metrics['remaining'] == 0
+    assert metrics['deferred_by_endpoint'] == {'search': 1, 'videos': 1}
+    assert metrics['used_by_endpoint'] == {'search': 800, 'videos': 200}
+
+def test_budget_refills_when_the_quota_day_changes(monkeypatch):
+    quota = scheduler()
+    quota.acquire('search')
+    assert quota.remaining() == 900
+    
+    monkeypatch.setattr(quota_scheduler, 'quota_day', lambda timestamp=None: '2099-01-01')
+    assert quota.remaining() == 1000
+
+def test_state_is_shared_between_runs_on_the_same_day(tmp_path):
+    quota = scheduler(tmp_path)
+    quota.acquire('search')
+    quota.save()
+    
+    assert scheduler(tmp_path).remaining() == 900
+
+def test_state_from_an_earlier_day_is_ignored(tmp_path):
+    (tmp_path / 'quota.json').write_text(json.dumps({'tokens': 5, 'day': '2000-01-01'}))
+    
+    assert scheduler(tmp_path).remaining() == 1000
+
+def test_state_in_the_old_format_is_read(tmp_path):
+    (tmp_path / 'quota.json').write_text(json.dumps({'tokens': 250, 'updated_at': time.time()}))
+    
+    assert scheduler(tmp_path).remaining() == 250
+
+def test_save_writes_only_after_calls(tmp_path):
+    quota = scheduler(tmp_path)
+    quota.save()
+    assert not (tmp_path / 'quota.json').exists()
+    
+    quota.acquire('videos')
+    quota.save()
+    assert json.loads((tmp_path / 'quota.json').read_text()) == {'tokens': 999, 'day': quota_day()}
+
+def test_state_is_saved_every_save_interval(tmp_path):
+    quota = scheduler(tmp_path, save_interval=0)
+    quota.acquire('videos')
+    
+    assert json.loads((tmp_path / 'quota.json').read_text())['tokens'] == 999
+
+def test_quota_day_is_the_pacific_date():
+    # 2024-01-01 06:00 UTC is still 2023-12-31 in Pacific time
+    assert quota_day(1704088800) == '2023-12-31'
+    assert quota_day(1704088800 + 3 * 3600) == '2024-01-01'
\ No newline at end of file
@@ -0,0 +1,75 @@
+import json
+import os
+import threading
+import time
+
+from quota_scheduler import QuotaScheduler
+from replay import StubYouTubeServer
+from response_cache import ResponseCache, request_key
+from youtube_client import YouTubeClient
+
+PARAMS = {'part': 'snippet', 'id': 'v1'}
+
+def test_key_ignores_the_api_key_and_value_types():
+    assert request_key('videos', {'id': 'v1', 'maxResults': 5, 'key': 'secret'}) == \
+        request_key('videos', {'maxResults': '5', 'id': 'v1'})
+    assert request_key('videos', PARAMS) != request_key('search', PARAMS)
+
+def test_ttl_is_the_shortest_of_the_parts(tmp_path):
+    cache = ResponseCache(str(tmp_path), part_ttls={'snippet': 100, 'statistics': 10}, endpoint_ttls={'search': 5})
+    
+    assert cache.ttl_for('videos', {'part': 'snippet,statistics'}) == 10
+    assert cache.ttl_for('videos', {'part': 'snippet'}) == 100
+    assert cache.ttl_for('videos', {'part': 'unknown'}) == 0
+    assert cache.ttl_for('search', {'part': 'snippet'}) == 5
+
+def test_entries_are_fresh_until_their_ttl(tmp_path):
+    cache = ResponseCache(str(tmp_path), part_ttls={'snippet': 100}, endpoint_ttls={'x': 1})
+    entry = cache.put('videos', PARAMS, {'items': [1]}, 'etag-1')
+    
+    assert cache.get('videos', PARAMS) == entry
+    assert cache.is_fresh(entry, 'videos', PARAMS)
+    entry['stored_at'] = time.time() - 101
+    assert not cache.is_fresh(entry, 'videos', PARAMS)
+    cache.touch('videos', PARAMS, entry)
+    assert cache.is_fresh(cache.get('videos', PARAMS), 'videos', PARAMS)
+    assert cache.get('videos', {'part': 'snippet', 'id': 'v2'}) is None
+
+def test_counters_are_exact_across_threads(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    
+    def count():
+        for _ in range(2000):
+            cache.record('hits')
+            cache.record('misses')
+    threads = [threading.Thread(target=count) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert cache.get_stats() == {'hits': 8000, 'revalidated': 0, 'misses': 8000}
+
+def test_client_serves_fresh_entries_and_revalidates_stale_ones(tmp_path):
+    fixtures = tmp_path / 'fixtures'
+    fixture = fixtures / 'api' / 'videos' / f"{request_key('videos', PARAMS)}.json"
+    os.makedirs(fixture.parent)
+    fixture.write_text(json.dumps({'endpoint': 'videos', 'params': PARAMS, 'etag': '"v1-etag"',
+                                   'body': {'items': [{'id': 'v1'}]}}))
+    scheduler = QuotaScheduler(daily_budget=10000, rate_limit=10000, state_path='')
+    
+    with StubYouTubeServer(str(fixtures)) as server:
+        fresh = ResponseCache(str(tmp_path / 'fresh'), part_ttls={'snippet': 3600}, endpoint_ttls={'x': 1})
+        client = YouTubeClient(base_url=server.base_url, scheduler=scheduler, cache=fresh)
+        assert client._get_json('videos', PARAMS) == {'items': [{'id': 'v1'}]}
+        assert client._get_json('videos', PARAMS) == {'items': [{'id': 'v1'}]}
+        assert server.request_count == 1
+        assert fresh.get_stats() == {'hits': 1, 'revalidated': 0, 'misses': 1}
+        
+        # With a zero TTL every call revalidates and the 304 reuses the body
+        stale = ResponseCache(str(tmp_path / 'stale'), part_ttls={'snippet': 0}, endpoint_ttls={'x': 1})
+        client = YouTubeClient(base_url=server.base_url, scheduler=scheduler, cache=stale)
+        client._get_json('videos', PARAMS)
+        assert client._get_json('videos', PARAMS) == {'items': [{'id': 'v1'}]}
+        assert stale.get_stats() == {'hits': 0, 'revalidated': 1, 'misses': 1}
+        assert server.request_count == 3
\ No newline at end of file
@@ -0,0 +1,49 @@
+import re
+
+import numpy as np
+import pytest
+
+from text_matcher import TEXT_MATCHER, TermMatcher
+
+TEXTS = [
+    '',
+    'ai generated art made with midjourney',
+    'chatgpt explains: the future of ai\nautomated voice, robotic narration',
+    'cooking pasta at home',
+    'midjourneymidjourney ai ai ai',
+    'a title with a\0nul byte and ai art',
+    'ünïcödé text with dall-e and ai',
+    'ai',
+    'AI voice\ngenerated later, but created by AI here',
+    'Deepfake neural network; machine\nlearning',
+]
+
+@pytest.mark.parametrize('name', sorted(TEXT_MATCHER.term_lists))
+def test_found_many_matches_found(name):
+    expected = np.array([TEXT_MATCHER.found(name, text) for text in TEXTS], dtype=bool)
+    
+    np.testing.assert_array_equal(TEXT_MATCHER.found_many(name, TEXTS), expected)
+    np.testing.assert_array_equal(TEXT_MATCHER.count_many(name, TEXTS), [TEXT_MATCHER.count(name, text) for text in TEXTS])
+
+def test_found_many_of_no_texts():
+    matcher = TermMatcher({'terms': ['a', 'b']})
+    
+    assert matcher.found_many('terms', []).shape == (0, 2)
+
+def test_found_many_with_overlapping_and_repeated_terms():
+    matcher = TermMatcher({'terms': ['ab', 'b', 'abc', 'x']})
+    texts = ['abc', 'b', 'xx', 'ab ab', '']
+    
+    expected = np.array([matcher.found('terms', text) for text in texts], dtype=bool)
+    np.testing.assert_array_equal(matcher.found_many('terms', texts), expected)
+
+def test_counts_matches_count():
+    names = sorted(TEXT_MATCHER.term_lists)
+    for text in TEXTS:
+        assert TEXT_MATCHER.counts(text, names) == {name: TEXT_MATCHER.count(name, text) for name in names}
+
+@pytest.mark.parametrize('name', sorted(TEXT_MATCHER.pattern_lists))
+def test_pattern_score_matches_regex_search(name):
+    for text in TEXTS:
+        expected = sum(weight for _, weight, regex in TEXT_MATCHER.pattern_lists[name] if re.search(regex.pattern, text, re.IGNORECASE))
+        assert TEXT_MATCHER.pattern_score(name, text.lower()) == expected
\ No newline at end of file
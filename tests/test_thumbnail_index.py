@@ -0,0 +1,67 @@
+import numpy as np
+from PIL import Image
+
+from config import Config
+from thumbnail_index import MultiIndexHash, ThumbnailIndex, dhash, hamming_distance
+
+def gradient(seed, size=(160, 90)):
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 256, size=(size[1] // 10, size[0] // 10, 3), dtype=np.uint8)
+    return Image.fromarray(pixels).resize(size, Image.BILINEAR)
+
+def test_dhash_survives_rescaling_and_separates_images():
+    image = gradient(1)
+    
+    assert hamming_distance(dhash(image), dhash(image.resize((320, 180), Image.BILINEAR))) <= 4
+    assert hamming_distance(dhash(image), dhash(gradient(2))) > 10
+
+def test_multi_index_hash_finds_everything_within_the_radius():
+    rng = np.random.default_rng(0)
+    hashes = [int(value) for value in rng.integers(0, 2 ** 63, size=300)]
+    table = MultiIndexHash(radius=6)
+    for position, hash_value in enumerate(hashes):
+        table.add(hash_value, position)
+    
+    query = hashes[7] ^ 0b1011  # 3 bits away from entry 7
+    expected = sorted((hamming_distance(query, h), h, i) for i, h in enumerate(hashes) if hamming_distance(query, h) <= 6)
+    assert sorted(table.search(query)) == expected
+    assert (3, hashes[7], 7) in expected
+    assert all(distance <= 2 for distance, _, _ in table.search(query, radius=2))
+
+def test_lookup_returns_the_closest_near_duplicate(tmp_path):
+    index = ThumbnailIndex(str(tmp_path / 'index.json'), radius=4)
+    index.add(0b0000, 'a', 0.1)
+    index.add(0b0111, 'b', 0.2)
+    
+    assert index.lookup(0b0001) == ('a', 0.1)
+    assert index.lookup(0b0110) == ('b', 0.2)
+    assert index.lookup(0xFFFF) is None
+
+def test_changed_thumbnail_replaces_its_old_hash(tmp_path):
+    index = ThumbnailIndex(str(tmp_path / 'index.json'), radius=2)
+    index.add(0b0000, 'a', 0.1)
+    index.add(0xFF00, 'a', 0.3)
+    
+    assert index.lookup(0b0000) is None
+    assert index.lookup(0xFF00) == ('a', 0.3)
+
+def test_clusters_and_duplicate_counts(tmp_path):
+    index = ThumbnailIndex(str(tmp_path / 'index.json'), radius=2)
+    # a-b-c is a chain of small edits; d stands alone
+    for url, hash_value in [('a', 0b000000), ('b', 0b000011), ('c', 0b001111), ('d', 0xFFFF0000)]:
+        index.add(hash_value, url, 0.5)
+    
+    assert index.clusters() == [['a', 'b', 'c']]
+    assert index.duplicate_count('b') == 2
+    assert index.duplicate_count('d') == 0
+    assert index.duplicate_count('unknown') == 0
+
+def test_index_is_saved_and_discarded_at_another_analysis_size(tmp_path, monkeypatch):
+    path = str(tmp_path / 'index.json')
+    index = ThumbnailIndex(path, radius=2)
+    index.add(0xABCD, 'a', 0.7)
+    index.save()
+    
+    assert ThumbnailIndex(path, radius=2).lookup(0xABCD) == ('a', 0.7)
+    monkeypatch.setattr(Config, 'THUMBNAIL_ANALYSIS_SIZE', (32, 32))
+    assert len(ThumbnailIndex(path, radius=2)) == 0
\ No newline at end of file
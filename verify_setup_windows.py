@@ -15,8 +15,22 @@ def check_imports():
     
     modules_to_check = [
         'config',
+        'http_transport',
         'youtube_client', 
+        'async_youtube_client',
+        'quota_scheduler',
+        'response_cache',
+        'replay',
+        'channel_history',
+        'thumbnail_cache',
+        'thumbnail_index',
+        'model_registry',
+        'forest_scorer',
+        'feature_store',
         'advanced_analyzer',
+        'text_matcher',
+        'text_context',
+        'video_frame',
         'ensemble_analyzer',
         'content_analyzer',
         'utils',